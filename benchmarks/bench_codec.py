@@ -0,0 +1,198 @@
+"""Throughput benchmarks for the SDIF codec.
+
+Run from the repository root:
+
+    python benchmarks/bench_codec.py --output bench.json
+    python benchmarks/bench_codec.py --compare bench.json
+
+Results are written as JSON so that runs from different commits can be compared.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Optional
+
+import attr
+
+import sdif.fields as fields
+import sdif.model_meta as model_meta
+from sdif.profiling import CodecStats
+from sdif.records import RECORD_SEP, decode_records, decode_value, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time
+
+
+@attr.define
+class Result:
+    name: str
+    items: int
+    bytes: int
+    seconds: float
+
+    @property
+    def items_per_sec(self) -> float:
+        return self.items / self.seconds
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes / self.seconds
+
+    def to_json(self) -> dict[str, Any]:
+        return dict(
+            name=self.name,
+            items=self.items,
+            bytes=self.bytes,
+            seconds=self.seconds,
+            items_per_sec=self.items_per_sec,
+            bytes_per_sec=self.bytes_per_sec,
+        )
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def field_samples(lines: list[str]) -> dict[fields.FieldType, list[tuple[fields.FieldDef, str]]]:
+    samples = defaultdict(list)
+    for line in lines:
+        cls = model_meta.REGISTERED_MODELS[line[:2]]
+        for field in fields.record_fields(cls):
+            raw = line[field.start - 1 : field.start - 1 + field.len]
+            if raw.strip():
+                samples[field.record_type].append((field, raw))
+    return samples
+
+
+def run(spec: MeetSpec, repeat: int) -> list[Result]:
+    records = list(generate_meet(spec))
+    encoded = encode_records(records)
+    lines = encoded.split(RECORD_SEP)
+    n_bytes = len(encoded)
+    results = []
+
+    seconds = best_of(lambda: list(decode_records(encoded)), repeat)
+    results.append(Result("decode_records", len(records), n_bytes, seconds))
+
+    seconds = best_of(lambda: encode_records(records), repeat)
+    results.append(Result("encode_records", len(records), n_bytes, seconds))
+
+    for field_type, samples in sorted(field_samples(lines).items(), key=lambda i: i[0].name):
+
+        def decode_all():
+            for field, raw in samples:
+                decode_value(field, raw, False)
+
+        seconds = best_of(decode_all, repeat)
+        n_bytes = sum(len(raw) for _, raw in samples)
+        results.append(Result(f"decode_value[{field_type.name}]", len(samples), n_bytes, seconds))
+
+    time_strings = [
+        raw.strip()
+        for field, raw in field_samples(lines)[fields.FieldType.time]
+        if ":" in raw or "." in raw
+    ]
+    times = [Time.from_str(s) for s in time_strings]
+    n_bytes = sum(len(s) for s in time_strings)
+    seconds = best_of(lambda: [Time.from_str(s) for s in time_strings], repeat)
+    results.append(Result("Time.from_str", len(time_strings), n_bytes, seconds))
+    seconds = best_of(lambda: [t.format() for t in times], repeat)
+    results.append(Result("Time.format", len(times), n_bytes, seconds))
+
+    return results
+
+
+def json_value(_instance: Any, _field: Any, value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(results: list[Result], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    print(f"{'benchmark':32s} {'baseline/s':>14s} {'current/s':>14s} {'ratio':>7s}")
+    for result in results:
+        if result.name not in baseline:
+            continue
+        old = baseline[result.name]["items_per_sec"]
+        print(
+            f"{result.name:32s} {old:14.0f} {result.items_per_sec:14.0f}"
+            f" {result.items_per_sec / old:7.2f}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--swimmers", type=int, default=25)
+    parser.add_argument("--events", type=int, default=30)
+    parser.add_argument("--relays", type=int, default=8)
+    parser.add_argument("--splits", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a previously saved JSON file")
+    parser.add_argument(
+        "--profile", action="store_true", help="print a per-record-type profile of one decode"
+    )
+    args = parser.parse_args(argv)
+
+    spec = MeetSpec(
+        seed=args.seed,
+        n_teams=args.teams,
+        n_swimmers=args.swimmers,
+        n_events=args.events,
+        n_relays=args.relays,
+        n_splits=args.splits,
+    )
+    results = run(spec, args.repeat)
+
+    for result in results:
+        print(
+            f"{result.name:32s} {result.items_per_sec:12.0f} items/s"
+            f" {result.bytes_per_sec / 1e6:8.2f} MB/s"
+        )
+    if args.profile:
+        stats = CodecStats()
+        list(decode_records(encode_records(generate_meet(spec)), stats=stats))
+        print(stats.summary())
+    if args.compare:
+        compare(results, args.compare)
+    if args.output:
+        payload = dict(
+            revision=git_revision(),
+            python=sys.version,
+            platform=platform.platform(),
+            spec=attr.asdict(spec, value_serializer=json_value),
+            results=[r.to_json() for r in results],
+        )
+        with open(args.output, "w") as f:
+            json.dump(payload, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
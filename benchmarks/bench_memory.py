@@ -0,0 +1,208 @@
+"""Memory footprint of decoded records, per registered model.
+
+Run from the repository root:
+
+    python benchmarks/bench_memory.py              # report
+    python benchmarks/bench_memory.py --check      # fail if over budget
+    python benchmarks/bench_memory.py --update     # rewrite the budget file
+
+Bytes per record are measured with tracemalloc while holding at least
+MIN_RECORDS decoded records of each type from a synthetic meet in memory. Record
+sizes differ between Python versions, so the budget file is keyed by Python
+version ("3.11"), then by decode mode, then by record identifier; --update
+rewrites only the running version's budget.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections import defaultdict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import attr
+
+import sdif.model_meta as model_meta
+from sdif.fields import SdifModel
+from sdif.records import RECORD_SEP, decode_records, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+
+BUDGET_PATH = Path(__file__).with_name("memory_budget.json")
+DEFAULT_TOLERANCE = 0.10
+# Record types with fewer lines in the meet are repeated up to this many, so
+# a few bytes of allocator noise don't count against a single record.
+MIN_RECORDS = 1000
+
+# Each mode turns a list of encoded lines of one record type into whatever the
+# mode keeps resident.
+MODES: dict[str, Callable[[list[str]], Any]] = {
+    "attrs": lambda lines: list(decode_records(lines)),
+}
+
+
+@attr.define
+class Footprint:
+    identifier: str
+    n_records: int
+    bytes_per_record: float
+    contributors: list[tuple[str, float]]
+
+
+def _shallow_size(value: Any, seen: set[int]) -> int:
+    if value is None or isinstance(value, (bool, Enum)) or id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if attr.has(type(value)):
+        for a in attr.fields(type(value)):
+            size += _shallow_size(getattr(value, a.name), seen)
+    return size
+
+
+def contributors(records: list[SdifModel]) -> list[tuple[str, float]]:
+    """Attribute memory to each field, as bytes per record, largest first.
+
+    Values shared between records (enum members, cached small ints, etc.) are
+    counted once.
+    """
+    if not records:
+        return []
+    totals: dict[str, int] = defaultdict(int)
+    seen: set[int] = set()
+    for record in records:
+        totals["<record>"] += sys.getsizeof(record)
+        for a in attr.fields(type(record)):
+            value = getattr(record, a.name)
+            totals[f"{a.name} ({type(value).__name__})"] += _shallow_size(value, seen)
+    n = len(records)
+    return sorted(((k, v / n) for k, v in totals.items()), key=lambda i: -i[1])
+
+
+def measure(mode: Callable[[list[str]], Any], lines: list[str]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        held = mode(lines)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del held
+    return (after - before) / len(lines)
+
+
+def python_version() -> str:
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def run(spec: MeetSpec, modes: Iterable[str]) -> dict[str, list[Footprint]]:
+    by_identifier: dict[str, list[str]] = defaultdict(list)
+    for line in encode_records(generate_meet(spec)).split(RECORD_SEP):
+        by_identifier[line[:2]].append(line)
+    for identifier, lines in by_identifier.items():
+        copies = -(-MIN_RECORDS // len(lines))
+        by_identifier[identifier] = lines * copies
+
+    results: dict[str, list[Footprint]] = {}
+    for mode_name in modes:
+        mode = MODES[mode_name]
+        footprints = []
+        for identifier in model_meta.REGISTERED_MODELS:
+            lines = by_identifier.get(identifier)
+            if not lines:
+                continue
+            footprints.append(
+                Footprint(
+                    identifier=identifier,
+                    n_records=len(lines),
+                    bytes_per_record=measure(mode, lines),
+                    contributors=contributors(list(decode_records(lines))),
+                )
+            )
+        results[mode_name] = footprints
+    return results
+
+
+def version_budget(
+    budget: dict[str, dict[str, dict[str, float]]], version: str
+) -> dict[str, dict[str, float]]:
+    """The budget for a Python version, or the largest of every version's for versions
+    that have no budget of their own."""
+    if version in budget:
+        return budget[version]
+    loosest: dict[str, dict[str, float]] = defaultdict(dict)
+    for modes in budget.values():
+        for mode_name, limits in modes.items():
+            for identifier, limit in limits.items():
+                previous = loosest[mode_name].get(identifier, limit)
+                loosest[mode_name][identifier] = max(previous, limit)
+    return loosest
+
+
+def check(
+    results: dict[str, list[Footprint]], budget: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    failures = []
+    for mode_name, footprints in results.items():
+        for fp in footprints:
+            limit = budget.get(mode_name, {}).get(fp.identifier)
+            if limit is None:
+                continue
+            if fp.bytes_per_record > limit * (1 + tolerance):
+                failures.append(
+                    f"{mode_name} {fp.identifier}: {fp.bytes_per_record:.0f} B/record"
+                    f" exceeds budget {limit:.0f} B/record (+{tolerance:.0%})"
+                )
+    return failures
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--mode", action="append", choices=sorted(MODES))
+    parser.add_argument("--top", type=int, default=5, help="contributors to show per record")
+    parser.add_argument("--check", action="store_true", help="exit 1 if over budget")
+    parser.add_argument("--update", action="store_true", help="write measured values as budget")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH)
+    args = parser.parse_args(argv)
+
+    spec = MeetSpec(n_teams=10, n_swimmers=20, n_events=20, n_relays=5, n_splits=10)
+    results = run(spec, args.mode or sorted(MODES))
+
+    for mode_name, footprints in results.items():
+        print(f"[{mode_name}]")
+        for fp in footprints:
+            print(
+                f"  {fp.identifier}  {fp.bytes_per_record:8.0f} B/record  ({fp.n_records} records)"
+            )
+            for name, size in fp.contributors[: args.top]:
+                print(f"      {size:8.0f} B  {name}")
+
+    version = python_version()
+    if args.update:
+        budget = json.loads(args.budget.read_text()) if args.budget.exists() else {}
+        budget[version] = {
+            mode_name: {fp.identifier: round(fp.bytes_per_record) for fp in footprints}
+            for mode_name, footprints in results.items()
+        }
+        with open(args.budget, "w") as f:
+            versions = sorted(budget, key=lambda v: tuple(int(part) for part in v.split(".")))
+            json.dump({v: budget[v] for v in versions}, f, indent=2)
+            f.write("\n")
+
+    if args.check:
+        with open(args.budget) as f:
+            budget = json.load(f)
+        failures = check(results, version_budget(budget, version), args.tolerance)
+        for failure in failures:
+            print(failure, file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
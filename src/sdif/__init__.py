@@ -1,11 +1,95 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 import sdif.fields as fields
 import sdif.models as models
+import sdif.profiling as profiling
 import sdif.records as records
 import sdif.time as time
 
+if TYPE_CHECKING:
+    import sdif.aio as aio
+    import sdif.catalog as catalog
+    import sdif.changes as changes
+    import sdif.courses as courses
+    import sdif.edit as edit
+    import sdif.entities as entities
+    import sdif.export as export
+    import sdif.identity as identity
+    import sdif.index as index
+    import sdif.merge as merge
+    import sdif.patch as patch
+    import sdif.pipeline as pipeline
+    import sdif.rankings as rankings
+    import sdif.scoring as scoring
+    import sdif.seeding as seeding
+    import sdif.sort as sort
+    import sdif.standards as standards
+    import sdif.synthetic as synthetic
+    import sdif.tail as tail
+    import sdif.validate as validate
+    from sdif.changes import diff
+
+# Imported on first access, so "import sdif" only loads the codec.
+_LAZY_MODULES = frozenset(
+    [
+        "aio",
+        "catalog",
+        "changes",
+        "courses",
+        "edit",
+        "entities",
+        "export",
+        "identity",
+        "index",
+        "merge",
+        "patch",
+        "pipeline",
+        "rankings",
+        "scoring",
+        "seeding",
+        "sort",
+        "standards",
+        "synthetic",
+        "tail",
+        "validate",
+    ]
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_MODULES:
+        return importlib.import_module(f"sdif.{name}")
+    if name == "diff":
+        return importlib.import_module("sdif.changes").diff
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
+    "aio",
+    "catalog",
+    "changes",
+    "courses",
+    "diff",
+    "edit",
+    "entities",
+    "export",
     "fields",
+    "identity",
+    "index",
+    "merge",
     "models",
+    "patch",
+    "pipeline",
+    "profiling",
+    "rankings",
     "records",
+    "scoring",
+    "seeding",
+    "sort",
+    "standards",
+    "synthetic",
+    "tail",
     "time",
+    "validate",
 ]
@@ -0,0 +1,133 @@
+"""asyncio counterparts to decode_records and encode_records."""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Protocol, Union
+
+from sdif.fields import SdifModel
+from sdif.records import RECORD_ENCODING, RECORD_SEP, decode_records, encode_records
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class AsyncWriter(Protocol):
+    def write(self, data: bytes) -> None:
+        ...
+
+    async def drain(self) -> None:
+        ...
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], encoding: str = RECORD_ENCODING
+) -> AsyncIterator[str]:
+    """Yield record lines without their line terminators, skipping blank lines."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if line:
+                yield line.decode(encoding)
+    pending = pending.rstrip(b"\r")
+    if pending:
+        yield pending.decode(encoding)
+
+
+def _decode_batch(lines: list[str], strict: bool) -> list[SdifModel]:
+    return list(decode_records(lines, strict))
+
+
+async def decode_stream(
+    chunks: AsyncIterable[bytes],
+    strict: bool = False,
+    *,
+    encoding: str = RECORD_ENCODING,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[SdifModel]:
+    """Decode records from a byte stream.
+
+    chunks may be an asyncio.StreamReader or any async iterable of bytes;
+    lines are reassembled across chunk boundaries. Without an executor, each batch of batch_size lines is decoded on the event
+    loop between reads. With an executor, batches are decoded there instead;
+    the next batch is read while the previous one decodes.
+    """
+    loop = asyncio.get_running_loop()
+    pending: Optional[asyncio.Future[list[SdifModel]]] = None
+    batch: list[str] = []
+
+    async for line in iter_lines(chunks, encoding):
+        batch.append(line)
+        if len(batch) < batch_size:
+            continue
+        if executor is None:
+            for record in _decode_batch(batch, strict):
+                yield record
+        else:
+            if pending is not None:
+                for record in await pending:
+                    yield record
+            pending = loop.run_in_executor(executor, _decode_batch, batch, strict)
+        batch = []
+
+    if pending is not None:
+        for record in await pending:
+            yield record
+    if batch:
+        if executor is None:
+            decoded = _decode_batch(batch, strict)
+        else:
+            decoded = await loop.run_in_executor(executor, _decode_batch, batch, strict)
+        for record in decoded:
+            yield record
+
+
+def _encode_batch(records: list[SdifModel], strict: bool, encoding: str) -> bytes:
+    return encode_records(records, strict).encode(encoding)
+
+
+async def encode_stream(
+    records: Union[Iterable[SdifModel], AsyncIterable[SdifModel]],
+    writer: AsyncWriter,
+    strict: bool = False,
+    *,
+    encoding: str = RECORD_ENCODING,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+) -> None:
+    """Encode records to writer, awaiting writer.drain() after each batch.
+
+    The output is byte-for-byte what encode_records would produce.
+    """
+    loop = asyncio.get_running_loop()
+    first = True
+
+    async def flush(batch: list[SdifModel]) -> None:
+        nonlocal first
+        if executor is None:
+            data = _encode_batch(batch, strict, encoding)
+        else:
+            data = await loop.run_in_executor(executor, _encode_batch, batch, strict, encoding)
+        if not first:
+            writer.write(RECORD_SEP.encode(encoding))
+        first = False
+        writer.write(data)
+        await writer.drain()
+
+    batch: list[SdifModel] = []
+    if isinstance(records, AsyncIterable):
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await flush(batch)
+                batch = []
+    else:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await flush(batch)
+                batch = []
+    if batch:
+        await flush(batch)
@@ -0,0 +1,103 @@
+"""Catalog archived SDIF files from their A0, B1 and Z0 records."""
+
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import repeat
+from typing import Iterable, Optional, Union
+
+import attr
+
+import sdif.models as models
+from sdif.records import RECORD_ENCODING, decode_record
+
+HEAD_BYTES = 4096
+TAIL_BYTES = 2048
+
+
+@attr.define(frozen=True)
+class CatalogEntry:
+    path: str
+    description: Optional[models.FileDescription]
+    meet: Optional[models.Meet]
+    terminator: Optional[models.FileTerminator]
+    # Whether the records had to be found by reading the whole file.
+    scanned: bool = False
+    # Why catalog() couldn't read the file, if it couldn't.
+    error: Optional[Exception] = None
+
+
+def _complete_lines(chunk: bytes, at_start: bool, at_end: bool) -> list[bytes]:
+    lines = chunk.split(b"\n")
+    if not at_end:
+        lines.pop()
+    if not at_start:
+        lines.pop(0)
+    return [line.rstrip(b"\r") for line in lines]
+
+
+def _find(lines: dict[str, bytes], candidates: Iterable[bytes]) -> None:
+    """Keep the first A0 and B1 and the last Z0."""
+    for line in candidates:
+        identifier = line[:2].decode("ascii", "replace")
+        if identifier in ("A0", "B1") and identifier not in lines:
+            lines[identifier] = line
+        elif identifier == "Z0":
+            lines["Z0"] = line
+
+
+def peek(
+    path: Union[str, os.PathLike], strict: bool = False, encoding: str = RECORD_ENCODING
+) -> CatalogEntry:
+    """Decode a file's A0, B1 and Z0 from its first and last few kilobytes.
+
+    The whole file is scanned only if one of them isn't where it should be.
+    """
+    found: dict[str, bytes] = {}
+    scanned = False
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        head = f.read(HEAD_BYTES)
+        _find(found, _complete_lines(head, True, len(head) >= size))
+        tail_start = max(0, size - TAIL_BYTES)
+        if tail_start > 0:
+            f.seek(tail_start)
+            _find(found, _complete_lines(f.read(), False, True))
+        if len(found) < 3 and size > HEAD_BYTES:
+            scanned = True
+            f.seek(0)
+            _find(found, (line.rstrip(b"\r\n") for line in f))
+
+    def decode(identifier: str, cls: type):
+        line = found.get(identifier)
+        return None if line is None else decode_record(line.decode(encoding), cls, strict)
+
+    return CatalogEntry(
+        os.fspath(path),
+        decode("A0", models.FileDescription),
+        decode("B1", models.Meet),
+        decode("Z0", models.FileTerminator),
+        scanned,
+    )
+
+
+def _peek_or_error(path: Union[str, os.PathLike], strict: bool) -> CatalogEntry:
+    try:
+        return peek(path, strict)
+    except Exception as e:
+        return CatalogEntry(os.fspath(path), None, None, None, error=e)
+
+
+def catalog(
+    paths: Iterable[Union[str, os.PathLike]],
+    strict: bool = False,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+) -> list[CatalogEntry]:
+    """Peek at every file, in order, on executor or a new thread pool.
+
+    A file that can't be read or decoded gets an entry with its error set.
+    """
+    if executor is not None:
+        return list(executor.map(_peek_or_error, paths, repeat(strict)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_peek_or_error, paths, repeat(strict)))
@@ -0,0 +1,176 @@
+"""Field-level differences between two versions of an SDIF file."""
+
+import enum
+import os
+from collections import Counter, defaultdict
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import attr
+
+import sdif.model_meta as model_meta
+from sdif.fields import SdifModel
+from sdif.identity import IdentityTracker, RecordKey
+from sdif.records import RECORD_ENCODING, decode_record, line_digest
+
+# A path, or the record lines themselves.
+Source = Union[str, os.PathLike, Iterable[str]]
+
+
+class ChangeKind(enum.Enum):
+    added = "added"
+    removed = "removed"
+    changed = "changed"
+
+
+@attr.define(frozen=True)
+class FieldChange:
+    name: str
+    old: Any
+    new: Any
+
+
+@attr.define(frozen=True)
+class RecordChange:
+    """A difference in one record.
+
+    The key's final element counts repeats of the same identity within a file.
+    old is None for added records; new is None for removed records.
+    """
+
+    key: RecordKey
+    old: Optional[SdifModel]
+    new: Optional[SdifModel]
+    fields: tuple[FieldChange, ...] = ()
+
+    @property
+    def kind(self) -> ChangeKind:
+        if self.old is None:
+            return ChangeKind.added
+        if self.new is None:
+            return ChangeKind.removed
+        return ChangeKind.changed
+
+
+@attr.define(frozen=True)
+class ChangeSet:
+    changes: tuple[RecordChange, ...]
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __iter__(self) -> Iterator[RecordChange]:
+        return iter(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def of_kind(self, kind: ChangeKind) -> list[RecordChange]:
+        return [c for c in self.changes if c.kind == kind]
+
+    @property
+    def added(self) -> list[RecordChange]:
+        return self.of_kind(ChangeKind.added)
+
+    @property
+    def removed(self) -> list[RecordChange]:
+        return self.of_kind(ChangeKind.removed)
+
+    @property
+    def changed(self) -> list[RecordChange]:
+        return self.of_kind(ChangeKind.changed)
+
+
+def iter_lines(source: Source, encoding: str = RECORD_ENCODING) -> Iterator[str]:
+    """Non-blank record lines from a path or an iterable of lines."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rt", encoding=encoding, newline="") as f:
+            for line in f:
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line
+        return
+    for line in source:
+        line = line.rstrip("\r\n")
+        if line:
+            yield line
+
+
+def _decode(line: str, strict: bool) -> SdifModel:
+    return decode_record(line, model_meta.REGISTERED_MODELS[line[:2]], strict)
+
+
+class _KeyedRecords:
+    """Decoded records by identity key, numbering repeats of the same identity."""
+
+    def __init__(self) -> None:
+        self.records: dict[RecordKey, SdifModel] = {}
+        self._repeats: defaultdict[RecordKey, int] = defaultdict(int)
+
+    def add(self, key: RecordKey, record: SdifModel) -> None:
+        self.records[(*key, str(self._repeats[key]))] = record
+        self._repeats[key] += 1
+
+
+def field_changes(old: SdifModel, new: SdifModel) -> tuple[FieldChange, ...]:
+    return tuple(
+        FieldChange(a.name, getattr(old, a.name), getattr(new, a.name))
+        for a in attr.fields(type(old))
+        if getattr(old, a.name) != getattr(new, a.name)
+    )
+
+
+def diff(old: Source, new: Source, strict: bool = False) -> ChangeSet:
+    """Compare two versions of a file.
+
+    Lines found verbatim in both versions are matched by hash without being
+    decoded, the n-th copy of a line matching its n-th copy in the other file.
+    The rest are decoded and paired by identity key, so a corrected time is a
+    change to one field rather than a removal and an addition.
+
+    Sources may be paths or iterables of lines; use diff_text to compare file
+    contents. The old source is read twice, so it must not be a one-shot
+    iterator; the new source is read once. Memory use is proportional to the
+    number of distinct lines (as 16-byte digests) plus the number of lines that
+    differ.
+    """
+    old_counts = Counter(line_digest(line) for line in iter_lines(old))
+
+    new_records = _KeyedRecords()
+    new_counts: Counter[bytes] = Counter()
+    tracker = IdentityTracker()
+    for line in iter_lines(new):
+        key = tracker.key_for_line(line)
+        digest = line_digest(line)
+        new_counts[digest] += 1
+        if new_counts[digest] > old_counts[digest]:
+            new_records.add(key, _decode(line, strict))
+
+    # Occurrences of a line in old beyond its count in new were not matched.
+    old_records = _KeyedRecords()
+    old_seen: Counter[bytes] = Counter()
+    tracker = IdentityTracker()
+    for line in iter_lines(old):
+        key = tracker.key_for_line(line)
+        digest = line_digest(line)
+        old_seen[digest] += 1
+        if old_seen[digest] > new_counts[digest]:
+            old_records.add(key, _decode(line, strict))
+
+    changes = []
+    unpaired = new_records.records
+    for key, old_record in old_records.records.items():
+        new_record = unpaired.pop(key, None)
+        if new_record is None:
+            changes.append(RecordChange(key, old_record, None))
+            continue
+        fields = field_changes(old_record, new_record)
+        if fields:
+            changes.append(RecordChange(key, old_record, new_record, fields))
+    for key, new_record in unpaired.items():
+        changes.append(RecordChange(key, None, new_record))
+    return ChangeSet(tuple(changes))
+
+
+def diff_text(old: str, new: str, strict: bool = False) -> ChangeSet:
+    """Compare two versions of a file's contents."""
+    return diff(old.split("\n"), new.split("\n"), strict)
@@ -0,0 +1,190 @@
+"""Convert swim times between short course yards, short course meters and long course meters."""
+
+from array import array
+from typing import Any, Mapping, Optional, Sequence
+
+import attr
+
+from sdif.models import CourseStatusCode, StrokeCode
+from sdif.time import Time
+
+FACTOR_SCALE = 10000
+
+LONG_METERS = CourseStatusCode.long_meters
+SHORT_METERS = CourseStatusCode.short_meters
+SHORT_YARDS = CourseStatusCode.short_yards
+
+
+@attr.define(frozen=True)
+class Factor:
+    """A course's event distance equals lcm_distance in long course meters, and
+    its times are multiplied by scaled / FACTOR_SCALE to get the long course time.
+    """
+
+    lcm_distance: int
+    scaled: int
+
+
+FactorTable = Mapping[tuple[CourseStatusCode, StrokeCode, int], Factor]
+
+
+def _default_factors() -> dict[tuple[CourseStatusCode, StrokeCode, int], Factor]:
+    factors = {}
+    individual = [
+        StrokeCode.freestyle,
+        StrokeCode.backstroke,
+        StrokeCode.breaststroke,
+        StrokeCode.butterfly,
+        StrokeCode.im,
+    ]
+    relays = [StrokeCode.free_relay, StrokeCode.medley_relay]
+    yards = {25: 25, 50: 50, 100: 100, 200: 200, 400: 400, 500: 400, 1000: 800, 1650: 1500}
+    yard_factors = {500: 8925, 1000: 8925, 1650: 10200}
+    for stroke in individual:
+        for distance, lcm_distance in yards.items():
+            if distance in yard_factors and stroke != StrokeCode.freestyle:
+                continue
+            if distance == 400 and stroke != StrokeCode.im:
+                continue
+            factors[SHORT_YARDS, stroke, distance] = Factor(
+                lcm_distance, yard_factors.get(distance, 11100)
+            )
+        for distance in (25, 50, 100, 200, 400, 800, 1500):
+            factors[SHORT_METERS, stroke, distance] = Factor(distance, 10200)
+    for stroke in relays:
+        for distance in (100, 200, 400, 800):
+            factors[SHORT_YARDS, stroke, distance] = Factor(distance, 11100)
+            factors[SHORT_METERS, stroke, distance] = Factor(distance, 10200)
+    return factors
+
+
+# Rule-of-thumb factors; pass a modified copy as table to use different ones.
+FACTORS: FactorTable = _default_factors()
+
+
+def _factor(
+    course: CourseStatusCode, stroke: StrokeCode, distance: int, table: FactorTable
+) -> Optional[Factor]:
+    course = course.normalize()
+    if course == LONG_METERS:
+        return Factor(distance, FACTOR_SCALE)
+    return table.get((course, stroke, distance))
+
+
+def equivalent_distance(
+    distance: int,
+    stroke: StrokeCode,
+    from_course: CourseStatusCode,
+    to_course: CourseStatusCode,
+    table: FactorTable = FACTORS,
+) -> Optional[int]:
+    """The to_course distance of the event swum over distance in from_course, e.g. 500 yards
+    is 400 long course meters."""
+    if from_course.normalize() == to_course.normalize():
+        return distance
+    source = _factor(from_course, stroke, distance, table)
+    if source is None:
+        return None
+    to_course = to_course.normalize()
+    if to_course == LONG_METERS:
+        return source.lcm_distance
+    for (course, table_stroke, to_distance), factor in table.items():
+        if (
+            course == to_course
+            and table_stroke == stroke
+            and factor.lcm_distance == source.lcm_distance
+        ):
+            return to_distance
+    return None
+
+
+def conversion_factor(
+    distance: int,
+    stroke: StrokeCode,
+    from_course: CourseStatusCode,
+    to_course: CourseStatusCode,
+    table: FactorTable = FACTORS,
+) -> Optional[tuple[int, int]]:
+    """(numerator, denominator) converting from_course times over distance to to_course times."""
+    if from_course.normalize() == to_course.normalize():
+        return 1, 1
+    to_distance = equivalent_distance(distance, stroke, from_course, to_course, table)
+    if to_distance is None:
+        return None
+    source = _factor(from_course, stroke, distance, table)
+    target = _factor(to_course, stroke, to_distance, table)
+    assert source is not None and target is not None
+    return source.scaled, target.scaled
+
+
+def convert_centiseconds(centiseconds: int, numerator: int, denominator: int) -> int:
+    """centiseconds * numerator / denominator, rounded half up."""
+    return (2 * centiseconds * numerator + denominator) // (2 * denominator)
+
+
+def convert(
+    time: Time,
+    distance: int,
+    stroke: StrokeCode,
+    from_course: CourseStatusCode,
+    to_course: CourseStatusCode,
+    table: FactorTable = FACTORS,
+) -> Optional[Time]:
+    """Convert a time swum over distance in from_course, or None if there is no factor."""
+    factor = conversion_factor(distance, stroke, from_course, to_course, table)
+    if factor is None:
+        return None
+    return Time(convert_centiseconds(time.centiseconds, *factor))
+
+
+def _convert_array(centiseconds: Any, numerator: int, denominator: int) -> Any:
+    if hasattr(centiseconds, "__array__"):
+        return (2 * numerator * centiseconds + denominator) // (2 * denominator)
+    return array("q", [convert_centiseconds(cs, numerator, denominator) for cs in centiseconds])
+
+
+def convert_column(
+    centiseconds: Sequence[int],
+    distance: int,
+    stroke: StrokeCode,
+    from_course: CourseStatusCode,
+    to_course: CourseStatusCode,
+    table: FactorTable = FACTORS,
+) -> Optional[Any]:
+    """Convert a column of times swum over distance in from_course, or None if there
+    is no factor. numpy arrays give numpy arrays; other sequences give array("q")."""
+    factor = conversion_factor(distance, stroke, from_course, to_course, table)
+    if factor is None:
+        return None
+    return _convert_array(centiseconds, *factor)
+
+
+def convert_columns(
+    centiseconds: Sequence[int],
+    distances: Sequence[int],
+    strokes: Sequence[StrokeCode],
+    from_courses: Sequence[CourseStatusCode],
+    to_course: CourseStatusCode,
+    table: FactorTable = FACTORS,
+) -> list[Optional[int]]:
+    """Convert rows from any mix of events and courses to to_course.
+
+    Rows are grouped by (distance, stroke, course) and each group is converted
+    as one column. Rows without a factor convert to None.
+    """
+    rows: dict[tuple[int, StrokeCode, CourseStatusCode], list[int]] = {}
+    for i, key in enumerate(zip(distances, strokes, from_courses)):
+        rows.setdefault(key, []).append(i)
+    converted: list[Optional[int]] = [None] * len(centiseconds)
+    for (distance, stroke, course), indices in rows.items():
+        factor = conversion_factor(distance, stroke, course, to_course, table)
+        if factor is None:
+            continue
+        if hasattr(centiseconds, "__array__"):
+            column = centiseconds[indices]  # type: ignore
+        else:
+            column = array("q", [centiseconds[i] for i in indices])
+        column = _convert_array(column, *factor)
+        for i, cs in zip(indices, column):
+            converted[i] = cs
+    return converted
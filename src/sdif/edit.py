@@ -0,0 +1,144 @@
+"""Edit an SDIF file without re-encoding the records you didn't touch."""
+
+import io
+import os
+from collections.abc import MutableSequence
+from typing import Iterable, Iterator, Optional, TextIO, Union, overload
+
+import sdif.model_meta as model_meta
+from sdif.fields import SdifModel
+from sdif.records import RECORD_ENCODING, RECORD_SEP, decode_record, encode_record
+
+
+class _Line:
+    __slots__ = ("raw", "terminator", "record")
+
+    def __init__(self, raw: Optional[str], terminator: str, record: Optional[SdifModel]):
+        # raw is None once the record has been replaced.
+        self.raw = raw
+        self.terminator = terminator
+        self.record = record
+
+
+def _split_terminator(line: str) -> tuple[str, str]:
+    content = line.rstrip("\r\n")
+    return content, line[len(content) :]
+
+
+class EditSession(MutableSequence):
+    """A list of records whose lines are decoded only when accessed.
+
+    On save, lines that weren't replaced or inserted are written back exactly as
+    read, so fields the encoder would normalize (a Decimal written as " 4.",
+    padding, lowercase state codes) stay as the original software wrote them.
+    """
+
+    def __init__(self, lines: Iterable[str] = (), strict: bool = False):
+        """lines may include their terminators; they are preserved on save.
+
+        Blank lines are kept with the terminator of the record before them.
+        """
+        self.strict = strict
+        self._lines: list[_Line] = []
+        # Blank lines before the first record.
+        self._leading = ""
+        for line in lines:
+            content, terminator = _split_terminator(line)
+            if content:
+                self._lines.append(_Line(content, terminator, None))
+            elif self._lines:
+                self._lines[-1].terminator += terminator
+            else:
+                self._leading += terminator
+
+    @classmethod
+    def open(
+        cls, path: Union[str, os.PathLike], strict: bool = False, encoding: str = RECORD_ENCODING
+    ) -> "EditSession":
+        with open(path, "rt", encoding=encoding, newline="") as f:
+            return cls(f, strict)
+
+    @classmethod
+    def from_text(cls, text: str, strict: bool = False) -> "EditSession":
+        # Split lines like open() does, not like str.splitlines, which also
+        # splits on form feeds and other characters that can appear in fields.
+        return cls(io.StringIO(text, newline=""), strict)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def _decoded(self, line: _Line) -> SdifModel:
+        if line.record is None:
+            assert line.raw is not None
+            cls = model_meta.REGISTERED_MODELS[line.raw[:2]]
+            line.record = decode_record(line.raw, cls, self.strict)
+        return line.record
+
+    @overload
+    def __getitem__(self, index: int) -> SdifModel:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[SdifModel]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decoded(line) for line in self._lines[index]]
+        return self._decoded(self._lines[index])
+
+    def __setitem__(self, index, record) -> None:
+        if isinstance(index, slice):
+            raise TypeError("EditSession does not support slice assignment")
+        line = self._lines[index]
+        line.raw = None
+        line.record = record
+
+    def __delitem__(self, index) -> None:
+        del self._lines[index]
+
+    def insert(self, index: int, record: SdifModel) -> None:
+        self._lines.insert(index, _Line(None, RECORD_SEP, record))
+
+    def identifiers(self) -> Iterator[str]:
+        """The record identifier of each line, without decoding anything."""
+        for line in self._lines:
+            yield line.raw[:2] if line.raw is not None else line.record.identifier  # type: ignore
+
+    def indices(self, identifier: str) -> list[int]:
+        return [i for i, ident in enumerate(self.identifiers()) if ident == identifier]
+
+    def modified(self) -> list[int]:
+        """Indices of lines that will be encoded on save."""
+        return [i for i, line in enumerate(self._lines) if line.raw is None]
+
+    def lines(self) -> Iterator[str]:
+        """Each line with its terminator, exactly as it will be saved.
+
+        Leading blank lines come first, and other blank lines are included in
+        the terminator of the line before them.
+        """
+        if self._leading:
+            yield self._leading
+        last = len(self._lines) - 1
+        for i, line in enumerate(self._lines):
+            if line.raw is None:
+                assert line.record is not None
+                content = encode_record(line.record, self.strict)
+            else:
+                content = line.raw
+            terminator = line.terminator
+            if not terminator and i != last:
+                terminator = RECORD_SEP
+            yield content + terminator
+
+    def dumps(self) -> str:
+        return "".join(self.lines())
+
+    def write(self, f: TextIO) -> None:
+        for line in self.lines():
+            f.write(line)
+
+    def save(self, path: Union[str, os.PathLike], encoding: str = RECORD_ENCODING) -> None:
+        with open(path, "wt", encoding=encoding, newline="") as f:
+            self.write(f)
@@ -0,0 +1,244 @@
+"""Resolve swimmer mentions from many meets into canonical swimmers."""
+
+import re
+from datetime import date
+from typing import Hashable, Iterable, Iterator, Optional
+
+import attr
+
+import sdif.models as models
+from sdif.fields import SdifModel
+
+USS_STEM_LEN = 12
+
+
+@attr.define(frozen=True)
+class Mention:
+    source: Hashable
+    name: str
+    birthdate: Optional[date] = None
+    sex: Optional[models.SexCode] = None
+    ussn: str = ""
+    uss_number: str = ""
+    preferred_first_name: str = ""
+
+
+def _clean(s: Optional[str]) -> str:
+    return re.sub(r"[^A-Z]", "", (s or "").upper())
+
+
+def _uss(s: Optional[str]) -> str:
+    return re.sub(r"[^0-9A-Z]", "", (s or "").upper())
+
+
+def split_name(name: str) -> tuple[str, str]:
+    """(last, first) from "Last, First M", normalized to letters only."""
+    last, _, rest = name.partition(",")
+    first = rest.split()[0] if rest.split() else ""
+    return _clean(last), _clean(first)
+
+
+def mentions(records: Iterable[SdifModel], source: Hashable = None) -> Iterator[Mention]:
+    """Mentions from the D0, D3 and F0 records of a file.
+
+    Each mention's source is (source, index of the D0 or F0 record).
+    """
+    pending: Optional[Mention] = None
+    for i, record in enumerate(records):
+        if isinstance(record, models.IndividualInfo):
+            if pending is not None:
+                pending = attr.evolve(
+                    pending,
+                    uss_number=record.uss_number or "",
+                    preferred_first_name=record.preferred_first_name or "",
+                )
+            continue
+        if pending is not None:
+            yield pending
+            pending = None
+        if isinstance(record, models.IndividualEvent):
+            pending = Mention(
+                (source, i), record.name, record.birthdate, record.sex, record.ussn or ""
+            )
+        elif isinstance(record, models.RelayName):
+            yield Mention(
+                (source, i),
+                record.swimmer_name,
+                record.birthdate,
+                record.sex,
+                record.uss_number or "",
+                record.uss_number_new or "",
+                record.preferred_first_name or "",
+            )
+    if pending is not None:
+        yield pending
+
+
+class EntityResolver:
+    """Merges mentions that share a USS number, or whose birthdate, sex, last name
+    and first name agree, comparing only mentions within the same block.
+
+    Weaker matches aren't merged; candidates() lists them. These are a USS stem
+    shared without an agreeing birthdate, a first name that is only an initial or
+    a prefix of several different names, and any stem or prefix match between
+    different full USS numbers.
+    """
+
+    def __init__(self) -> None:
+        self.mentions: list[Mention] = []
+        # Blocks whose members all match, and blocks that need comparison.
+        self._exact: dict[str, list[int]] = {}
+        self._stems: dict[str, list[int]] = {}
+        self._compare: dict[tuple, list[int]] = {}
+
+    def add(self, mention: Mention) -> None:
+        i = len(self.mentions)
+        self.mentions.append(mention)
+        for number in self._numbers(i):
+            self._exact.setdefault(number, []).append(i)
+            if len(number) >= USS_STEM_LEN:
+                self._stems.setdefault(number[:USS_STEM_LEN], []).append(i)
+        last, first = split_name(mention.name)
+        if mention.birthdate is not None and last and first:
+            key = (mention.birthdate, mention.sex, last, first[:1])
+            self._compare.setdefault(key, []).append(i)
+
+    def update(self, mentions: Iterable[Mention]) -> None:
+        for mention in mentions:
+            self.add(mention)
+
+    def _numbers(self, i: int) -> set[str]:
+        mention = self.mentions[i]
+        numbers = {_uss(mention.ussn), _uss(mention.uss_number)}
+        numbers.discard("")
+        return numbers
+
+    def _full(self, i: int) -> set[str]:
+        """The mention's USS numbers that are longer than a stem."""
+        return {n for n in self._numbers(i) if len(n) > USS_STEM_LEN}
+
+    def _first_names(self, i: int) -> set[str]:
+        mention = self.mentions[i]
+        names = {split_name(mention.name)[1], _clean(mention.preferred_first_name)}
+        names.discard("")
+        return names
+
+    def _matches(self) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        """Pairs of mentions to merge, and pairs that only weakly match."""
+        merge: list[tuple[int, int]] = []
+        weak: list[tuple[int, int]] = []
+        for members in self._exact.values():
+            merge.extend((members[0], j) for j in members[1:])
+
+        for members in self._stems.values():
+            # Siblings can share a stem, and full numbers that share one are told
+            # apart by their suffix. A stem alone merges only mentions whose
+            # birthdates agree, and only if they have at most one full number.
+            by_birthdate: dict[Optional[date], list[int]] = {}
+            for i in members:
+                by_birthdate.setdefault(self.mentions[i].birthdate, []).append(i)
+            for birthdate, group in by_birthdate.items():
+                full = {n for i in group for n in self._full(i)}
+                if birthdate is not None and len(full) <= 1:
+                    merge.extend((group[0], j) for j in group[1:])
+            weak.extend((members[0], j) for j in members[1:])
+
+        for members in self._compare.values():
+            # Compare each distinct first name once rather than every pair of mentions.
+            by_name: dict[str, list[int]] = {}
+            for i in members:
+                for name in self._first_names(i):
+                    by_name.setdefault(name, []).append(i)
+            names = sorted(by_name)
+            for name in names:
+                group = by_name[name]
+                merge.extend((group[0], j) for j in group[1:])
+            for a, name_a in enumerate(names):
+                longer = []
+                for name_b in names[a + 1 :]:
+                    if not name_b.startswith(name_a):
+                        break
+                    longer.append(name_b)
+                if not longer:
+                    continue
+                # An initial, or a short name that extends to different names or
+                # to different full numbers, could be any of those siblings.
+                longest = max(longer, key=len)
+                full = {
+                    n for name in [name_a, *longer] for i in by_name[name] for n in self._full(i)
+                }
+                strong = (
+                    len(name_a) > 1
+                    and all(longest.startswith(name_b) for name_b in longer)
+                    and len(full) <= 1
+                )
+                pairs = merge if strong else weak
+                pairs.extend((by_name[name_a][0], by_name[name_b][0]) for name_b in longer)
+        return merge, weak
+
+    def _union_find(self) -> tuple[list[int], list[tuple[int, int]]]:
+        """The root of each mention's cluster, and the weak matches."""
+        parent = list(range(len(self.mentions)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        merge, weak = self._matches()
+        for i, j in merge:
+            i, j = find(i), find(j)
+            if i != j:
+                parent[max(i, j)] = min(i, j)
+        return [find(i) for i in range(len(self.mentions))], weak
+
+    def clusters(self) -> list[list[int]]:
+        """Mention indices grouped by swimmer, each group and the list in order."""
+        roots, _ = self._union_find()
+        groups: dict[int, list[int]] = {}
+        for i, root in enumerate(roots):
+            groups.setdefault(root, []).append(i)
+        return list(groups.values())
+
+    def candidates(self) -> list[tuple[list[int], list[int]]]:
+        """Pairs of clusters that weakly match but weren't merged, for review."""
+        roots, weak = self._union_find()
+        groups: dict[int, list[int]] = {}
+        for i, root in enumerate(roots):
+            groups.setdefault(root, []).append(i)
+        pairs = sorted(
+            {tuple(sorted((roots[i], roots[j]))) for i, j in weak if roots[i] != roots[j]}
+        )
+        return [(groups[a], groups[b]) for a, b in pairs]
+
+    def canonical_id(self, members: Iterable[int]) -> str:
+        """A stable ID for a cluster: its smallest new USS number, else its smallest
+        old USS number, else its smallest name/birthdate/sex."""
+        cluster = [self.mentions[i] for i in members]
+        for numbers in (
+            [_uss(m.uss_number) for m in cluster],
+            [_uss(m.ussn) for m in cluster],
+        ):
+            numbers = [n for n in numbers if n]
+            if numbers:
+                return min(numbers)
+        return min(
+            "|".join(
+                [
+                    "".join(split_name(m.name)),
+                    m.birthdate.isoformat() if m.birthdate else "",
+                    m.sex.value if m.sex else "",
+                ]
+            )
+            for m in cluster
+        )
+
+    def resolve(self) -> dict[Hashable, str]:
+        """Canonical swimmer ID for each mention source."""
+        resolved = {}
+        for members in self.clusters():
+            canonical = self.canonical_id(members)
+            for i in members:
+                resolved[self.mentions[i].source] = canonical
+        return resolved
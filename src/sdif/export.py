@@ -0,0 +1,156 @@
+"""Export records as newline-delimited JSON, one object per record."""
+
+import functools
+import json
+import os
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Iterable, Literal, TextIO, Union
+
+import sdif.model_meta as model_meta
+from sdif.fields import FieldDef, FieldType, SdifModel, record_layout
+from sdif.records import RECORD_ENCODING, decode_value
+from sdif.time import Time
+
+TimeFormat = Literal["centiseconds", "string"]
+
+_TEXT_TYPES = (
+    FieldType.alpha,
+    FieldType.const,
+    FieldType.name_,
+    FieldType.phone,
+    FieldType.postal_code,
+    FieldType.usps,
+    FieldType.ussnum,
+)
+
+_dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def value_json(value: Any, times: TimeFormat = "centiseconds") -> str:
+    """JSON text for a decoded field value.
+
+    Enums are written as their codes, dates as ISO strings, decimals as strings
+    so no precision is lost, and blank fields as null.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, str):
+        return _dumps(value)
+    if isinstance(value, Time):
+        return str(value.centiseconds) if times == "centiseconds" else f'"{value.format()}"'
+    if isinstance(value, Enum):
+        return _dumps(value.value)
+    if isinstance(value, date):
+        return f'"{value.isoformat()}"'
+    if isinstance(value, Decimal):
+        return f'"{value}"'
+    raise TypeError(f"Can't export {value!r}")
+
+
+def _converter(field: FieldDef, strict: bool, times: TimeFormat) -> Callable[[str], str]:
+    if field.record_type in _TEXT_TYPES:
+
+        def convert(raw: str) -> str:
+            stripped = raw.strip()
+            if not stripped:
+                decode_value(field, raw, strict)
+                return "null"
+            return _dumps(stripped)
+
+    elif field.record_type == FieldType.int:
+
+        def convert(raw: str) -> str:
+            stripped = raw.strip()
+            if not stripped:
+                decode_value(field, raw, strict)
+                return "null"
+            return str(int(stripped))
+
+    else:
+
+        def convert(raw: str) -> str:
+            return value_json(decode_value(field, raw, strict), times)
+
+    return convert
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(
+    cls: type[SdifModel], strict: bool, times: TimeFormat
+) -> tuple[tuple[str, int, int, Callable[[str], str]], ...]:
+    plan = []
+    for field in record_layout(cls):
+        if field.name == "identifier":
+            continue
+        start = field.start - 1
+        plan.append(
+            (f',"{field.name}":', start, start + field.len, _converter(field, strict, times))
+        )
+    return tuple(plan)
+
+
+def line_json(line: str, strict: bool = False, times: TimeFormat = "centiseconds") -> str:
+    """The JSON object for one raw record line."""
+    identifier = line[:2]
+    cls = model_meta.REGISTERED_MODELS[identifier]
+    parts = ['{"identifier":"', identifier, '"']
+    for prefix, start, end, convert in _plan(cls, strict, times):
+        parts.append(prefix)
+        parts.append(convert(line[start:end]))
+    parts.append("}")
+    return "".join(parts)
+
+
+def record_json(record: SdifModel, times: TimeFormat = "centiseconds") -> str:
+    """The JSON object for one decoded record; the same text line_json gives for its line."""
+    parts = ['{"identifier":"', record.identifier, '"']
+    for field in record_layout(type(record)):
+        if field.name == "identifier":
+            continue
+        parts.append(f',"{field.name}":')
+        parts.append(value_json(getattr(record, field.name), times))
+    parts.append("}")
+    return "".join(parts)
+
+
+def export_lines(
+    lines: Iterable[str], out: TextIO, strict: bool = False, times: TimeFormat = "centiseconds"
+) -> int:
+    """Write NDJSON for raw record lines, returning the number of records written."""
+    n = 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        out.write(line_json(line, strict, times))
+        out.write("\n")
+        n += 1
+    return n
+
+
+def export_records(
+    records: Iterable[SdifModel], out: TextIO, times: TimeFormat = "centiseconds"
+) -> int:
+    n = 0
+    for record in records:
+        out.write(record_json(record, times))
+        out.write("\n")
+        n += 1
+    return n
+
+
+def export_file(
+    path: Union[str, os.PathLike],
+    out: TextIO,
+    strict: bool = False,
+    times: TimeFormat = "centiseconds",
+    encoding: str = RECORD_ENCODING,
+) -> int:
+    with open(path, "rt", encoding=encoding, newline="") as f:
+        return export_lines(f, out, strict, times)
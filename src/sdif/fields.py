@@ -1,5 +1,6 @@
 import datetime
 import enum
+import functools
 from decimal import Decimal
 from enum import Enum
 from typing import (
@@ -24,9 +25,7 @@ from sdif.time import Time, TimeT
 class SdifModel(Protocol):
     # __attrs_attrs__: ClassVar  # pyright can't detect this without the benefit of plugins
 
-    @property
-    def identifier(self) -> str:
-        ...
+    identifier: ClassVar[str]
 
 
 class FieldType(Enum):
@@ -148,3 +147,23 @@ def record_fields(cls: type[SdifModel]) -> Iterator[FieldDef]:
             record_type=infer_type(attr_type, meta),
             model_type=attr_type,
         )
+
+
+@functools.lru_cache(maxsize=None)
+def record_layout(cls: type[SdifModel]) -> tuple[FieldDef, ...]:
+    """record_fields(cls), computed once per model."""
+    return tuple(record_fields(cls))
+
+
+@functools.lru_cache(maxsize=None)
+def field_def(cls: type[SdifModel], name: str) -> FieldDef:
+    for field in record_layout(cls):
+        if field.name == name:
+            return field
+    raise KeyError(f"{cls.__name__} has no field {name!r}")
+
+
+def field_text(line: str, cls: type[SdifModel], name: str) -> str:
+    """The stripped text of a field in a raw record line, without decoding it."""
+    field = field_def(cls, name)
+    return line[field.start - 1 : field.start - 1 + field.len].strip()
@@ -0,0 +1,64 @@
+"""Natural identity keys for records."""
+
+from typing import Any, Callable
+
+import sdif.model_meta as model_meta
+from sdif.fields import SdifModel, field_text
+
+RecordKey = tuple[str, ...]
+
+
+def _record_getter(record: SdifModel) -> Callable[[str], str]:
+    def get(name: str) -> str:
+        value: Any = getattr(record, name)
+        if value is None:
+            return ""
+        return str(getattr(value, "value", value)).strip()
+
+    return get
+
+
+class IdentityTracker:
+    """Derives identity keys in file order.
+
+    A key identifies "the same" record across two versions of a file, e.g. an
+    IndividualEvent is keyed by swimmer and event number. D3, F0 and G0 records
+    don't carry enough to identify them, so the tracker remembers the preceding
+    D0/E0/F0 context. Key parts are stripped field text, so keys can be
+    computed from raw lines without decoding them.
+    """
+
+    def __init__(self) -> None:
+        self.team = ""
+        self.swimmer = ""
+        self.event = ""
+
+    def key_for_line(self, line: str) -> RecordKey:
+        cls = model_meta.REGISTERED_MODELS[line[:2]]
+        return self._key(cls.identifier, lambda name: field_text(line, cls, name))
+
+    def key_for_record(self, record: SdifModel) -> RecordKey:
+        return self._key(record.identifier, _record_getter(record))
+
+    def _key(self, identifier: str, get: Callable[[str], str]) -> RecordKey:
+        if identifier in ("C1", "C2"):
+            self.team = get("team_code")
+            return (identifier, self.team)
+        if identifier == "D0":
+            self.swimmer = get("ussn") or get("name")
+            self.event = get("event_number")
+            return (identifier, self.swimmer, self.event)
+        if identifier == "D3":
+            return (identifier, get("uss_number") or self.swimmer)
+        if identifier == "E0":
+            self.event = get("event_number")
+            self.swimmer = ""
+            return (identifier, get("team_code"), get("relay_team_name"), self.event)
+        if identifier == "F0":
+            self.swimmer = get("uss_number") or get("swimmer_name")
+            relay = (get("team_code"), get("relay_team_name"), self.event)
+            return (identifier, *relay, get("uss_number_new") or self.swimmer)
+        if identifier == "G0":
+            swimmer = get("ussn") or get("name")
+            return (identifier, swimmer, self.event, get("sequence"))
+        return (identifier,)
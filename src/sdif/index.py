@@ -0,0 +1,171 @@
+"""A persistent index from swimmer identity to record locations across many files."""
+
+import os
+import sqlite3
+from typing import Iterable, Iterator, Union
+
+import attr
+
+import sdif.model_meta as model_meta
+import sdif.models as models
+from sdif.fields import SdifModel, field_text
+from sdif.records import RECORD_ENCODING, decode_record
+
+INDEXED = ("D0", "D3", "F0", "G0")
+
+_IDENTITY_FIELDS = {
+    "D0": [(models.IndividualEvent, "ussn")],
+    "D3": [(models.IndividualInfo, "uss_number")],
+    "F0": [(models.RelayName, "uss_number_new"), (models.RelayName, "uss_number")],
+    "G0": [(models.SplitsRecord, "ussn")],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    swimmer TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    identifier TEXT NOT NULL,
+    PRIMARY KEY (swimmer, file_id, offset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_file ON records (file_id);
+"""
+
+
+@attr.define(frozen=True)
+class Location:
+    path: str
+    offset: int
+    identifier: str
+
+
+def scan(
+    path: Union[str, os.PathLike], encoding: str = RECORD_ENCODING
+) -> Iterator[tuple[str, int, str]]:
+    """(swimmer, offset, identifier) for each identity of each indexed record in a file."""
+    swimmer = ""
+    offset = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            line = raw.decode(encoding)
+            identifier = line[:2]
+            if identifier in _IDENTITY_FIELDS:
+                identities = {
+                    field_text(line, cls, name) for cls, name in _IDENTITY_FIELDS[identifier]
+                }
+                if identifier == "D0":
+                    swimmer = field_text(line, models.IndividualEvent, "ussn")
+                elif identifier == "D3":
+                    identities.add(swimmer)
+                for identity in sorted(identities):
+                    if identity:
+                        yield identity, offset, identifier
+            offset += len(raw)
+
+
+class SwimmerIndex:
+    """Byte offsets of D0, D3, F0 and G0 records by swimmer, in SQLite.
+
+    Records are indexed under every identity they carry: D0 and G0 ussn, D3
+    uss_number and F0 uss_number and uss_number_new. A D3 is also indexed under
+    the ussn of its D0, which links a swimmer's old and new numbers. Rows are
+    clustered by identity, so a lookup reads a contiguous range and then seeks
+    straight to the records. Files are re-indexed only when their size or
+    modification time changes.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], encoding: str = RECORD_ENCODING):
+        """path is the index database, which is created if it doesn't exist."""
+        self.encoding = encoding
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "SwimmerIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def add_file(self, path: Union[str, os.PathLike]) -> bool:
+        """Index a file, returning False if it was already indexed and is unchanged."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        row = self._db.execute(
+            "SELECT id, size, mtime_ns FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is not None and row[1:] == (stat.st_size, stat.st_mtime_ns):
+            return False
+        with self._db:
+            if row is not None:
+                file_id = row[0]
+                self._db.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+                self._db.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?",
+                    (stat.st_size, stat.st_mtime_ns, file_id),
+                )
+            else:
+                cursor = self._db.execute(
+                    "INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                    (path, stat.st_size, stat.st_mtime_ns),
+                )
+                file_id = cursor.lastrowid
+            self._db.executemany(
+                "INSERT OR IGNORE INTO records (swimmer, file_id, offset, identifier)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    (swimmer, file_id, offset, identifier)
+                    for swimmer, offset, identifier in scan(path, self.encoding)
+                ),
+            )
+        return True
+
+    def update(self, paths: Iterable[Union[str, os.PathLike]]) -> int:
+        """Index new and changed files, returning how many were (re)indexed."""
+        return sum(self.add_file(path) for path in paths)
+
+    def remove_file(self, path: Union[str, os.PathLike]) -> None:
+        path = os.path.abspath(path)
+        with self._db:
+            row = self._db.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM records WHERE file_id = ?", row)
+                self._db.execute("DELETE FROM files WHERE id = ?", row)
+
+    def files(self) -> list[str]:
+        return [path for (path,) in self._db.execute("SELECT path FROM files ORDER BY path")]
+
+    def locations(self, swimmer: str) -> list[Location]:
+        """Where a swimmer's records are, in file and then file order."""
+        rows = self._db.execute(
+            "SELECT files.path, records.offset, records.identifier FROM records"
+            " JOIN files ON files.id = records.file_id"
+            " WHERE records.swimmer = ? ORDER BY files.path, records.offset",
+            (swimmer.strip(),),
+        )
+        return [Location(*row) for row in rows]
+
+    def records(self, swimmer: str, strict: bool = False) -> Iterator[tuple[Location, SdifModel]]:
+        """Decode just a swimmer's records, opening each file once."""
+        f = None
+        try:
+            for location in self.locations(swimmer):
+                if f is None or f.name != location.path:
+                    if f is not None:
+                        f.close()
+                    f = open(location.path, "rb")
+                f.seek(location.offset)
+                line = f.readline().decode(self.encoding).rstrip("\r\n")
+                cls = model_meta.REGISTERED_MODELS[line[:2]]
+                yield location, decode_record(line, cls, strict)
+        finally:
+            if f is not None:
+                f.close()
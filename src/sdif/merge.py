@@ -0,0 +1,122 @@
+"""Merge several SDIF files for the same meet into one file without duplicates."""
+
+import os
+from typing import Iterable, Iterator, Optional, Union
+
+import attr
+
+import sdif.models as models
+from sdif.identity import IdentityTracker, RecordKey
+from sdif.records import (
+    RECORD_ENCODING,
+    RECORD_SEP,
+    decode_record,
+    encode_record,
+    line_digest,
+)
+from sdif.sort import DEFAULT_BUFFER_SIZE, SortedWriter, groups
+from sdif.validate import RecordCounts
+
+
+@attr.define
+class MergeStats:
+    records: int = 0
+    # Dropped records identical to one already written.
+    duplicates: int = 0
+    # Dropped records with the same identity as, but different content to, one already written.
+    conflicts: int = 0
+    conflict_keys: list[RecordKey] = attr.field(factory=list)
+
+
+def _terminator(template: Optional[str], counts: RecordCounts, n_swimmers: int) -> str:
+    if template is not None:
+        terminator = decode_record(template, models.FileTerminator, strict=False)
+    else:
+        terminator = models.FileTerminator(
+            organization=None,
+            file_code=models.FileCode.meet_results,
+            notes="",
+            n_b_records=None,
+            n_meets=None,
+            n_c_records=None,
+            n_teams=None,
+            n_d_records=None,
+            n_swimmers=None,
+            n_e_records=None,
+            n_f_records=None,
+            n_g_records=None,
+            batch_number=None,
+            n_new_members=None,
+            n_renew_members=None,
+            n_member_changes=None,
+            n_member_deletes=None,
+        )
+    terminator = attr.evolve(terminator, n_swimmers=n_swimmers, **counts.terminator_fields())
+    return encode_record(terminator, strict=False)
+
+
+def iter_merged(
+    paths: Iterable[Union[str, os.PathLike]],
+    stats: Optional[MergeStats] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    encoding: str = RECORD_ENCODING,
+) -> Iterator[str]:
+    """The lines of the merged file, without terminators.
+
+    Of the records that share an identity key, such as the same swimmer's entry
+    in the same event, only the first in input file order is written. Hashes of
+    the raw lines tell exact copies from conflicting versions. The input Z0
+    records are replaced by one with counts of the records actually written.
+    """
+    if stats is None:
+        stats = MergeStats()
+    template = None
+    with SortedWriter(buffer_size=buffer_size, encoding=encoding) as writer:
+        for path in paths:
+            with open(path, "rt", encoding=encoding, newline="") as f:
+                for group, team in groups(f):
+                    if group[0].startswith("Z0"):
+                        template = template or group[0]
+                        continue
+                    writer.add_lines(group, team)
+
+        tracker = IdentityTracker()
+        counts = RecordCounts()
+        swimmers: set[str] = set()
+        current = None
+        seen: dict[RecordKey, bytes] = {}
+        for group_key, line in writer.keyed_lines():
+            if group_key != current:
+                current = group_key
+                seen = {}
+            key = tracker.key_for_line(line)
+            digest = line_digest(line, encoding)
+            if key in seen:
+                if seen[key] == digest:
+                    stats.duplicates += 1
+                else:
+                    stats.conflicts += 1
+                    stats.conflict_keys.append(key)
+                continue
+            seen[key] = digest
+            counts.add(line[:2])
+            if line.startswith("D0"):
+                swimmers.add(tracker.swimmer)
+            stats.records += 1
+            yield line
+    stats.records += 1
+    yield _terminator(template, counts, len(swimmers))
+
+
+def merge_files(
+    paths: Iterable[Union[str, os.PathLike]],
+    output: Union[str, os.PathLike],
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    encoding: str = RECORD_ENCODING,
+) -> MergeStats:
+    stats = MergeStats()
+    with open(output, "wt", encoding=encoding, newline="") as f:
+        for line in iter_merged(paths, stats, buffer_size, encoding):
+            f.write(line)
+            f.write(RECORD_SEP)
+    return stats
@@ -0,0 +1,119 @@
+"""Patch individual fields of an SDIF file in place."""
+
+import mmap
+import os
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import sdif.model_meta as model_meta
+from sdif.fields import SdifModel, field_def
+from sdif.records import RECORD_ENCODING, decode_value, encode_value
+
+
+class FieldPatcher:
+    """Overwrite the columns of single fields in a memory-mapped file.
+
+    Fields have fixed positions, so a new value, encoded as encode_record would
+    encode it, never moves other bytes. Offsets are the byte offsets of the
+    start of a record's line, from record_offsets() or an earlier scan.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        strict: bool = False,
+        encoding: str = RECORD_ENCODING,
+    ):
+        self.strict = strict
+        self.encoding = encoding
+        self._file = open(path, "r+b")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> "FieldPatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._mmap.closed:
+            self._mmap.flush()
+            self._mmap.close()
+        self._file.close()
+
+    def flush(self) -> None:
+        self._mmap.flush()
+
+    def record_offsets(self) -> Iterator[tuple[int, str]]:
+        """Scan the file for (offset, identifier) of every record line."""
+        mm = self._mmap
+        offset = 0
+        size = len(mm)
+        while offset < size:
+            end = mm.find(b"\n", offset)
+            if end == -1:
+                end = size
+            if mm[offset : offset + 2].strip(b"\r\n"):
+                yield offset, mm[offset : offset + 2].decode(self.encoding)
+            offset = end + 1
+
+    def _locate(
+        self, offset: int, name: str, record_type: Optional[type[SdifModel]]
+    ) -> tuple[type[SdifModel], int, int, Any]:
+        if not 0 <= offset < len(self._mmap):
+            raise ValueError(f"{offset=} is outside the file")
+        if offset > 0 and self._mmap[offset - 1] != ord("\n"):
+            raise ValueError(f"{offset=} is not the start of a line")
+        identifier = self._mmap[offset : offset + 2].decode(self.encoding)
+        cls = model_meta.REGISTERED_MODELS[identifier]
+        if record_type is not None and cls is not record_type:
+            raise ValueError(f"Record at {offset=} is {cls.__name__}, not {record_type.__name__}")
+        if name == "identifier":
+            raise ValueError("The record identifier cannot be patched")
+        field = field_def(cls, name)
+        start = offset + field.start - 1
+        end = start + field.len
+        line_end = self._mmap.find(b"\n", offset)
+        if line_end == -1:
+            line_end = len(self._mmap)
+        if self._mmap[offset:line_end].endswith(b"\r"):
+            line_end -= 1
+        if end > line_end:
+            raise ValueError(
+                f"Record at {offset=} is too short to hold {name} ({line_end - offset} bytes)"
+            )
+        return cls, start, end, field
+
+    def read(self, offset: int, name: str, record_type: Optional[type[SdifModel]] = None) -> Any:
+        _, start, end, field = self._locate(offset, name, record_type)
+        return decode_value(field, self._mmap[start:end].decode(self.encoding), self.strict)
+
+    def patch(
+        self,
+        offset: int,
+        name: str,
+        value: Any,
+        record_type: Optional[type[SdifModel]] = None,
+    ) -> None:
+        """Overwrite one field of the record starting at offset.
+
+        If record_type is given, the record at offset must be of that type.
+        """
+        _, start, end, field = self._locate(offset, name, record_type)
+        encoded = encode_value(field, value, self.strict).encode(self.encoding)
+        if len(encoded) != field.len:
+            raise ValueError(
+                f"{name} encodes to {len(encoded)} bytes in {self.encoding}, not {field.len}"
+            )
+        self._mmap[start:end] = encoded
+
+    def patch_many(self, updates: Iterable[tuple[int, str, Any]]) -> int:
+        """Apply (offset, field name, value) updates, returning how many were applied."""
+        n = 0
+        for offset, name, value in updates:
+            self.patch(offset, name, value)
+            n += 1
+        return n
@@ -0,0 +1,184 @@
+"""Batched record pipelines."""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+import attr
+
+import sdif.model_meta as model_meta
+from sdif.fields import SdifModel
+from sdif.records import RECORD_ENCODING, decode_record
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+@attr.define(frozen=True)
+class Batch:
+    record_type: type[SdifModel]
+    records: list[SdifModel]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def read_batches(
+    lines: Iterable[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    strict: bool = False,
+    types: Optional[Iterable[type[SdifModel]]] = None,
+) -> Iterator[Batch]:
+    """Decode lines into single-type batches.
+
+    Per-record costs are paid once per batch. Batches of each type come out in
+    file order, but batches of different types are interleaved by when they
+    fill up, not by line order. If types is given, lines of other record types
+    are skipped without being decoded.
+    """
+    wanted = None if types is None else {cls.identifier for cls in types}
+    pending: dict[str, list[str]] = {}
+
+    def decode(identifier: str) -> Batch:
+        cls = model_meta.REGISTERED_MODELS[identifier]
+        batch = pending.pop(identifier)
+        return Batch(cls, [decode_record(line, cls, strict) for line in batch])
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        identifier = line[:2]
+        if wanted is not None and identifier not in wanted:
+            continue
+        if identifier not in model_meta.REGISTERED_MODELS:
+            raise ValueError(f"Unknown record identifier {identifier!r}")
+        batch = pending.setdefault(identifier, [])
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield decode(identifier)
+    for identifier in list(pending):
+        yield decode(identifier)
+
+
+def read_file_batches(
+    path: Union[str, os.PathLike],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    strict: bool = False,
+    types: Optional[Iterable[type[SdifModel]]] = None,
+    encoding: str = RECORD_ENCODING,
+) -> Iterator[Batch]:
+    with open(path, "rt", encoding=encoding, newline="") as f:
+        yield from read_batches(f, batch_size, strict, types)
+
+
+@attr.define(frozen=True)
+class _Filter:
+    predicate: Callable[[SdifModel], bool]
+
+    def __call__(self, batch: Batch) -> Optional[Batch]:
+        return Batch(batch.record_type, [r for r in batch.records if self.predicate(r)])
+
+
+@attr.define(frozen=True)
+class _Map:
+    fn: Callable[[SdifModel], SdifModel]
+
+    def __call__(self, batch: Batch) -> Optional[Batch]:
+        return Batch(batch.record_type, [self.fn(r) for r in batch.records])
+
+
+@attr.define(frozen=True)
+class _Only:
+    identifiers: frozenset[str]
+
+    def __call__(self, batch: Batch) -> Optional[Batch]:
+        return batch if batch.record_type.identifier in self.identifiers else None
+
+
+@attr.define(frozen=True)
+class _Stages:
+    stages: tuple[Callable[[Batch], Optional[Batch]], ...]
+
+    def __call__(self, batch: Batch) -> Optional[Batch]:
+        for stage in self.stages:
+            result = stage(batch)
+            if result is None or not result.records:
+                return None
+            batch = result
+        return batch
+
+
+class Pipeline:
+    """Filter and map stages applied to each batch before it reaches a sink.
+
+    With an executor, the stages run on it with at most max_in_flight batches
+    outstanding; the source is iterated, and so read_batches decodes, on the
+    calling thread, as does the sink, which receives batches in order. To use a
+    process pool, the stage functions must be picklable.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Batch],
+        executor: Optional[Executor] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ):
+        self.source = source
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self._stages: list[Callable[[Batch], Optional[Batch]]] = []
+
+    def only(self, *types: type[SdifModel]) -> "Pipeline":
+        """Drop batches of other record types."""
+        self._stages.append(_Only(frozenset(cls.identifier for cls in types)))
+        return self
+
+    def filter(self, predicate: Callable[[SdifModel], bool]) -> "Pipeline":
+        self._stages.append(_Filter(predicate))
+        return self
+
+    def map(self, fn: Callable[[SdifModel], SdifModel]) -> "Pipeline":
+        """Transform each record; fn should return records of the same type."""
+        self._stages.append(_Map(fn))
+        return self
+
+    def map_batches(self, fn: Callable[[Batch], Optional[Batch]]) -> "Pipeline":
+        """Transform whole batches; returning None or an empty batch drops it."""
+        self._stages.append(fn)
+        return self
+
+    def __iter__(self) -> Iterator[Batch]:
+        """Processed batches, in source order, without empty batches."""
+        stages = _Stages(tuple(self._stages))
+        if self.executor is None:
+            for batch in self.source:
+                result = stages(batch)
+                if result is not None:
+                    yield result
+            return
+
+        in_flight: deque[Future] = deque()
+        try:
+            for batch in self.source:
+                if len(in_flight) >= self.max_in_flight:
+                    result = in_flight.popleft().result()
+                    if result is not None:
+                        yield result
+                in_flight.append(self.executor.submit(stages, batch))
+            while in_flight:
+                result = in_flight.popleft().result()
+                if result is not None:
+                    yield result
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def sink(self, fn: Callable[[Batch], None]) -> int:
+        """Run the pipeline, passing each batch to fn; returns the number of records sunk."""
+        n = 0
+        for batch in self:
+            fn(batch)
+            n += len(batch)
+        return n
@@ -0,0 +1,68 @@
+"""Opt-in instrumentation for the record codec."""
+
+from collections import Counter, defaultdict
+from typing import Optional
+
+import attr
+
+from sdif.fields import FieldType
+
+
+@attr.define
+class CodecStats:
+    """Counters and timings accumulated across one or more codec calls.
+
+    Pass one as the stats argument of sdif.records.decode_records or
+    encode_records; without it, the codec takes its uninstrumented path. Times are wall-clock seconds from time.perf_counter. record_seconds
+    includes the time spent in field converters, which is also broken out by
+    FieldType in field_seconds. blank_fields is keyed by (identifier, field name);
+    errors is keyed by (identifier, exception class name).
+    """
+
+    records: Counter = attr.field(factory=Counter)
+    record_seconds: defaultdict = attr.field(factory=lambda: defaultdict(float))
+    field_calls: Counter = attr.field(factory=Counter)
+    field_seconds: defaultdict = attr.field(factory=lambda: defaultdict(float))
+    blank_fields: Counter = attr.field(factory=Counter)
+    errors: Counter = attr.field(factory=Counter)
+
+    def record_error(self, identifier: str, exc: BaseException) -> None:
+        self.errors[(identifier, type(exc).__name__)] += 1
+
+    def merge(self, other: "CodecStats") -> None:
+        self.records.update(other.records)
+        self.field_calls.update(other.field_calls)
+        self.blank_fields.update(other.blank_fields)
+        self.errors.update(other.errors)
+        for identifier, seconds in other.record_seconds.items():
+            self.record_seconds[identifier] += seconds
+        for field_type, seconds in other.field_seconds.items():
+            self.field_seconds[field_type] += seconds
+
+    def summary(self, top: Optional[int] = 10) -> str:
+        lines = ["Records by identifier:"]
+        for identifier, seconds in sorted(self.record_seconds.items(), key=lambda i: -i[1]):
+            n = self.records[identifier]
+            lines.append(
+                f"  {identifier}  {n:10d} records  {seconds:10.4f} s"
+                f"  {1e6 * seconds / max(n, 1):8.2f} us/record"
+            )
+
+        lines.append("Field converters by type:")
+        for field_type, seconds in sorted(self.field_seconds.items(), key=lambda i: -i[1]):
+            assert isinstance(field_type, FieldType)
+            n = self.field_calls[field_type]
+            lines.append(
+                f"  {field_type.name:12s}  {n:10d} calls  {seconds:10.4f} s"
+                f"  {1e6 * seconds / max(n, 1):8.2f} us/call"
+            )
+
+        lines.append("Blank fields:")
+        for (identifier, name), n in self.blank_fields.most_common(top):
+            lines.append(f"  {identifier}.{name:30s} {n:10d}")
+
+        lines.append("Errors:")
+        for (identifier, exc_name), n in self.errors.most_common(top):
+            lines.append(f"  {identifier}  {exc_name:30s} {n:10d}")
+
+        return "\n".join(lines)
@@ -0,0 +1,166 @@
+"""Season best times and per-event top-N rankings."""
+
+import heapq
+import os
+from concurrent.futures import Executor
+from datetime import date
+from itertools import repeat
+from typing import Iterable, Iterator, Optional, Union
+
+import attr
+
+from sdif.fields import SdifModel
+from sdif.models import CourseStatusCode, EventSexCode, IndividualEvent, StrokeCode
+from sdif.records import RECORD_ENCODING, decode_records
+from sdif.time import Time
+
+DEFAULT_TOP_N = 16
+
+
+@attr.define(frozen=True)
+class EventKey:
+    """An event; swims() normalizes the course, so "1" and "M" are the same course."""
+
+    distance: int
+    stroke: StrokeCode
+    course: CourseStatusCode
+    event_sex: EventSexCode
+    event_age: str
+
+
+@attr.define(frozen=True)
+class Swim:
+    swimmer: str
+    name: str
+    time: Time
+    date: Optional[date]
+    event_number: Optional[str]
+
+
+@attr.define(frozen=True)
+class _Descending:
+    """A swimmer id that sorts in reverse, so the heap root is the worst ranked on ties."""
+
+    swimmer: str
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return self.swimmer > other.swimmer
+
+
+def swims(record: IndividualEvent) -> Iterator[tuple[EventKey, Swim]]:
+    """The timed swims in a D0 record: prelims, swim-off and finals."""
+    if (
+        record.event_distance is None
+        or record.stroke is None
+        or record.event_sex is None
+        or record.event_age is None
+    ):
+        return
+    swimmer = record.ussn or record.name
+    for time, course in (
+        (record.prelim_time, record.prelim_time_course),
+        (record.swim_off_time, record.swim_off_time_course),
+        (record.finals_time, record.finals_time_course),
+    ):
+        if not isinstance(time, Time) or course is None or course == CourseStatusCode.disqualified:
+            continue
+        key = EventKey(
+            record.event_distance,
+            record.stroke,
+            course.normalize(),
+            record.event_sex,
+            record.event_age,
+        )
+        yield key, Swim(swimmer, record.name, time, record.date_of_swim, record.event_number)
+
+
+class SeasonRankings:
+    """Each swimmer's best time per event and the fastest top_n per event.
+
+    The top_n are kept in a bounded heap, so memory grows with the number of
+    swimmers rather than swims. Partial rankings built by separate workers can
+    be combined with merge().
+    """
+
+    def __init__(self, top_n: int = DEFAULT_TOP_N):
+        self.top_n = top_n
+        self.best: dict[EventKey, dict[str, Swim]] = {}
+        # Per event, a heap of (-centiseconds, swimmer) whose root is the
+        # slowest of the top_n swimmers, and of those the last in top() order.
+        self._heaps: dict[EventKey, list[tuple[int, _Descending]]] = {}
+
+    def add(self, record: IndividualEvent) -> None:
+        for key, swim in swims(record):
+            self.offer(key, swim)
+
+    def update(self, records: Iterable[SdifModel]) -> None:
+        """Add every IndividualEvent in records, ignoring other record types."""
+        for record in records:
+            if isinstance(record, IndividualEvent):
+                self.add(record)
+
+    def offer(self, key: EventKey, swim: Swim) -> bool:
+        """Record a swim, returning True if it is the swimmer's new best."""
+        best = self.best.setdefault(key, {})
+        previous = best.get(swim.swimmer)
+        if previous is not None and previous.time.centiseconds <= swim.time.centiseconds:
+            return False
+        best[swim.swimmer] = swim
+
+        heap = self._heaps.setdefault(key, [])
+        entry = (-swim.time.centiseconds, _Descending(swim.swimmer))
+        if previous is not None:
+            old_entry = (-previous.time.centiseconds, _Descending(swim.swimmer))
+            try:
+                i = heap.index(old_entry)
+            except ValueError:
+                pass
+            else:
+                heap[i] = entry
+                heapq.heapify(heap)
+                return True
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif heap[0] < entry:
+            heapq.heapreplace(heap, entry)
+        return True
+
+    def best_time(self, swimmer: str, key: EventKey) -> Optional[Swim]:
+        return self.best.get(key, {}).get(swimmer)
+
+    def top(self, key: EventKey) -> list[Swim]:
+        """The top_n fastest swimmers in an event, fastest first."""
+        best = self.best.get(key, {})
+        ranked = sorted((-cs, entry.swimmer) for cs, entry in self._heaps.get(key, []))
+        return [best[swimmer] for _, swimmer in ranked]
+
+    def keys(self) -> list[EventKey]:
+        return list(self.best)
+
+    def merge(self, other: "SeasonRankings") -> None:
+        for key, best in other.best.items():
+            for swim in best.values():
+                self.offer(key, swim)
+
+
+def rank_file(
+    path: Union[str, os.PathLike], top_n: int = DEFAULT_TOP_N, encoding: str = RECORD_ENCODING
+) -> SeasonRankings:
+    """Rankings for one file, decoding only its D0 records."""
+    rankings = SeasonRankings(top_n)
+    with open(path, "rt", encoding=encoding, newline="") as f:
+        rankings.update(decode_records(line for line in f if line.startswith("D0")))
+    return rankings
+
+
+def rank_files(
+    paths: Iterable[Union[str, os.PathLike]],
+    top_n: int = DEFAULT_TOP_N,
+    executor: Optional[Executor] = None,
+) -> SeasonRankings:
+    """Rankings across many files, optionally ranking each file on an executor."""
+    mapper = map if executor is None else executor.map
+    rankings = SeasonRankings(top_n)
+    for partial in mapper(rank_file, paths, repeat(top_n)):
+        rankings.merge(partial)
+    return rankings
@@ -1,17 +1,28 @@
+import hashlib
 from datetime import date
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Final, Iterable, TypeVar, get_args
+from time import perf_counter
+from typing import Any, Callable, Final, Iterable, Literal, Optional, TypeVar, get_args
 
+import attr
 from typing_extensions import assert_never
 
 import sdif.fields as fields
 import sdif.model_meta as model_meta
 from sdif.fields import FieldDef, FieldType, SdifModel
+from sdif.profiling import CodecStats
 from sdif.time import Time, TimeCode, TimeT
 
 RECORD_CONTENT_LEN: Final = 160
 RECORD_SEP: Final = "\r\n"
+# Single-byte, so byte offsets and column offsets agree, and every byte decodes.
+RECORD_ENCODING: Final = "latin-1"
+
+
+def line_digest(line: str, encoding: str = RECORD_ENCODING) -> bytes:
+    """A short hash of a raw record line, for telling identical lines apart cheaply."""
+    return hashlib.blake2b(line.encode(encoding), digest_size=16).digest()
 
 
 def encode_value(field: FieldDef, value: Any, strict: bool) -> str:
@@ -101,7 +112,34 @@ def encode_record(record: fields.SdifModel, strict: bool) -> str:
     return "".join(buf)
 
 
-def encode_records(records: Iterable[fields.SdifModel], strict: bool = False) -> str:
+def _encode_record_instrumented(record: fields.SdifModel, strict: bool, stats: CodecStats) -> str:
+    identifier = record.identifier
+    record_start = perf_counter()
+    buf = [" "] * RECORD_CONTENT_LEN
+    try:
+        for field in fields.record_fields(type(record)):
+            value = getattr(record, field.name)
+            if value is None:
+                stats.blank_fields[(identifier, field.name)] += 1
+            start = perf_counter()
+            encoded = encode_value(field, value, strict)
+            stats.field_seconds[field.record_type] += perf_counter() - start
+            stats.field_calls[field.record_type] += 1
+            assert len(encoded) == field.len
+            buf[field.start - 1 : field.start - 1 + field.len] = encoded
+    except Exception as e:
+        stats.record_error(identifier, e)
+        raise
+    stats.records[identifier] += 1
+    stats.record_seconds[identifier] += perf_counter() - record_start
+    return "".join(buf)
+
+
+def encode_records(
+    records: Iterable[fields.SdifModel], strict: bool = False, stats: Optional[CodecStats] = None
+) -> str:
+    if stats is not None:
+        return RECORD_SEP.join(_encode_record_instrumented(i, strict, stats) for i in records)
     return RECORD_SEP.join(encode_record(i, strict) for i in records)
 
 
@@ -174,9 +212,145 @@ def decode_record(record: str, record_type: type[M], strict: bool) -> M:
     return record_type(**kwargs)
 
 
-def decode_records(records: Iterable[str], strict: bool = False) -> Iterable[SdifModel]:
+def _decode_record_instrumented(
+    record: str, record_type: type[M], strict: bool, stats: CodecStats
+) -> M:
+    identifier = record_type.identifier
+    record_start = perf_counter()
+    kwargs = {}
+    try:
+        for field in fields.record_fields(record_type):
+            if field.name == "identifier":
+                continue
+            value = record[field.start - 1 : field.start - 1 + field.len]
+            start = perf_counter()
+            decoded = decode_value(field, value, strict)
+            stats.field_seconds[field.record_type] += perf_counter() - start
+            stats.field_calls[field.record_type] += 1
+            if decoded is None:
+                stats.blank_fields[(identifier, field.name)] += 1
+            kwargs[field.name] = decoded
+        result = record_type(**kwargs)
+    except Exception as e:
+        stats.record_error(identifier, e)
+        raise
+    stats.records[identifier] += 1
+    stats.record_seconds[identifier] += perf_counter() - record_start
+    return result
+
+
+@attr.define(frozen=True)
+class RecordError:
+    """A line that decode_records(errors="collect") could not decode.
+
+    line_number is 1-based. field is the first field that failed to decode, or
+    None if the record identifier was unknown or every field decoded but the
+    record as a whole did not; raw is then the whole line.
+    """
+
+    line_number: int
+    identifier: str
+    field: Optional[str]
+    raw: str
+    exception: Exception
+
+
+class ErrorBudgetExceeded(ValueError):
+    def __init__(self, errors: list[RecordError]):
+        super().__init__(f"Too many records failed to decode ({len(errors)})")
+        self.errors = errors
+
+
+def _locate_error(
+    record: str, record_type: type[SdifModel], strict: bool
+) -> tuple[Optional[str], str]:
+    for field in fields.record_layout(record_type):
+        if field.name == "identifier":
+            continue
+        value = record[field.start - 1 : field.start - 1 + field.len]
+        try:
+            decode_value(field, value, strict)
+        except Exception:
+            return field.name, value
+    return None, record
+
+
+def _decode_records_collecting(
+    records: Iterable[str],
+    strict: bool,
+    stats: Optional[CodecStats],
+    error_log: list[RecordError],
+    max_errors: Optional[int],
+) -> Iterable[SdifModel]:
+    decode: Callable[[str, type[SdifModel]], SdifModel]
+    if stats is None:
+        decode = lambda record, cls: decode_record(record, cls, strict)
+    else:
+        decode = lambda record, cls: _decode_record_instrumented(record, cls, strict, stats)
+
+    n_errors = 0
+    for line_number, record in enumerate(records, start=1):
+        identifier = record[:2]
+        try:
+            cls = model_meta.REGISTERED_MODELS[identifier]
+        except KeyError as e:
+            if stats is not None:
+                stats.record_error(identifier, e)
+            error = RecordError(line_number, identifier, None, record, e)
+        else:
+            try:
+                decoded = decode(record, cls)
+            except Exception as e:
+                field, raw = _locate_error(record, cls, strict)
+                error = RecordError(line_number, identifier, field, raw, e)
+            else:
+                yield decoded
+                continue
+
+        error_log.append(error)
+        n_errors += 1
+        if max_errors is not None and n_errors > max_errors:
+            raise ErrorBudgetExceeded(error_log)
+
+
+def decode_records(
+    records: Iterable[str],
+    strict: bool = False,
+    stats: Optional[CodecStats] = None,
+    errors: Literal["raise", "collect"] = "raise",
+    error_log: Optional[list[RecordError]] = None,
+    max_errors: Optional[int] = None,
+) -> Iterable[SdifModel]:
+    """Decode record lines.
+
+    With errors="collect", lines that fail to decode are skipped and described
+    by RecordErrors appended to error_log, which is required. If more than
+    max_errors lines fail, ErrorBudgetExceeded is raised.
+    """
     if isinstance(records, str):
         records = records.split(RECORD_SEP)
+    if errors == "collect":
+        if error_log is None:
+            raise ValueError('errors="collect" requires an error_log list')
+        yield from _decode_records_collecting(records, strict, stats, error_log, max_errors)
+        return
+    if errors != "raise":
+        raise ValueError(f"Unknown errors mode {errors!r}")
+    if stats is not None:
+        yield from _decode_records_instrumented(records, strict, stats)
+        return
     for record in records:
         cls = model_meta.REGISTERED_MODELS[record[:2]]
         yield decode_record(record, cls, strict)
+
+
+def _decode_records_instrumented(
+    records: Iterable[str], strict: bool, stats: CodecStats
+) -> Iterable[SdifModel]:
+    for record in records:
+        try:
+            cls = model_meta.REGISTERED_MODELS[record[:2]]
+        except KeyError as e:
+            stats.record_error(record[:2], e)
+            raise
+        yield _decode_record_instrumented(record, cls, strict, stats)
@@ -0,0 +1,122 @@
+"""Team scores from finals points."""
+
+from collections import Counter
+from decimal import Decimal
+from typing import Iterable, Optional
+
+import sdif.models as models
+from sdif.fields import SdifModel, field_text
+from sdif.identity import IdentityTracker, RecordKey
+
+
+def parse_centipoints(text: str) -> Optional[int]:
+    """Centipoints from the text of a points field, e.g. " 4.5" -> 450."""
+    text = text.strip()
+    if not text:
+        return None
+    sign = -1 if text.startswith("-") else 1
+    whole, _, fraction = text.lstrip("+-").partition(".")
+    return sign * (int(whole or 0) * 100 + int((fraction + "00")[:2]))
+
+
+def _from_decimal(points: Optional[Decimal]) -> Optional[int]:
+    return None if points is None else int(points * 100)
+
+
+class TeamScores:
+    """Per-team and per-event totals, in exact integer centipoints.
+
+    Individual points come from points_scored_finals, plus the Meet Manager
+    centipoints_scored_finals extension when present; relay points come from
+    finals_points. D0 records have no team code, so they are credited to the
+    team of the preceding C1 record, or to the team passed to add or add_line.
+    Each result is remembered by its identity key, so a corrected result
+    replaces the earlier points and stays with the team first credited.
+    """
+
+    def __init__(self) -> None:
+        self._tracker = IdentityTracker()
+        # Identity key -> (team, event number, centipoints)
+        self._scored: dict[RecordKey, tuple[str, str, int]] = {}
+        self.team_centipoints: Counter[str] = Counter()
+        self.event_centipoints: dict[str, Counter[str]] = {}
+
+    def _individual_team(self, key: RecordKey, team: Optional[str]) -> str:
+        if team is not None:
+            return team
+        previous = self._scored.get(key)
+        return self._tracker.team if previous is None else previous[0]
+
+    def _score(self, key: RecordKey, team: str, event: str, centipoints: Optional[int]) -> None:
+        previous = self._scored.pop(key, None)
+        if previous is not None:
+            old_team, old_event, old_points = previous
+            self.team_centipoints[old_team] -= old_points
+            self.event_centipoints[old_event][old_team] -= old_points
+        if centipoints is None:
+            return
+        self._scored[key] = (team, event, centipoints)
+        self.team_centipoints[team] += centipoints
+        self.event_centipoints.setdefault(event, Counter())[team] += centipoints
+
+    def add_line(self, line: str, team: Optional[str] = None) -> None:
+        """Score a raw record line without decoding it.
+
+        team overrides the team a D0 line is credited to.
+        """
+        identifier = line[:2]
+        if identifier not in ("C1", "D0", "E0"):
+            return
+        key = self._tracker.key_for_line(line)
+        if identifier == "D0":
+            d0 = models.IndividualEvent
+            points = parse_centipoints(field_text(line, d0, "points_scored_finals"))
+            centipoints = field_text(line, d0, "centipoints_scored_finals")
+            if points is not None and centipoints:
+                points = points // 100 * 100 + int(centipoints)
+            self._score(key, self._individual_team(key, team), self._tracker.event, points)
+        elif identifier == "E0":
+            relay_team = field_text(line, models.RelayEvent, "team_code")
+            points = parse_centipoints(field_text(line, models.RelayEvent, "finals_points"))
+            self._score(key, relay_team, self._tracker.event, points)
+
+    def add(self, record: SdifModel, team: Optional[str] = None) -> None:
+        """Score a record; team overrides the team a D0 record is credited to."""
+        if not isinstance(record, (models.TeamId, models.IndividualEvent, models.RelayEvent)):
+            return
+        key = self._tracker.key_for_record(record)
+        if isinstance(record, models.IndividualEvent):
+            points = _from_decimal(record.points_scored_finals)
+            if points is not None and record.centipoints_scored_finals is not None:
+                points = points // 100 * 100 + record.centipoints_scored_finals
+            self._score(key, self._individual_team(key, team), self._tracker.event, points)
+        elif isinstance(record, models.RelayEvent):
+            relay_team = record.team_code.strip()
+            points = _from_decimal(record.finals_points)
+            self._score(key, relay_team, self._tracker.event, points)
+
+    def update(self, records: Iterable[SdifModel]) -> None:
+        for record in records:
+            self.add(record)
+
+    def update_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.add_line(line.rstrip("\r\n"))
+
+    def team_points(self, team: str) -> Decimal:
+        return Decimal(self.team_centipoints[team]).scaleb(-2)
+
+    def event_points(self, event: str) -> dict[str, Decimal]:
+        return {
+            team: Decimal(centipoints).scaleb(-2)
+            for team, centipoints in self.event_centipoints.get(event, Counter()).items()
+            if centipoints
+        }
+
+    def standings(self) -> list[tuple[str, Decimal]]:
+        """(team, points) for every team with points, highest first."""
+        ranked = sorted(
+            ((team, cp) for team, cp in self.team_centipoints.items() if cp),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return [(team, Decimal(cp).scaleb(-2)) for team, cp in ranked]
@@ -0,0 +1,172 @@
+"""Heat and lane seeding for entry files."""
+
+from typing import Hashable, Iterable, Optional, Sequence
+
+import attr
+
+from sdif.courses import FACTORS, FactorTable, convert_column, equivalent_distance
+from sdif.fields import SdifModel
+from sdif.models import CourseStatusCode, IndividualEvent, Meet, RelayEvent, StrokeCode
+from sdif.time import Time
+
+DEFAULT_LANES = 8
+DEFAULT_CIRCLE_HEATS = 3
+# The slowest heat is topped up from the next heat to at least this many swimmers.
+MIN_HEAT_SIZE = 3
+
+
+def lane_order(lanes: int) -> list[int]:
+    """Lane numbers from fastest to slowest seed, center out, e.g. 4 5 3 6 2 7 1 8."""
+    center = (lanes + 1) // 2
+    order = [center]
+    for offset in range(1, lanes):
+        lane = center + (offset + 1) // 2 if offset % 2 else center - offset // 2
+        order.append(lane)
+    return order
+
+
+def heat_sizes(n: int, lanes: int = DEFAULT_LANES) -> list[int]:
+    """The number of swimmers in each heat, slowest heat first."""
+    if n <= 0:
+        return []
+    n_heats = -(-n // lanes)
+    sizes = [lanes] * n_heats
+    sizes[0] = n - lanes * (n_heats - 1)
+    if n_heats > 1 and sizes[0] < MIN_HEAT_SIZE:
+        moved = min(MIN_HEAT_SIZE - sizes[0], sizes[1] - 1)
+        sizes[0] += moved
+        sizes[1] -= moved
+    return sizes
+
+
+def seed_event(
+    seeds: Sequence[Optional[int]],
+    lanes: int = DEFAULT_LANES,
+    circle_heats: int = DEFAULT_CIRCLE_HEATS,
+) -> list[tuple[int, int]]:
+    """(heat, lane) for each entry, in the order given.
+
+    seeds are times in centiseconds, or None for no time, which seeds slowest
+    in the order given. Heats are numbered from 1, slowest first. The fastest
+    circle_heats heats are circle seeded and the rest straight; within a heat
+    the fastest swimmers get the center lanes.
+    """
+    no_time = float("inf")
+    ranked = sorted(range(len(seeds)), key=lambda i: (no_time if seeds[i] is None else seeds[i], i))
+    sizes = heat_sizes(len(ranked), lanes)
+    n_heats = len(sizes)
+    # Entries for each heat, fastest first.
+    heats: list[list[int]] = [[] for _ in sizes]
+
+    circled = min(circle_heats, n_heats)
+    n_circled = sum(sizes[n_heats - circled :])
+    heat = n_heats - 1
+    for i in ranked[:n_circled]:
+        while len(heats[heat]) >= sizes[heat]:
+            heat = heat - 1 if heat > n_heats - circled else n_heats - 1
+        heats[heat].append(i)
+        heat = heat - 1 if heat > n_heats - circled else n_heats - 1
+
+    heat = n_heats - circled - 1
+    for i in ranked[n_circled:]:
+        if len(heats[heat]) >= sizes[heat]:
+            heat -= 1
+        heats[heat].append(i)
+
+    order = lane_order(lanes)
+    assignments = [(0, 0)] * len(seeds)
+    for heat_number, entries in enumerate(heats, start=1):
+        for i, lane in zip(entries, order):
+            assignments[i] = (heat_number, lane)
+    return assignments
+
+
+def _event_key(record: SdifModel) -> Hashable:
+    if isinstance(record, IndividualEvent):
+        if record.event_number:
+            return ("D0", record.event_number.strip())
+        return ("D0", record.event_distance, record.stroke, record.event_sex, record.event_age)
+    assert isinstance(record, RelayEvent)
+    if record.event_number:
+        return ("E0", record.event_number.strip())
+    return ("E0", record.relay_distance, record.stroke, record.event_sex, record.event_age)
+
+
+def _seed_fields(record: SdifModel) -> tuple[object, Optional[CourseStatusCode], int, StrokeCode]:
+    if isinstance(record, IndividualEvent):
+        assert record.event_distance is not None and record.stroke is not None
+        return (record.seed_time, record.seed_time_course, record.event_distance, record.stroke)
+    assert isinstance(record, RelayEvent)
+    return (record.seed_time, record.seed_course, record.relay_distance, record.stroke)
+
+
+def _convert_seeds(
+    seeds: list[Optional[int]],
+    seed_courses: list[Optional[CourseStatusCode]],
+    distance: int,
+    stroke: StrokeCode,
+    course: CourseStatusCode,
+    table: FactorTable,
+) -> None:
+    """Convert an event's seeds to course in place, one column per seed course."""
+    # Seed course -> (indices into seeds, their centiseconds)
+    by_course: dict[CourseStatusCode, tuple[list[int], list[int]]] = {}
+    for i, (cs, seed_course) in enumerate(zip(seeds, seed_courses)):
+        if cs is not None and seed_course is not None:
+            rows, column = by_course.setdefault(seed_course, ([], []))
+            rows.append(i)
+            column.append(cs)
+    for seed_course, (rows, column) in by_course.items():
+        # The seed was swum over the equivalent distance in seed_course.
+        seed_distance = equivalent_distance(distance, stroke, course, seed_course, table)
+        converted = None
+        if seed_distance is not None:
+            converted = convert_column(column, seed_distance, stroke, seed_course, course, table)
+        for j, i in enumerate(rows):
+            seeds[i] = None if converted is None else converted[j]
+
+
+def seed(
+    records: Iterable[SdifModel],
+    course: Optional[CourseStatusCode] = None,
+    lanes: int = DEFAULT_LANES,
+    circle_heats: int = DEFAULT_CIRCLE_HEATS,
+    table: FactorTable = FACTORS,
+) -> list[SdifModel]:
+    """Return records with prelim heats and lanes assigned to every D0 and E0 entry.
+
+    Seed times are converted to course, which defaults to the course of the
+    B1 record; seeds that can't be converted are treated as no time. D0
+    records without an event distance or stroke are left unseeded.
+    """
+    records = list(records)
+    if course is None:
+        course = next(
+            (r.course for r in records if isinstance(r, Meet) and r.course is not None), None
+        )
+
+    # Per event: record indices, seed centiseconds and the course of each seed.
+    events: dict[Hashable, tuple[list[int], list[Optional[int]], list]] = {}
+    for i, record in enumerate(records):
+        if isinstance(record, IndividualEvent):
+            if record.event_distance is None or record.stroke is None:
+                continue
+        elif not isinstance(record, RelayEvent):
+            continue
+        time, seed_course, _, _ = _seed_fields(record)
+        indices, seeds, seed_courses = events.setdefault(_event_key(record), ([], [], []))
+        indices.append(i)
+        seeds.append(time.centiseconds if isinstance(time, Time) else None)
+        seed_courses.append(seed_course)
+
+    for indices, seeds, seed_courses in events.values():
+        if course is not None:
+            _, _, distance, stroke = _seed_fields(records[indices[0]])
+            _convert_seeds(seeds, seed_courses, distance, stroke, course, table)
+        for i, (heat, lane) in zip(indices, seed_event(seeds, lanes, circle_heats)):
+            record = records[i]
+            if isinstance(record, IndividualEvent):
+                records[i] = attr.evolve(record, prelim_heat_number=heat, prelim_lane_number=lane)
+            else:
+                records[i] = attr.evolve(record, prelim_heat=heat, prelim_lane=lane)
+    return records
@@ -0,0 +1,182 @@
+"""Write records in spec order from sources that produce them in any order."""
+
+import heapq
+import os
+import tempfile
+from itertools import count
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+import sdif.models as models
+from sdif.fields import SdifModel, field_text
+from sdif.records import RECORD_ENCODING, RECORD_SEP, encode_record
+from sdif.validate import RecordCounts
+
+DEFAULT_BUFFER_SIZE = 100_000
+
+_SECTIONS = {"A0": "0", "B1": "1", "Z0": "9"}
+# Rank of each group within a team.
+_TEAM_RANKS = {"C1": "0", "C2": "1", "D0": "2", "E0": "3"}
+# Records that can only be added as part of a group.
+_GROUPED = ("D3", "F0", "G0")
+
+_TEAM_LEN = 6
+_SWIMMER_LEN = 28
+_EVENT_LEN = 4
+_SEQ_LEN = 12
+_POS_LEN = 4
+KEY_LEN = 1 + _TEAM_LEN + 1 + _SWIMMER_LEN + _EVENT_LEN + 1 + _SEQ_LEN + _POS_LEN
+
+
+def group_key(line: str, team: Optional[str] = None) -> str:
+    """The sort key of a group, without its sequence number and position, from its
+    first line. team is required for D0 groups, since D0 records have no team code."""
+    identifier = line[:2]
+    if identifier in _SECTIONS:
+        return _SECTIONS[identifier].ljust(KEY_LEN - _SEQ_LEN - _POS_LEN)
+    if identifier not in _TEAM_RANKS:
+        raise ValueError(f"A {identifier} record must be added in a group after its D0 or E0")
+    swimmer = event = relay = ""
+    if identifier == "C1":
+        team = field_text(line, models.TeamId, "team_code")
+    elif identifier == "C2":
+        team = field_text(line, models.TeamEntry, "team_code") or team
+    elif identifier == "D0":
+        swimmer = field_text(line, models.IndividualEvent, "ussn") or field_text(
+            line, models.IndividualEvent, "name"
+        )
+        event = field_text(line, models.IndividualEvent, "event_number")
+    elif identifier == "E0":
+        team = field_text(line, models.RelayEvent, "team_code")
+        event = field_text(line, models.RelayEvent, "event_number")
+        relay = field_text(line, models.RelayEvent, "relay_team_name")
+    if not team:
+        raise ValueError(f"No team given for a {identifier} group")
+    return "".join(
+        [
+            "2",
+            team.ljust(_TEAM_LEN)[:_TEAM_LEN],
+            _TEAM_RANKS[identifier],
+            swimmer.ljust(_SWIMMER_LEN)[:_SWIMMER_LEN],
+            event.rjust(_EVENT_LEN)[:_EVENT_LEN],
+            relay.ljust(1)[:1],
+        ]
+    )
+
+
+def groups(lines: Iterable[str]) -> Iterator[tuple[list[str], str]]:
+    """Split the lines of a spec-ordered file into (group, team) pairs for add_lines."""
+    group: list[str] = []
+    team = ""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        identifier = line[:2]
+        if identifier in _GROUPED and group:
+            group.append(line)
+            continue
+        if group:
+            yield group, team
+        if identifier == "C1":
+            team = field_text(line, models.TeamId, "team_code")
+        group = [line]
+    if group:
+        yield group, team
+
+
+def _read_run(path: str, encoding: str) -> Iterator[str]:
+    with open(path, "rt", encoding=encoding, newline="") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+class SortedWriter:
+    """Buffers records or encoded lines and writes them back in spec order.
+
+    Records are added in groups that stay together: a D0 with its D3 and G0
+    records, or an E0 with its F0 records and their G0s. Groups are ordered A0,
+    B1, then each team's C1, C2, individual entries by swimmer and event and
+    relay entries by event, and finally Z0. Every buffer_size lines are sorted
+    and spilled to a temporary file, and the output is a k-way merge of the
+    spilled runs, so memory stays bounded however large the file is.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        strict: bool = False,
+        encoding: str = RECORD_ENCODING,
+        tempdir: Optional[Union[str, os.PathLike]] = None,
+    ):
+        self.buffer_size = buffer_size
+        self.strict = strict
+        self.encoding = encoding
+        self.tempdir = tempdir
+        self.counts = RecordCounts()
+        self.runs: list[str] = []
+        self._buffer: list[str] = []
+        self._seq = count()
+
+    def __enter__(self) -> "SortedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Remove the spilled runs."""
+        for path in self.runs:
+            os.unlink(path)
+        self.runs.clear()
+
+    def add(self, record: SdifModel, team: Optional[str] = None) -> None:
+        self.add_group([record], team)
+
+    def add_group(self, records: Iterable[SdifModel], team: Optional[str] = None) -> None:
+        self.add_lines((encode_record(record, self.strict) for record in records), team)
+
+    def add_lines(self, lines: Iterable[str], team: Optional[str] = None) -> None:
+        """Add a group of encoded lines, which are written out unchanged."""
+        key = None
+        for pos, line in enumerate(lines):
+            line = line.rstrip("\r\n")
+            if key is None:
+                key = group_key(line, team) + str(next(self._seq)).zfill(_SEQ_LEN)
+            elif line[:2] not in _GROUPED:
+                raise ValueError(f"A {line[:2]} record can't be part of a group")
+            self.counts.add(line[:2])
+            self._buffer.append(key + str(pos).zfill(_POS_LEN) + line)
+            if len(self._buffer) >= self.buffer_size:
+                self._spill()
+
+    def _spill(self) -> None:
+        self._buffer.sort()
+        fd, path = tempfile.mkstemp(prefix="sdif-run-", suffix=".txt", dir=self.tempdir)
+        with open(fd, "wt", encoding=self.encoding, newline="") as f:
+            for keyed in self._buffer:
+                f.write(keyed)
+                f.write("\n")
+        self.runs.append(path)
+        self._buffer.clear()
+
+    def keyed_lines(self) -> Iterator[tuple[str, str]]:
+        """(group key, line) in spec order. Groups with the same group key, e.g. the
+        same swimmer's entry in the same event, are adjacent, in the order added."""
+        self._buffer.sort()
+        runs = [_read_run(path, self.encoding) for path in self.runs]
+        for keyed in heapq.merge(self._buffer, *runs):
+            yield keyed[: KEY_LEN - _SEQ_LEN - _POS_LEN], keyed[KEY_LEN:]
+
+    def lines(self) -> Iterator[str]:
+        """The added lines in spec order, without terminators."""
+        for _, line in self.keyed_lines():
+            yield line
+
+    def write(self, f: TextIO) -> None:
+        for line in self.lines():
+            f.write(line)
+            f.write(RECORD_SEP)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, "wt", encoding=self.encoding, newline="") as f:
+            self.write(f)
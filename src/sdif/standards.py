@@ -0,0 +1,164 @@
+"""Time standards (motivational B/BB/A/AA/AAA/AAAA cuts) and swim classification."""
+
+import csv
+from bisect import bisect_left
+from typing import Iterable, Iterator, Optional, Sequence, TextIO
+
+import attr
+
+from sdif.models import (
+    CourseStatusCode,
+    EventSexCode,
+    EventTimeClassCode,
+    IndividualEvent,
+    StrokeCode,
+)
+from sdif.rankings import EventKey, swims
+from sdif.time import Time
+
+# Slowest to fastest.
+LEVELS: tuple[EventTimeClassCode, ...] = (
+    EventTimeClassCode.b_standard,
+    EventTimeClassCode.bb_standard,
+    EventTimeClassCode.a_standard,
+    EventTimeClassCode.aa_standard,
+    EventTimeClassCode.aaa_standard,
+    EventTimeClassCode.aaaa_standard,
+)
+
+LEVEL_NAMES: dict[str, EventTimeClassCode] = {
+    "B": EventTimeClassCode.b_standard,
+    "BB": EventTimeClassCode.bb_standard,
+    "A": EventTimeClassCode.a_standard,
+    "AA": EventTimeClassCode.aa_standard,
+    "AAA": EventTimeClassCode.aaa_standard,
+    "AAAA": EventTimeClassCode.aaaa_standard,
+}
+
+
+@attr.define(frozen=True)
+class _Cuts:
+    # Ascending, so levels runs fastest to slowest.
+    centiseconds: tuple[int, ...]
+    levels: tuple[EventTimeClassCode, ...]
+
+
+class TimeStandards:
+    """Cuts per sdif.rankings.EventKey, stored sorted so classifying is a bisect."""
+
+    def __init__(self) -> None:
+        self._pending: dict[EventKey, dict[EventTimeClassCode, int]] = {}
+        self._cuts: dict[EventKey, _Cuts] = {}
+
+    def add(self, key: EventKey, level: EventTimeClassCode, cut: Time) -> None:
+        """Set the cut for a level; cuts must not get slower as levels get faster."""
+        if level not in LEVELS:
+            raise ValueError(f"{level} is not a time standard level")
+        key = attr.evolve(key, course=key.course.normalize())
+        self._pending.setdefault(key, {})[level] = cut.centiseconds
+        self._cuts.pop(key, None)
+
+    @classmethod
+    def from_csv(cls, f: TextIO) -> "TimeStandards":
+        """Load a table with columns distance, stroke, course, sex, age, level and time.
+
+        stroke, course and sex use the SDIF codes (e.g. 1, Y, F), age uses the
+        event_age format (e.g. UN10, 1112, 15OV), level is one of B, BB, A, AA,
+        AAA, AAAA, and time is formatted like 1:02.39.
+        """
+        standards = cls()
+        for row in csv.DictReader(f):
+            key = EventKey(
+                distance=int(row["distance"]),
+                stroke=StrokeCode(row["stroke"].strip()),
+                course=CourseStatusCode(row["course"].strip()),
+                event_sex=EventSexCode(row["sex"].strip()),
+                event_age=row["age"].strip(),
+            )
+            standards.add(
+                key, LEVEL_NAMES[row["level"].strip()], Time.from_str(row["time"].strip())
+            )
+        return standards
+
+    def _lookup(self, key: EventKey) -> Optional[_Cuts]:
+        key = attr.evolve(key, course=key.course.normalize())
+        cuts = self._cuts.get(key)
+        if cuts is None:
+            pending = self._pending.get(key)
+            if pending is None:
+                return None
+            # Fastest level first, so a time meeting tied cuts gets the faster level.
+            ordered = sorted(pending.items(), key=lambda item: LEVELS.index(item[0]), reverse=True)
+            centiseconds = tuple(cs for _, cs in ordered)
+            if any(faster > slower for faster, slower in zip(centiseconds, centiseconds[1:])):
+                raise ValueError(f"Cuts for {key} are slower for faster levels")
+            cuts = _Cuts(centiseconds, tuple(level for level, _ in ordered))
+            self._cuts[key] = cuts
+        return cuts
+
+    def keys(self) -> list[EventKey]:
+        return list(self._pending)
+
+    def classify(self, key: EventKey, time: Time) -> Optional[EventTimeClassCode]:
+        """The fastest standard the time meets (time <= cut), or None."""
+        cuts = self._lookup(key)
+        if cuts is None:
+            return None
+        i = bisect_left(cuts.centiseconds, time.centiseconds)
+        return cuts.levels[i] if i < len(cuts.levels) else None
+
+    def classify_column(
+        self, key: EventKey, centiseconds: Sequence[int]
+    ) -> list[Optional[EventTimeClassCode]]:
+        """Classify a column of times, in centiseconds, for one event."""
+        cuts = self._lookup(key)
+        if cuts is None:
+            return [None] * len(centiseconds)
+        table = cuts.centiseconds
+        levels = cuts.levels + (None,)
+        return [levels[bisect_left(table, cs)] for cs in centiseconds]
+
+    def time_class(self, key: EventKey, time: Time) -> Optional[str]:
+        """The two-character EVENT TIME CLASS code bracketing a time.
+
+        The first character is the standard achieved ("U" if none), the second
+        the next faster standard in the table ("0" if none), e.g. "34" for a
+        time that meets A but not AA.
+        """
+        cuts = self._lookup(key)
+        if cuts is None:
+            return None
+        i = bisect_left(cuts.centiseconds, time.centiseconds)
+        lower = cuts.levels[i] if i < len(cuts.levels) else EventTimeClassCode.no_lower_limit
+        upper = cuts.levels[i - 1] if i > 0 else EventTimeClassCode.no_upper_limit
+        return lower.value + upper.value
+
+    def classify_record(self, record: IndividualEvent) -> Optional[EventTimeClassCode]:
+        """The fastest standard met by any of the swims in a D0 record."""
+        best = None
+        for key, swim in swims(record):
+            level = self.classify(key, swim.time)
+            if level is not None and (best is None or LEVELS.index(level) > LEVELS.index(best)):
+                best = level
+        return best
+
+    def annotate(self, records: Iterable[IndividualEvent]) -> Iterator[IndividualEvent]:
+        """Set event_time_class on each record from its best classified swim.
+
+        Like classify_record, the best swim is the one meeting the fastest
+        standard, since times in different courses can't be compared directly.
+        """
+        for record in records:
+            best = None
+            for key, swim in swims(record):
+                time_class = self.time_class(key, swim.time)
+                if time_class is None:
+                    continue
+                level = self.classify(key, swim.time)
+                rank = -1 if level is None else LEVELS.index(level)
+                if best is None or rank > best[0]:
+                    best = (rank, time_class)
+            if best is not None:
+                yield attr.evolve(record, event_time_class=best[1])
+            else:
+                yield record
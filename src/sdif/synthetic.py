@@ -0,0 +1,419 @@
+"""Seeded generator for synthetic, spec-ordered SDIF meet files."""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterator, Optional
+
+import attr
+
+import sdif.models as models
+from sdif.fields import SdifModel
+from sdif.time import Time, TimeCode
+
+FIRST_NAMES = [
+    "Alex", "Avery", "Blake", "Casey", "Charlie", "Dakota", "Drew", "Emerson",
+    "Finley", "Harper", "Hayden", "Jamie", "Jordan", "Kai", "Logan", "Morgan",
+    "Parker", "Peyton", "Quinn", "Reese", "Riley", "Rowan", "Sage", "Skyler",
+]  # fmt: skip
+
+LAST_NAMES = [
+    "Anderson", "Baker", "Castillo", "Diaz", "Edwards", "Fischer", "Garcia",
+    "Hughes", "Ito", "Johnson", "Kowalski", "Lee", "Martinez", "Nguyen",
+    "O'Brien", "Patel", "Quintero", "Rossi", "Schmidt", "Tanaka", "Usman",
+    "Valdez", "Walker", "Xu", "Young", "Zimmerman",
+]  # fmt: skip
+
+TEAM_WORDS = [
+    "Aquatics", "Barracudas", "Dolphins", "Flyers", "Marlins", "Orcas",
+    "Piranhas", "Sharks", "Stingrays", "Tritons", "Wahoos", "Waves",
+]  # fmt: skip
+
+INDIVIDUAL_EVENTS: list[tuple[int, models.StrokeCode]] = [
+    (50, models.StrokeCode.freestyle),
+    (100, models.StrokeCode.freestyle),
+    (200, models.StrokeCode.freestyle),
+    (500, models.StrokeCode.freestyle),
+    (1650, models.StrokeCode.freestyle),
+    (100, models.StrokeCode.backstroke),
+    (200, models.StrokeCode.backstroke),
+    (100, models.StrokeCode.breaststroke),
+    (200, models.StrokeCode.breaststroke),
+    (100, models.StrokeCode.butterfly),
+    (200, models.StrokeCode.butterfly),
+    (200, models.StrokeCode.im),
+    (400, models.StrokeCode.im),
+]
+
+RELAY_EVENTS: list[tuple[int, models.StrokeCode]] = [
+    (200, models.StrokeCode.free_relay),
+    (200, models.StrokeCode.medley_relay),
+    (400, models.StrokeCode.free_relay),
+    (400, models.StrokeCode.medley_relay),
+    (800, models.StrokeCode.free_relay),
+]
+
+# Rough seconds-per-50 paces, by stroke, for a competitive age group swimmer.
+PACE_PER_50 = {
+    models.StrokeCode.freestyle: 28.0,
+    models.StrokeCode.backstroke: 32.0,
+    models.StrokeCode.breaststroke: 36.0,
+    models.StrokeCode.butterfly: 31.0,
+    models.StrokeCode.im: 33.0,
+    models.StrokeCode.free_relay: 27.0,
+    models.StrokeCode.medley_relay: 30.0,
+}
+
+SPLIT_DISTANCE = 50
+SPLITS_PER_RECORD = 10
+
+
+@attr.define(frozen=True)
+class MeetSpec:
+    """Knobs for the size and shape of a synthetic meet.
+
+    n_splits caps the number of split times recorded for each swim; 0 disables
+    G0 records entirely.
+    """
+
+    seed: int = 0
+    n_teams: int = 10
+    n_swimmers: int = 20
+    n_events: int = 20
+    n_relays: int = 4
+    n_splits: int = 4
+    entries_per_swimmer: int = 3
+    course: models.CourseStatusCode = models.CourseStatusCode.short_yards
+    meet_start: date = date(2023, 2, 17)
+
+
+@attr.define(frozen=True)
+class _Swimmer:
+    name: str
+    first: str
+    ussn: str
+    uss_number: str
+    birthdate: date
+    sex: models.SexCode
+
+
+def _random_time(rng: random.Random, distance: int, stroke: models.StrokeCode) -> Time:
+    pace = PACE_PER_50[stroke] * rng.uniform(0.9, 1.35)
+    return Time(round(pace * 100 * distance / 50))
+
+
+def _splits(rng: random.Random, final: Time, distance: int, n_splits: int) -> list[Time]:
+    n = min(distance // SPLIT_DISTANCE, n_splits)
+    if n == 0:
+        return []
+    laps = distance // SPLIT_DISTANCE
+    weights = [rng.uniform(0.95, 1.05) for _ in range(laps)]
+    weights[0] *= 0.92
+    scale = final.centiseconds / sum(weights)
+    cumulative = []
+    total = 0.0
+    for w in weights:
+        total += w * scale
+        cumulative.append(Time(round(total)))
+    cumulative[-1] = final
+    return cumulative[:n]
+
+
+def _split_records(
+    name: str, ussn: Optional[str], distance: int, splits: list[Time]
+) -> Iterator[models.SplitsRecord]:
+    n_records = (len(splits) + SPLITS_PER_RECORD - 1) // SPLITS_PER_RECORD
+    for i in range(n_records):
+        chunk: list[Optional[Time]] = list(
+            splits[i * SPLITS_PER_RECORD : (i + 1) * SPLITS_PER_RECORD]
+        )
+        chunk += [None] * (SPLITS_PER_RECORD - len(chunk))
+        yield models.SplitsRecord(
+            organization=models.OrganizationCode.uss,
+            name=name,
+            ussn=ussn,
+            sequence=i + 1,
+            n_splits=len(splits),
+            split_distance=SPLIT_DISTANCE,
+            split_code="C",
+            split_time_1=chunk[0],
+            split_time_2=chunk[1],
+            split_time_3=chunk[2],
+            split_time_4=chunk[3],
+            split_time_5=chunk[4],
+            split_time_6=chunk[5],
+            split_time_7=chunk[6],
+            split_time_8=chunk[7],
+            split_time_9=chunk[8],
+            split_time_10=chunk[9],
+        )
+
+
+def _swimmer(rng: random.Random, meet_start: date, sexes: list[models.SexCode]) -> _Swimmer:
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    middle = rng.choice("ABCDEFGHJKLMNPRSTW")
+    birthdate = meet_start - timedelta(days=rng.randint(8 * 365, 18 * 365))
+    stem = birthdate.strftime("%m%d%y") + first[:3].upper() + middle
+    last_key = "".join(c for c in last.upper() if c.isalpha())
+    return _Swimmer(
+        name=f"{last}, {first} {middle}",
+        first=first,
+        ussn=(stem + last_key)[:12].ljust(12, "*"),
+        uss_number=(stem + last_key)[:14].ljust(14, "*"),
+        birthdate=birthdate,
+        sex=rng.choice(sexes),
+    )
+
+
+def _age(birthdate: date, on: date) -> int:
+    return on.year - birthdate.year - ((on.month, on.day) < (birthdate.month, birthdate.day))
+
+
+def generate_meet(spec: MeetSpec = MeetSpec()) -> Iterator[SdifModel]:
+    """Yield the records of a synthetic meet results file, A0 through Z0.
+
+    Every record is built through the models, so the meet can be encoded and
+    decoded by the library, e.g. in benchmarks and tests.
+    """
+    rng = random.Random(spec.seed)
+    n_events = max(spec.n_events, 1)
+    course = spec.course
+    events = [
+        (i + 1, *INDIVIDUAL_EVENTS[i % len(INDIVIDUAL_EVENTS)], rng.choice(list(models.SexCode)))
+        for i in range(n_events)
+    ]
+    relays = [
+        (n_events + i + 1, *RELAY_EVENTS[i % len(RELAY_EVENTS)], rng.choice(list(models.SexCode)))
+        for i in range(spec.n_relays)
+    ]
+
+    # Swimmers are only of sexes that have individual events to enter.
+    sexes = [sex for sex in models.SexCode if any(event[3] == sex for event in events)]
+
+    counts = dict(c=0, d=0, e=0, f=0, g=0)
+    n_swimmers = 0
+
+    yield models.FileDescription(
+        organization=models.OrganizationCode.uss,
+        sdif_version="V3",
+        file_code=models.FileCode.meet_results,
+        software_name="sdif.synthetic",
+        software_version="1",
+        contact_name="Joe Bloggs",
+        contact_phone="555-555-1212",
+        file_creation=spec.meet_start + timedelta(days=2),
+        submitted_by_lsc=None,
+    )
+    yield models.Meet(
+        organization=models.OrganizationCode.uss,
+        meet_name=f"Synthetic Invitational {spec.seed}",
+        meet_address_1=None,
+        meet_address_2=None,
+        meet_city="Springfield",
+        meet_state="VA",
+        postal_code="22150",
+        country="USA",
+        meet=models.MeetTypeCode.invitational,
+        meet_start=spec.meet_start,
+        meet_end=spec.meet_start + timedelta(days=2),
+        pool_altitude_ft=0,
+        course=course,
+    )
+
+    for team_i in range(spec.n_teams):
+        team_code = f"PV{team_i:04d}"
+        team_name = f"{rng.choice(LAST_NAMES)} {rng.choice(TEAM_WORDS)} {team_i}"
+        swimmers = [_swimmer(rng, spec.meet_start, sexes) for _ in range(spec.n_swimmers)]
+        n_swimmers += len(swimmers)
+        yield models.TeamId(
+            organization=models.OrganizationCode.uss,
+            team_code=team_code,
+            name=team_name[:30].strip(),
+            abbreviation=team_name[:16].strip(),
+            address_1=None,
+            address_2=None,
+            city="Springfield",
+            state="VA",
+            postal_code="22150",
+            country="USA",
+            region=None,
+            team_code5=None,
+        )
+        yield models.TeamEntry(
+            organization=models.OrganizationCode.uss,
+            team_code=team_code,
+            coach_name="Coach, Pat",
+            coach_phone="555-555-1313",
+            n_entries=None,
+            n_athletes=len(swimmers),
+            n_relay_entries=None,
+            n_split_records=None,
+            short_name=None,
+            team_code5=None,
+        )
+        counts["c"] += 2
+
+        for swimmer in swimmers:
+            eligible = [event for event in events if event[3] == swimmer.sex]
+            entered = rng.sample(eligible, min(spec.entries_per_swimmer, len(eligible)))
+            entered.sort()
+            for entry_i, (event_number, distance, stroke, sex) in enumerate(entered):
+                final = _random_time(rng, distance, stroke)
+                seed = Time(round(final.centiseconds * rng.uniform(0.97, 1.05)))
+                place: Optional[int] = rng.randint(1, 16)
+                finals_time: models.TimeT = final
+                if rng.random() < 0.02:
+                    finals_time = TimeCode.disqualified
+                    place = None
+                age = _age(swimmer.birthdate, spec.meet_start)
+                yield models.IndividualEvent(
+                    organization=models.OrganizationCode.uss,
+                    name=swimmer.name,
+                    ussn=swimmer.ussn,
+                    attached=models.AttachCode.attached,
+                    citizen=None,
+                    birthdate=swimmer.birthdate,
+                    age_or_class=str(age),
+                    sex=swimmer.sex,
+                    event_sex=models.EventSexCode(sex.value),
+                    event_distance=distance,
+                    stroke=stroke,
+                    event_number=str(event_number),
+                    event_age="UNOV",
+                    date_of_swim=spec.meet_start,
+                    seed_time=seed,
+                    seed_time_course=course,
+                    prelim_time=None,
+                    prelim_time_course=None,
+                    swim_off_time=None,
+                    swim_off_time_course=None,
+                    finals_time=finals_time,
+                    finals_time_course=course,
+                    prelim_heat_number=None,
+                    prelim_lane_number=None,
+                    finals_heat_number=rng.randint(1, 8),
+                    finals_lane_number=rng.randint(1, 8),
+                    prelim_place_ranking=None,
+                    finals_place_ranking=place,
+                    points_scored_finals=None if place is None else Decimal(17 - place),
+                    event_time_class=None,
+                    flight_status=None,
+                    centipoints_scored_finals=None,
+                )
+                counts["d"] += 1
+                if entry_i == 0:
+                    yield models.IndividualInfo(
+                        uss_number=swimmer.uss_number,
+                        preferred_first_name=swimmer.first,
+                        ethnicity_1=None,
+                        ethnicity_2=None,
+                        junior_high=None,
+                        senior_high=None,
+                        ymca_ywca=None,
+                        college=None,
+                        summer_league=None,
+                        masters=None,
+                        disabled_sports_org=None,
+                        water_polo=None,
+                        none=None,
+                    )
+                    counts["d"] += 1
+                if not isinstance(finals_time, Time):
+                    continue
+                for split in _split_records(
+                    swimmer.name,
+                    swimmer.ussn,
+                    distance,
+                    _splits(rng, final, distance, spec.n_splits),
+                ):
+                    yield split
+                    counts["g"] += 1
+
+        for relay_i, (event_number, distance, stroke, sex) in enumerate(relays):
+            legs = [s for s in swimmers if s.sex == sex][:4]
+            if len(legs) < 4:
+                continue
+            final = _random_time(rng, distance, stroke)
+            yield models.RelayEvent(
+                organization=models.OrganizationCode.uss,
+                relay_team_name="A",
+                team_code=team_code,
+                n_f0_records=len(legs),
+                event_sex=models.EventSexCode(sex.value),
+                relay_distance=distance,
+                stroke=stroke,
+                event_number=str(event_number),
+                event_age="UNOV",
+                total_athlete_age=sum(_age(s.birthdate, spec.meet_start) for s in legs),
+                swim_date=spec.meet_start,
+                seed_time=Time(round(final.centiseconds * rng.uniform(0.97, 1.05))),
+                seed_course=course,
+                prelim_time=None,
+                prelim_course=None,
+                swimoff_time=None,
+                swimoff_course=None,
+                finals_time=final,
+                finals_course=course,
+                prelim_heat=None,
+                prelim_lane=None,
+                finals_heat=1,
+                finals_lane=rng.randint(1, 8),
+                prelim_place=None,
+                finals_place=rng.randint(1, 16),
+                finals_points=Decimal(rng.randint(0, 40)),
+                event_time_class_lower=None,
+                event_time_class_upper=None,
+            )
+            counts["e"] += 1
+            leg_distance = distance // 4
+            for leg_i, swimmer in enumerate(legs):
+                leg_time = Time(final.centiseconds // 4)
+                yield models.RelayName(
+                    organization=models.OrganizationCode.uss,
+                    team_code=team_code,
+                    relay_team_name="A",
+                    swimmer_name=swimmer.name,
+                    uss_number=swimmer.ussn,
+                    citizen=None,
+                    birthdate=swimmer.birthdate,
+                    age_or_class=str(_age(swimmer.birthdate, spec.meet_start)),
+                    sex=swimmer.sex,
+                    prelim_order=models.OrderCode(str(leg_i + 1)),
+                    swimoff_order=models.OrderCode.not_on_team,
+                    finals_order=models.OrderCode(str(leg_i + 1)),
+                    leg_time=leg_time,
+                    course=course,
+                    takeoff_time=None,
+                    uss_number_new=swimmer.uss_number,
+                    preferred_first_name=swimmer.first,
+                )
+                counts["f"] += 1
+                for split in _split_records(
+                    swimmer.name,
+                    swimmer.ussn,
+                    leg_distance,
+                    _splits(rng, leg_time, leg_distance, spec.n_splits),
+                ):
+                    yield split
+                    counts["g"] += 1
+
+    yield models.FileTerminator(
+        organization=models.OrganizationCode.uss,
+        file_code=models.FileCode.meet_results,
+        notes="Synthetic meet",
+        n_b_records=1,
+        n_meets=1,
+        n_c_records=counts["c"],
+        n_teams=spec.n_teams,
+        n_d_records=counts["d"],
+        n_swimmers=n_swimmers,
+        n_e_records=counts["e"],
+        n_f_records=counts["f"],
+        n_g_records=counts["g"],
+        batch_number=None,
+        n_new_members=None,
+        n_renew_members=None,
+        n_member_changes=None,
+        n_member_deletes=None,
+    )
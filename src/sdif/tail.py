@@ -0,0 +1,119 @@
+"""Incremental reading of an SDIF file that is rewritten while it is being read."""
+
+import enum
+import os
+from typing import Optional, Union
+
+import attr
+
+import sdif.model_meta as model_meta
+from sdif.fields import SdifModel
+from sdif.records import RECORD_ENCODING, decode_record
+
+
+class DeltaKind(enum.Enum):
+    added = "added"
+    changed = "changed"
+    removed = "removed"
+
+
+@attr.define(frozen=True)
+class Delta:
+    """A change to one line of the file.
+
+    line_number is 1-based. record is the newly decoded record; it is None for
+    removed lines.
+    """
+
+    kind: DeltaKind
+    line_number: int
+    record: Optional[SdifModel]
+
+
+class TailReader:
+    """Poll a file for records added, changed or removed since the last poll.
+
+    Only lines that differ from the previous poll are decoded, so re-exports
+    that append records and rewrite the Z0 cost little more than the new lines.
+    The final line of the file is never considered settled, because it is
+    usually the Z0 record that is rewritten on each export. Blank lines are
+    skipped. If a line fails to decode, poll raises and the reader's state is
+    left as it was before the poll.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        strict: bool = False,
+        encoding: str = RECORD_ENCODING,
+    ):
+        self.path = path
+        self.strict = strict
+        self.encoding = encoding
+        # Number of polls that found the settled prefix changed and compared it line by line.
+        self.prefix_mismatches = 0
+        # The file as of the last poll and the end offset of each of its lines.
+        self._data = b""
+        self._ends: list[int] = []
+
+    def poll(self) -> list[Delta]:
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        old, ends = self._data, self._ends
+        n_settled = max(len(ends) - 1, 0)
+        settled = ends[n_settled - 1] if n_settled else 0
+        # Comparing bytes is much cheaper than hashing or decoding them; only
+        # lines from the first difference on are compared one at a time.
+        if data[:settled] == old[:settled]:
+            first_line = n_settled
+        else:
+            self.prefix_mismatches += 1
+            first_line = self._first_difference(data)
+        base_offset = ends[first_line - 1] if first_line else 0
+        lines = data[base_offset:].splitlines(keepends=True)
+
+        deltas = self._compare(first_line, lines)
+
+        new_ends = ends[:first_line]
+        for line in lines:
+            base_offset += len(line)
+            new_ends.append(base_offset)
+        self._data = data
+        self._ends = new_ends
+        return deltas
+
+    def _first_difference(self, data: bytes) -> int:
+        start = 0
+        for i, end in enumerate(self._ends):
+            if data[start:end] != self._data[start:end]:
+                return i
+            start = end
+        return len(self._ends)
+
+    def _old_line(self, i: int) -> bytes:
+        start = self._ends[i - 1] if i else 0
+        return self._data[start : self._ends[i]].rstrip(b"\r\n")
+
+    def _compare(self, first_line: int, lines: list[bytes]) -> list[Delta]:
+        deltas = []
+        n_old = len(self._ends)
+        for i, raw in enumerate(lines, start=first_line):
+            content = raw.rstrip(b"\r\n")
+            previous = self._old_line(i) if i < n_old else b""
+            if content == previous:
+                continue
+            if not content:
+                deltas.append(Delta(DeltaKind.removed, i + 1, None))
+                continue
+            kind = DeltaKind.changed if previous else DeltaKind.added
+            deltas.append(Delta(kind, i + 1, self._decode(content)))
+
+        for i in range(first_line + len(lines), n_old):
+            if self._old_line(i):
+                deltas.append(Delta(DeltaKind.removed, i + 1, None))
+        return deltas
+
+    def _decode(self, content: bytes) -> SdifModel:
+        line = content.decode(self.encoding)
+        return decode_record(line, model_meta.REGISTERED_MODELS[line[:2]], self.strict)
@@ -0,0 +1,204 @@
+"""Single-pass structural validation of SDIF files."""
+
+import os
+from typing import Iterable, Iterator, Optional, Union
+
+import attr
+
+import sdif.model_meta as model_meta
+import sdif.models as models
+from sdif.fields import field_text, record_layout
+from sdif.records import RECORD_ENCODING, RECORD_SEP, decode_value
+
+
+@attr.define(frozen=True)
+class Violation:
+    """line_number is 0 for problems with the file as a whole."""
+
+    line_number: int
+    identifier: str
+    message: str
+
+    def __str__(self) -> str:
+        where = f"line {self.line_number}" if self.line_number else "file"
+        return f"{where} ({self.identifier or '--'}): {self.message}"
+
+
+@attr.define
+class RecordCounts:
+    """Record counts, named like the corresponding FileTerminator fields."""
+
+    n_b_records: int = 0
+    n_meets: int = 0
+    n_c_records: int = 0
+    n_teams: int = 0
+    n_d_records: int = 0
+    n_e_records: int = 0
+    n_f_records: int = 0
+    n_g_records: int = 0
+
+    def add(self, identifier: str) -> None:
+        kind = identifier[:1]
+        if kind == "B":
+            self.n_b_records += 1
+            if identifier == "B1":
+                self.n_meets += 1
+        elif kind == "C":
+            self.n_c_records += 1
+            if identifier == "C1":
+                self.n_teams += 1
+        elif kind == "D":
+            self.n_d_records += 1
+        elif kind == "E":
+            self.n_e_records += 1
+        elif kind == "F":
+            self.n_f_records += 1
+        elif kind == "G":
+            self.n_g_records += 1
+
+    def terminator_fields(self) -> dict[str, int]:
+        return attr.asdict(self)
+
+
+class _Validator:
+    def __init__(self) -> None:
+        self.counts = RecordCounts()
+        self.teams: set[str] = set()
+        self.team: Optional[str] = None
+        self.started = False
+        self.seen_a0 = False
+        self.seen_b1 = False
+        self.z0_line = 0
+        # The last C1/C2/D0/E0/F0 record, which D3, F0 and G0 records attach to.
+        self.anchor = ""
+        self.relay_team: Optional[str] = None
+
+    def line(self, n: int, line: str) -> Iterator[Violation]:
+        identifier = line[:2]
+        first = not self.started
+        self.started = True
+        if identifier not in model_meta.REGISTERED_MODELS:
+            yield Violation(n, identifier, "Unknown record identifier")
+            return
+        self.counts.add(identifier)
+
+        if self.z0_line:
+            yield Violation(n, identifier, f"Record follows the Z0 on line {self.z0_line}")
+        if first and identifier != "A0":
+            yield Violation(n, identifier, "File does not begin with an A0 record")
+
+        if identifier == "A0":
+            if self.seen_a0:
+                yield Violation(n, identifier, "More than one A0 record")
+            self.seen_a0 = True
+        elif identifier == "B1":
+            if self.seen_b1:
+                yield Violation(n, identifier, "More than one B1 record")
+            if self.team is not None:
+                yield Violation(n, identifier, "B1 record follows team records")
+            self.seen_b1 = True
+        elif identifier == "C1":
+            team = field_text(line, models.TeamId, "team_code")
+            if team in self.teams:
+                yield Violation(n, identifier, f"Team {team!r} appears more than once")
+            self.teams.add(team)
+            self.team = team
+            self.anchor = identifier
+        elif identifier == "C2":
+            team = field_text(line, models.TeamEntry, "team_code")
+            if self.anchor != "C1":
+                yield Violation(n, identifier, "C2 record does not follow a C1 record")
+            elif team and team != self.team:
+                yield Violation(n, identifier, f"C2 team {team!r} does not match C1 {self.team!r}")
+            self.anchor = identifier
+        elif identifier in ("D0", "E0"):
+            if self.team is None:
+                yield Violation(n, identifier, f"{identifier} record precedes any C1 record")
+            self.anchor = identifier
+            if identifier == "E0":
+                self.relay_team = field_text(line, models.RelayEvent, "team_code")
+                if self.team is not None and self.relay_team != self.team:
+                    yield Violation(
+                        n,
+                        identifier,
+                        f"E0 team {self.relay_team!r} does not match C1 {self.team!r}",
+                    )
+        elif identifier == "D3":
+            if self.anchor not in ("D0", "F0"):
+                yield Violation(n, identifier, "D3 record does not follow a D0 or F0 record")
+        elif identifier == "F0":
+            if self.anchor not in ("E0", "F0"):
+                yield Violation(n, identifier, "F0 record does not follow an E0 record")
+            else:
+                team = field_text(line, models.RelayName, "team_code")
+                if team != self.relay_team:
+                    yield Violation(
+                        n, identifier, f"F0 team {team!r} does not match E0 {self.relay_team!r}"
+                    )
+            self.anchor = identifier
+        elif identifier == "G0":
+            if self.anchor not in ("D0", "F0"):
+                yield Violation(n, identifier, "G0 record does not follow a D0 or F0 record")
+        elif identifier == "Z0":
+            if self.z0_line:
+                yield Violation(n, identifier, "More than one Z0 record")
+            else:
+                self.z0_line = n
+                yield from self.terminator(n, line)
+
+    def terminator(self, n: int, line: str) -> Iterator[Violation]:
+        expected = self.counts.terminator_fields()
+        for field in record_layout(models.FileTerminator):
+            if field.name not in expected:
+                continue
+            raw = line[field.start - 1 : field.start - 1 + field.len]
+            try:
+                value = decode_value(field, raw, strict=False)
+            except ValueError as e:
+                yield Violation(n, "Z0", f"Can't decode {field.name}: {e}")
+                continue
+            if value is not None and value != expected[field.name]:
+                yield Violation(
+                    n, "Z0", f"{field.name} is {value}, but the file has {expected[field.name]}"
+                )
+
+    def end(self) -> Iterator[Violation]:
+        if not self.seen_a0:
+            yield Violation(0, "A0", "No A0 record")
+        if not self.z0_line:
+            yield Violation(0, "Z0", "No Z0 record")
+
+
+def iter_violations(lines: Iterable[str]) -> Iterator[Violation]:
+    """Violations in file order; file-level problems come last.
+
+    Checks record ordering, uniqueness and the Z0 record counts from the raw
+    lines, decoding only the Z0 record, with memory proportional to the number
+    of teams. The Z0 n_swimmers count isn't checked, since that would require
+    remembering every swimmer. Blank lines at the end of the file are ignored.
+    """
+    if isinstance(lines, str):
+        lines = lines.split(RECORD_SEP)
+    validator = _Validator()
+    blank: list[int] = []
+    for n, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            blank.append(n)
+            continue
+        for blank_n in blank:
+            yield Violation(blank_n, "", "Blank line")
+        blank.clear()
+        yield from validator.line(n, line)
+    yield from validator.end()
+
+
+def validate(lines: Iterable[str]) -> list[Violation]:
+    return list(iter_violations(lines))
+
+
+def validate_file(
+    path: Union[str, os.PathLike], encoding: str = RECORD_ENCODING
+) -> list[Violation]:
+    with open(path, "rt", encoding=encoding, newline="") as f:
+        return list(iter_violations(f))
@@ -0,0 +1,29 @@
+"""Helpers shared by the tests."""
+
+from pathlib import Path
+from typing import Any, Sequence, Union
+
+from sdif.fields import SdifModel
+from sdif.records import RECORD_ENCODING, RECORD_SEP, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+
+
+def write_lines(path: Path, lines: list[str]) -> None:
+    """Write lines to path as a file, each followed by the record separator."""
+    path.write_bytes("".join(line + RECORD_SEP for line in lines).encode(RECORD_ENCODING))
+
+
+def write_meet(path: Path, seed: int, **spec: Any) -> list[SdifModel]:
+    """Write a synthetic meet to path and return its records."""
+    records = list(generate_meet(MeetSpec(seed=seed, **spec)))
+    write_lines(path, encode_records(records).split(RECORD_SEP))
+    return records
+
+
+def index_of(items: Sequence[Union[SdifModel, str]], identifier: str, n: int = 0) -> int:
+    """Index of the nth record, or encoded line, with identifier."""
+    return [
+        i
+        for i, item in enumerate(items)
+        if (item[:2] if isinstance(item, str) else item.identifier) == identifier
+    ][n]
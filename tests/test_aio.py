@@ -0,0 +1,96 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
+
+import pytest
+
+from sdif.aio import decode_stream, encode_stream
+from sdif.records import RECORD_ENCODING, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+
+RECORDS = list(generate_meet(MeetSpec(n_teams=2, n_swimmers=5, n_relays=1)))
+
+
+async def chunked(data: bytes, seed: int) -> AsyncIterator[bytes]:
+    rng = random.Random(seed)
+    i = 0
+    while i < len(data):
+        n = rng.randint(1, 400)
+        yield data[i : i + n]
+        i += n
+        await asyncio.sleep(0)
+
+
+async def collect(chunks, **kwargs):
+    return [record async for record in decode_stream(chunks, **kwargs)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("terminator", ["\r\n", "\n"])
+def test_decode_stream_across_chunk_boundaries(seed: int, terminator: str):
+    data = encode_records(RECORDS).replace("\r\n", terminator) + terminator
+    decoded = asyncio.run(collect(chunked(data.encode(RECORD_ENCODING), seed), batch_size=7))
+    assert decoded == RECORDS
+
+
+def test_decode_stream_with_executor():
+    data = encode_records(RECORDS).encode(RECORD_ENCODING)
+    with ThreadPoolExecutor(2) as executor:
+        decoded = asyncio.run(collect(chunked(data, 0), batch_size=10, executor=executor))
+    assert decoded == RECORDS
+
+
+def test_decode_stream_from_stream_reader():
+    data = encode_records(RECORDS).encode(RECORD_ENCODING)
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await collect(reader)
+
+    assert asyncio.run(run()) == RECORDS
+
+
+def test_decode_stream_raises():
+    async def run():
+        return await collect(chunked(b"Q9 bogus\r\n", 0))
+
+    with pytest.raises(KeyError):
+        asyncio.run(run())
+
+
+class BufferWriter:
+    def __init__(self):
+        self.buffer = bytearray()
+        self.drains = 0
+
+    def write(self, data: bytes) -> None:
+        self.buffer += data
+
+    async def drain(self) -> None:
+        self.drains += 1
+
+
+async def agen(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.parametrize("use_executor", [False, True])
+@pytest.mark.parametrize("use_async_source", [False, True])
+def test_encode_stream_matches_encode_records(use_executor: bool, use_async_source: bool):
+    writer = BufferWriter()
+
+    async def run():
+        source = agen(RECORDS) if use_async_source else RECORDS
+        if use_executor:
+            with ThreadPoolExecutor(1) as executor:
+                await encode_stream(source, writer, batch_size=9, executor=executor)
+        else:
+            await encode_stream(source, writer, batch_size=9)
+
+    asyncio.run(run())
+    assert writer.buffer.decode(RECORD_ENCODING) == encode_records(RECORDS)
+    assert writer.drains == -(-len(RECORDS) // 9)
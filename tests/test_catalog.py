@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers import write_meet
+
+import sdif.models as models
+from sdif.catalog import HEAD_BYTES, catalog, peek
+from sdif.records import encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+
+
+def test_peek(tmp_path):
+    records = write_meet(tmp_path / "a.sd3", 1, n_teams=3, n_swimmers=6)
+    entry = peek(tmp_path / "a.sd3")
+    assert entry.description == records[0]
+    assert entry.meet == records[1]
+    assert entry.terminator == records[-1]
+    assert not entry.scanned
+    assert (tmp_path / "a.sd3").stat().st_size > 4 * HEAD_BYTES
+
+
+def test_small_file(tmp_path):
+    records = list(generate_meet(MeetSpec(seed=1, n_teams=1, n_swimmers=1, n_events=1)))
+    records = [records[0], records[1], records[-1]]
+    (tmp_path / "a.sd3").write_bytes(encode_records(records).encode("latin-1"))
+    entry = peek(tmp_path / "a.sd3")
+    assert (entry.description, entry.meet, entry.terminator) == tuple(records)
+    assert not entry.scanned
+
+
+def test_falls_back_to_scan(tmp_path):
+    records = write_meet(tmp_path / "a.sd3", 2, n_teams=3, n_swimmers=6)
+    # Move the Z0 away from the end of the file.
+    moved = [*records[:-1]]
+    moved.insert(len(moved) // 2, records[-1])
+    (tmp_path / "a.sd3").write_bytes(encode_records(moved).encode("latin-1"))
+    entry = peek(tmp_path / "a.sd3")
+    assert entry.scanned
+    assert entry.terminator == records[-1]
+
+    no_terminator = records[:-1]
+    (tmp_path / "b.sd3").write_bytes(encode_records(no_terminator).encode("latin-1"))
+    entry = peek(tmp_path / "b.sd3")
+    assert entry.scanned and entry.terminator is None
+    assert isinstance(entry.meet, models.Meet)
+
+
+def test_catalog(tmp_path):
+    paths = [tmp_path / f"{seed}.sd3" for seed in range(5)]
+    meets = [write_meet(path, seed, n_teams=1, n_swimmers=6) for seed, path in enumerate(paths)]
+    entries = catalog(paths)
+    assert [e.path for e in entries] == [str(p) for p in paths]
+    assert [e.meet for e in entries] == [m[1] for m in meets]
+    with ThreadPoolExecutor(2) as pool:
+        assert catalog(paths, executor=pool) == entries
+
+
+def test_catalog_records_errors(tmp_path):
+    good = tmp_path / "good.sd3"
+    records = write_meet(good, 1, n_teams=1, n_swimmers=6)
+    bad = tmp_path / "bad.sd3"
+    bad.write_bytes(b"A0" + b"\xff" * 158 + b"\r\n")
+    missing = tmp_path / "missing.sd3"
+    entries = catalog([bad, good, missing], strict=True)
+    assert entries[1].meet == records[1] and entries[1].error is None
+    assert entries[0].error is not None and entries[0].description is None
+    assert isinstance(entries[2].error, FileNotFoundError)
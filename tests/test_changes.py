@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import attr
+import pytest
+from helpers import index_of
+
+import sdif
+import sdif.models as models
+from sdif.changes import ChangeKind, diff, diff_text
+from sdif.records import RECORD_SEP, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time, TimeCode
+
+RECORDS = list(generate_meet(MeetSpec(n_teams=3, n_swimmers=4, n_relays=2)))
+
+
+def test_identical_files_have_no_changes():
+    text = encode_records(RECORDS)
+    assert not diff_text(text, text)
+
+
+def test_field_level_changes():
+    new = list(RECORDS)
+    i = index_of(RECORDS, "D0", 3)
+    new[i] = attr.evolve(new[i], finals_time=Time(6000), finals_place_ranking=1)
+    j = index_of(RECORDS, "D0", 5)
+    new[j] = attr.evolve(new[j], finals_time=TimeCode.disqualified)
+
+    changes = diff_text(encode_records(RECORDS), encode_records(new))
+    assert [c.kind for c in changes] == [ChangeKind.changed, ChangeKind.changed]
+    first = changes.changed[0]
+    assert first.old == RECORDS[i]
+    assert first.new == new[i]
+    assert {f.name for f in first.fields} == {"finals_time", "finals_place_ranking"}
+    old = RECORDS[i]
+    assert isinstance(old, models.IndividualEvent)
+    assert first.key[:3] == ("D0", old.ussn, old.event_number)
+    (dq,) = changes.changed[1].fields
+    assert dq.new == TimeCode.disqualified
+
+
+def test_added_and_removed_records():
+    d0 = index_of(RECORDS, "D0", 2)
+    removed_g0 = index_of(RECORDS, "G0", 7)
+    new = list(RECORDS)
+    added = attr.evolve(RECORDS[d0], event_number="99")
+    new.insert(d0 + 1, added)
+    del new[removed_g0 + 1]
+
+    changes = diff_text(encode_records(RECORDS), encode_records(new))
+    assert [c.new for c in changes.added] == [added]
+    assert [c.old for c in changes.removed] == [RECORDS[removed_g0]]
+    assert not changes.changed
+
+
+def test_reordered_records_are_unchanged():
+    c1 = [index_of(RECORDS, "C1", n) for n in range(3)]
+    new = RECORDS[:2] + RECORDS[c1[1] : c1[2]] + RECORDS[c1[0] : c1[1]] + RECORDS[c1[2] :]
+    assert sorted(new, key=id) == sorted(RECORDS, key=id)
+    assert not diff_text(encode_records(RECORDS), encode_records(new))
+
+
+def test_diff_paths(tmp_path: Path):
+    old_path = tmp_path / "old.sd3"
+    new_path = tmp_path / "new.sd3"
+    old_path.write_text(encode_records(RECORDS) + RECORD_SEP, newline="")
+    z0 = attr.evolve(RECORDS[-1], notes="Corrected")
+    new_path.write_text(encode_records(RECORDS[:-1] + [z0]), newline="")
+
+    (change,) = sdif.diff(old_path, new_path)
+    assert change.key == ("Z0", "0")
+    assert change.fields[0].name == "notes"
+
+
+def test_text_is_not_a_path():
+    with pytest.raises(FileNotFoundError):
+        diff(encode_records(RECORDS[:1]), encode_records(RECORDS[:1]))
+
+
+def test_repeated_lines_match_by_occurrence():
+    lines = encode_records(RECORDS).split(RECORD_SEP)
+    g0 = index_of(RECORDS, "G0")
+    later_d0 = index_of(RECORDS, "D0", 3)
+    # The same G0 line again, after another swimmer's D0.
+    old = lines[: later_d0 + 1] + [lines[g0]] + lines[later_d0 + 1 :]
+    (change,) = diff(old, lines)
+    assert change.kind == ChangeKind.removed
+    event = RECORDS[later_d0]
+    assert isinstance(event, models.IndividualEvent)
+    assert change.key[2] == event.event_number
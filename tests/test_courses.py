@@ -0,0 +1,71 @@
+import sdif.courses as courses
+from sdif.models import CourseStatusCode, StrokeCode
+from sdif.time import Time
+
+Y = CourseStatusCode.short_yards
+S = CourseStatusCode.short_meters
+L = CourseStatusCode.long_meters
+FREE = StrokeCode.freestyle
+
+
+def test_equivalent_distance():
+    assert courses.equivalent_distance(100, FREE, Y, L) == 100
+    assert courses.equivalent_distance(500, FREE, Y, L) == 400
+    assert courses.equivalent_distance(1650, FREE, CourseStatusCode.short_yards_int, L) == 1500
+    assert courses.equivalent_distance(400, FREE, L, Y) == 500
+    assert courses.equivalent_distance(400, StrokeCode.im, L, Y) == 400
+    assert courses.equivalent_distance(800, FREE, S, Y) == 1000
+    assert courses.equivalent_distance(500, StrokeCode.backstroke, Y, L) is None
+    assert courses.equivalent_distance(100, FREE, CourseStatusCode.disqualified, L) is None
+
+
+def test_convert():
+    assert courses.convert(Time(5000), 100, FREE, Y, L) == Time(5550)
+    assert courses.convert(Time(5550), 100, FREE, L, Y) == Time(5000)
+    assert courses.convert(Time(30000), 500, FREE, Y, L) == Time(26775)
+    assert courses.convert(Time(5000), 100, FREE, L, L) == Time(5000)
+    assert courses.convert(Time(5000), 100, FREE, Y, S) == courses.convert(
+        Time(5550), 100, FREE, L, S
+    )
+    assert courses.convert(Time(5000), 75, FREE, Y, L) is None
+
+
+def test_same_course_needs_no_factor():
+    assert courses.convert(Time(30000), 400, FREE, Y, Y) == Time(30000)
+    assert courses.conversion_factor(150, StrokeCode.im, S, S) == (1, 1)
+    assert courses.equivalent_distance(150, StrokeCode.im, S, CourseStatusCode("1")) == 150
+    assert list(courses.convert_column([100, 200], 400, FREE, Y, Y) or []) == [100, 200]
+
+
+def test_custom_table():
+    table = dict(courses.FACTORS)
+    table[Y, FREE, 100] = courses.Factor(100, 12000)
+    assert courses.convert(Time(5000), 100, FREE, Y, L, table) == Time(6000)
+
+
+def test_convert_column_matches_scalar():
+    times = [2100 + 37 * i for i in range(200)]
+    column = courses.convert_column(times, 100, FREE, Y, L)
+    assert column is not None
+    expected = [courses.convert(Time(cs), 100, FREE, Y, L) for cs in times]
+    assert list(column) == [time.centiseconds for time in expected if time is not None]
+    assert courses.convert_column(times, 75, FREE, Y, L) is None
+
+
+def test_convert_columns_mixed_rows():
+    rows = [
+        (5000, 100, FREE, Y),
+        (30000, 500, FREE, Y),
+        (5550, 100, FREE, L),
+        (5100, 100, FREE, S),
+        (9999, 75, FREE, Y),
+        (30000, 500, StrokeCode.backstroke, Y),
+    ]
+    times, distances, strokes, from_courses = map(list, zip(*rows))
+    converted = courses.convert_columns(times, distances, strokes, from_courses, L)
+    expected = [
+        None if (t := courses.convert(Time(cs), d, s, c, L)) is None else t.centiseconds
+        for cs, d, s, c in rows
+    ]
+    assert converted == expected
+    assert converted[-2:] == [None, None]
@@ -0,0 +1,258 @@
+"""Differential fuzzing of codec engines against the reference implementation.
+
+Every engine in ENGINES must decode and encode exactly like the reference
+decode_record/encode_record pair, including which exception type is raised.
+Set SDIF_FUZZ_ITERATIONS to fuzz harder than the default.
+"""
+
+import os
+import random
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Iterable, cast
+
+import pytest
+
+import sdif.fields as fields
+import sdif.model_meta as model_meta
+from sdif.fields import FieldDef, FieldType, SdifModel
+from sdif.profiling import CodecStats
+from sdif.records import (
+    RECORD_CONTENT_LEN,
+    RECORD_SEP,
+    RecordError,
+    decode_record,
+    decode_records,
+    decode_value,
+    encode_record,
+    encode_records,
+)
+from sdif.time import Time, TimeCode
+
+ITERATIONS = int(os.environ.get("SDIF_FUZZ_ITERATIONS", "50"))
+
+Decoder = Callable[[list[str], bool], list[SdifModel]]
+Encoder = Callable[[list[SdifModel], bool], str]
+
+
+def reference_decode(lines: list[str], strict: bool) -> list[SdifModel]:
+    return [decode_record(line, model_meta.REGISTERED_MODELS[line[:2]], strict) for line in lines]
+
+
+def reference_encode(records: list[SdifModel], strict: bool) -> str:
+    return RECORD_SEP.join(encode_record(record, strict) for record in records)
+
+
+def collecting_decode(lines: list[str], strict: bool) -> list[SdifModel]:
+    error_log: list[RecordError] = []
+    decoded = list(decode_records(lines, strict, errors="collect", error_log=error_log))
+    if error_log:
+        raise error_log[0].exception
+    return decoded
+
+
+ENGINES: dict[str, tuple[Decoder, Encoder]] = {
+    "collect": (
+        collecting_decode,
+        lambda records, strict: encode_records(records, strict),
+    ),
+    "decode_records": (
+        lambda lines, strict: list(decode_records(lines, strict)),
+        lambda records, strict: encode_records(records, strict),
+    ),
+    "instrumented": (
+        lambda lines, strict: list(decode_records(lines, strict, stats=CodecStats())),
+        lambda records, strict: encode_records(records, strict, stats=CodecStats()),
+    ),
+}
+
+
+def outcome(fn: Callable[[], Any]) -> tuple[str, Any]:
+    try:
+        return "ok", fn()
+    except Exception as e:
+        return "error", type(e)
+
+
+# Random raw field text
+
+
+def _alnum(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice("ABCXYZ abc019-,.'") for _ in range(n))
+
+
+def random_raw(rng: random.Random, field: FieldDef) -> str:
+    """Raw field text, mostly valid, sometimes blank or garbage."""
+    n = field.len
+    roll = rng.random()
+    if roll < 0.15:
+        return " " * n
+    if roll < 0.25:
+        return _alnum(rng, n)
+
+    t = field.record_type
+    if t == FieldType.code:
+        enum = field.model_type
+        assert issubclass(enum, Enum)
+        value = rng.choice([m.value for m in enum] + ["?"])
+        return value.ljust(n)[:n]
+    if t == FieldType.date:
+        m, d, y = rng.randint(0, 13), rng.randint(0, 32), rng.randint(1900, 2100)
+        return f"{m:02d}{d:02d}{y:04d}"
+    if t == FieldType.dec:
+        text = rng.choice(["1", "12.", "1.5", ".25", "-3", "99.9", "1e2", "x"])
+        return text.rjust(n)[:n]
+    if t == FieldType.int:
+        return str(rng.randint(0, 10**n - 1)).rjust(n)
+    if t == FieldType.logical:
+        return rng.choice("TFtfX")
+    if t == FieldType.time:
+        text = rng.choice(
+            [Time(rng.randint(0, 10**6)).format()]
+            + [c.value for c in TimeCode]
+            + ["1:2.3", "NT ", "99"]
+        )
+        return rng.choice([text.rjust(n), text.ljust(n)])[:n]
+    if t in (FieldType.alpha, FieldType.ussnum) and rng.random() < 0.5:
+        return str(rng.randint(0, 10**n - 1)).rjust(n)
+    return _alnum(rng, n)
+
+
+def random_line(rng: random.Random, cls: type[SdifModel]) -> str:
+    """A record line: either every field random, or a valid record with one field mutated."""
+    field_defs = list(fields.record_fields(cls))
+    if rng.random() < 0.5:
+        buf = [" "] * RECORD_CONTENT_LEN
+        for field in field_defs:
+            raw = cls.identifier if field.name == "identifier" else random_raw(rng, field)
+            buf[field.start - 1 : field.start - 1 + field.len] = raw
+        return "".join(buf)
+
+    line = encode_record(random_record(rng, cls), strict=False)
+    if rng.random() < 0.5:
+        field = rng.choice(field_defs[1:])
+        start = field.start - 1
+        line = line[:start] + random_raw(rng, field) + line[start + field.len :]
+    return line
+
+
+# Random model values
+
+
+def random_value(rng: random.Random, field: FieldDef, valid: bool) -> Any:
+    """A model value; with valid=False, values may be too wide to encode."""
+    if field.optional and rng.random() < 0.2:
+        return None
+    t = field.record_type
+    n = field.len if valid or rng.random() < 0.9 else field.len + 1
+    if t == FieldType.code:
+        return rng.choice(list(cast(type[Enum], field.model_type)))
+    if t == FieldType.date:
+        return date(rng.randint(1950, 2030), rng.randint(1, 12), rng.randint(1, 28))
+    if t == FieldType.dec:
+        return Decimal(rng.randint(0, 10 ** (n - 1) - 1)) / rng.choice([1, 10])
+    if t == FieldType.int:
+        return rng.randint(0, 10 ** rng.randint(1, n) - 1)
+    if t == FieldType.logical:
+        return rng.choice([True, False])
+    if t == FieldType.time:
+        if Time not in (field.model_type, *getattr(field.model_type, "__args__", ())):
+            return rng.choice(list(TimeCode))
+        if rng.random() < 0.2 and field.model_type is not Time:
+            return rng.choice(list(TimeCode))
+        # 99:59.99 is the widest time that fits in the 8 columns the spec allots.
+        return Time(rng.randint(0, 599999 if valid else 10**6))
+    if t == FieldType.usps:
+        return rng.choice(["VA", "md", "Tx"])
+    if rng.random() < 0.3:
+        return str(rng.randint(0, 10 ** rng.randint(1, n) - 1))
+    return _alnum(rng, rng.randint(1, n)).strip() or "x"
+
+
+def random_record(rng: random.Random, cls: type[SdifModel], valid: bool = True) -> SdifModel:
+    kwargs = {
+        field.name: random_value(rng, field, valid)
+        for field in fields.record_fields(cls)
+        if field.name != "identifier"
+    }
+    return cls(**kwargs)  # type: ignore
+
+
+def field_cases(iterations: int) -> Iterable[tuple[FieldDef, str]]:
+    rng = random.Random(0)
+    for cls in model_meta.REGISTERED_MODELS.values():
+        for field in fields.record_fields(cls):
+            if field.name == "identifier":
+                continue
+            for _ in range(iterations):
+                yield field, random_raw(rng, field)
+
+
+MODELS = sorted(model_meta.REGISTERED_MODELS)
+
+
+def test_line_generator_reaches_both_outcomes():
+    """Guard against a line generator that only ever produces valid (or invalid) records."""
+    for identifier in MODELS:
+        cls = model_meta.REGISTERED_MODELS[identifier]
+        rng = random.Random(identifier)
+        statuses = {
+            outcome(lambda: reference_decode([random_line(rng, cls)], False))[0] for _ in range(50)
+        }
+        assert statuses == {"ok", "error"}, identifier
+
+
+@pytest.mark.parametrize("strict", [False, True])
+@pytest.mark.parametrize("identifier", MODELS)
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_decode_matches_reference(engine: str, identifier: str, strict: bool):
+    decode, _ = ENGINES[engine]
+    cls = model_meta.REGISTERED_MODELS[identifier]
+    rng = random.Random(f"{identifier}-{strict}")
+    for _ in range(ITERATIONS):
+        line = random_line(rng, cls)
+        expected = outcome(lambda: reference_decode([line], strict))
+        assert outcome(lambda: decode([line], strict)) == expected, line
+
+
+@pytest.mark.parametrize("strict", [False, True])
+@pytest.mark.parametrize("identifier", MODELS)
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_encode_matches_reference(engine: str, identifier: str, strict: bool):
+    _, encode = ENGINES[engine]
+    cls = model_meta.REGISTERED_MODELS[identifier]
+    rng = random.Random(f"{identifier}-{strict}")
+    for _ in range(ITERATIONS):
+        record = random_record(rng, cls, valid=rng.random() < 0.5)
+        expected = outcome(lambda: reference_encode([record], strict))
+        assert outcome(lambda: encode([record], strict)) == expected, record
+
+
+@pytest.mark.parametrize("strict", [False, True])
+@pytest.mark.parametrize("identifier", MODELS)
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_round_trip_matches_reference(engine: str, identifier: str, strict: bool):
+    decode, encode = ENGINES[engine]
+    cls = model_meta.REGISTERED_MODELS[identifier]
+    rng = random.Random(f"rt-{identifier}-{strict}")
+    for _ in range(ITERATIONS):
+        line = random_line(rng, cls)
+        status, decoded = outcome(lambda: reference_decode([line], strict))
+        if status != "ok":
+            continue
+        expected = outcome(lambda: reference_encode(decoded, strict))
+        assert outcome(lambda: encode(decode([line], strict), strict)) == expected, line
+
+
+def test_field_generator_reaches_both_outcomes():
+    """Guard against a field generator that only ever produces valid (or invalid) text."""
+    statuses: dict[FieldType, set[str]] = {}
+    for field, raw in field_cases(50):
+        status, _ = outcome(lambda: decode_value(field, raw, strict=True))
+        statuses.setdefault(field.record_type, set()).add(status)
+    for field_type, seen in statuses.items():
+        if field_type in (FieldType.const,):
+            continue
+        assert "ok" in seen, field_type
+    assert any("error" in seen for seen in statuses.values())
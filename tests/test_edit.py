@@ -0,0 +1,79 @@
+from datetime import date
+from pathlib import Path
+
+import attr
+import pytest
+
+from sdif.edit import EditSession
+from sdif.models import IndividualEvent
+from sdif.records import encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+
+RECORDS = list(generate_meet(MeetSpec(n_teams=2, n_swimmers=3, n_relays=0)))
+
+
+def nonstandard_text() -> str:
+    """A file whose untouched lines would not survive a decode/encode round trip."""
+    lines = encode_records(RECORDS).split("\r\n")
+    # A trailing-dot Decimal re-encodes as "   4".
+    lines = [line[:138] + " 4." + line[141:] if line.startswith("D0") else line for line in lines]
+    # Mixed line endings and no final terminator.
+    return "\r\n".join(lines[:3]) + "\n" + "\r\n".join(lines[3:])
+
+
+def test_untouched_save_is_byte_for_byte():
+    text = nonstandard_text()
+    session = EditSession.from_text(text)
+    # Reading records doesn't count as modifying them.
+    assert all(r.identifier for r in session)
+    assert session.modified() == []
+    assert session.dumps() == text
+
+
+def test_only_replaced_records_are_reencoded():
+    text = nonstandard_text()
+    session = EditSession.from_text(text)
+    i = session.indices("D0")[1]
+    session[i] = attr.evolve(session[i], birthdate=date(2010, 1, 2))
+    assert session.modified() == [i]
+
+    original = text.splitlines(keepends=True)
+    saved = session.dumps().splitlines(keepends=True)
+    assert len(saved) == len(original)
+    assert [n for n, (a, b) in enumerate(zip(original, saved)) if a != b] == [i]
+    assert saved[i].endswith("\r\n")
+    (d0,) = EditSession.from_text(saved[i])
+    assert isinstance(d0, IndividualEvent) and d0.birthdate == date(2010, 1, 2)
+
+
+def test_insert_and_delete(tmp_path: Path):
+    path = tmp_path / "meet.sd3"
+    path.write_text(encode_records(RECORDS), newline="")
+    session = EditSession.open(path)
+    d3 = session.indices("D3")[0]
+    del session[d3]
+    session.insert(len(session) - 1, RECORDS[d3])
+    session.save(path)
+
+    reread = EditSession.open(path)
+    assert list(reread.identifiers())[-2:] == ["D3", "Z0"]
+    assert len(reread) == len(RECORDS)
+
+
+def test_slice_assignment_rejected():
+    session = EditSession.from_text(encode_records(RECORDS))
+    with pytest.raises(TypeError):
+        session[0:1] = RECORDS[:1]
+
+
+def test_blank_lines_and_control_characters_survive():
+    lines = encode_records(RECORDS).split("\r\n")
+    i = next(n for n, line in enumerate(lines) if line.startswith("D0"))
+    # A form feed inside a field must not split the record.
+    lines[i] = lines[i][:20] + "\x0c" + lines[i][21:]
+    text = "\r\n" + "\r\n".join(lines[:3]) + "\r\n\r\n\n" + "\r\n".join(lines[3:]) + "\r\n"
+    session = EditSession.from_text(text)
+    assert len(session) == len(RECORDS)
+    assert session.dumps() == text
+    session[1] = session[1]
+    assert session.dumps() == text
@@ -0,0 +1,126 @@
+import random
+from datetime import date
+
+import attr
+
+import sdif.models as models
+from sdif.entities import EntityResolver, Mention, mentions, split_name
+from sdif.synthetic import MeetSpec, generate_meet
+
+
+def test_split_name():
+    assert split_name("O'Brien, Mary K") == ("OBRIEN", "MARY")
+    assert split_name("Smith") == ("SMITH", "")
+
+
+def position(mention: Mention) -> int:
+    """The record index in the (key, index) source that mentions() gives."""
+    assert isinstance(mention.source, tuple)
+    return mention.source[1]
+
+
+def test_mentions_merge_d3_into_d0():
+    records = list(generate_meet(MeetSpec(seed=1, n_teams=1, n_swimmers=2, n_events=2)))
+    found = list(mentions(records, "a"))
+    d0s = [i for i, r in enumerate(records) if isinstance(r, models.IndividualEvent)]
+    f0s = [i for i, r in enumerate(records) if isinstance(r, models.RelayName)]
+    assert sorted(position(m) for m in found) == sorted(d0s + f0s)
+    first = next(m for m in found if position(m) == d0s[0])
+    assert first.uss_number and first.ussn
+
+
+def perturbed(mention: Mention, rng: random.Random) -> Mention:
+    last, _, rest = mention.name.partition(",")
+    first = rest.split()[0]
+    choice = rng.randrange(4)
+    if choice == 0:
+        return attr.evolve(mention, ussn="", uss_number="")
+    if choice == 1:
+        return attr.evolve(mention, ussn="", uss_number="", name=f"{last.upper()}, {first[:3]}")
+    if choice == 2:
+        return attr.evolve(mention, uss_number="")
+    return attr.evolve(mention, ussn="", name=f"{last}, {first}")
+
+
+def test_resolve_variants():
+    rng = random.Random(0)
+    resolver = EntityResolver()
+    truth = {}
+    for seed in range(3):
+        records = list(generate_meet(MeetSpec(seed=seed, n_teams=3, n_swimmers=5, n_events=4)))
+        base = list(mentions(records, seed))
+        for year in range(3):
+            for mention in base:
+                variant = perturbed(mention, rng)
+                variant = attr.evolve(variant, source=(seed, year, position(mention)))
+                resolver.add(variant)
+                truth[variant.source] = mention.uss_number or mention.ussn
+    resolved = resolver.resolve()
+    assert len(resolved) == len(truth)
+    by_truth: dict = {}
+    for source, canonical in resolved.items():
+        by_truth.setdefault(truth[source][:12], set()).add(canonical)
+    assert all(len(ids) == 1 for ids in by_truth.values())
+    assert len({next(iter(ids)) for ids in by_truth.values()}) == len(by_truth)
+
+    # IDs don't depend on the order mentions were added.
+    shuffled = EntityResolver()
+    order = list(resolver.mentions)
+    rng.shuffle(order)
+    shuffled.update(order)
+    assert shuffled.resolve() == resolved
+
+
+def test_no_match_without_shared_block():
+    resolver = EntityResolver()
+    resolver.add(Mention("a", "Smith, John"))
+    resolver.add(Mention("b", "Smith, John"))
+    assert len(resolver.clusters()) == 2
+
+
+def test_siblings_not_merged_on_weak_matches():
+    born = date(2010, 5, 1)
+    female = models.SexCode.female
+    resolver = EntityResolver()
+    # Twins whose new USS numbers share a stem, and a mention with only an initial.
+    resolver.add(Mention("a", "Smith, Annabel", born, female, uss_number="050110ANNJSMI1"))
+    resolver.add(Mention("b", "Smith, Annika", born, female, uss_number="050110ANNJSMI2"))
+    resolver.add(Mention("c", "Smith, A", born, female))
+    # An old USS number with no birthdate only shares the stem.
+    resolver.add(Mention("d", "Smith, Annabel", ussn="050110ANNJSM"))
+    assert resolver.clusters() == [[0], [1], [2], [3]]
+    candidates = resolver.candidates()
+    assert ([0], [1]) in candidates and ([0], [3]) in candidates
+    assert ([0], [2]) in candidates and ([1], [2]) in candidates
+
+    # With a birthdate, the old number still can't tell the twins apart.
+    resolver.add(Mention("e", "Smith, Annabel", born, female, ussn="050110ANNJSM"))
+    assert [1] in resolver.clusters() and [2] in resolver.clusters()
+
+
+def test_shared_nickname_does_not_join_siblings():
+    born = date(2010, 5, 1)
+    male = models.SexCode.male
+    resolver = EntityResolver()
+    resolver.add(Mention("a", "Smith, Albert", born, male, uss_number="050110ALBJSMI1"))
+    resolver.add(Mention("b", "Smith, Alex", born, male, uss_number="050110ALEJSMI1"))
+    resolver.add(Mention("c", "Smith, Al", born, male))
+    assert resolver.clusters() == [[0], [1], [2]]
+    assert ([0], [2]) in resolver.candidates() and ([1], [2]) in resolver.candidates()
+
+    # A prefix of a single name still merges, unless the full numbers differ.
+    resolver = EntityResolver()
+    resolver.add(Mention("a", "Smith, Alexander", born, male, uss_number="050110ALEJSMI1"))
+    resolver.add(Mention("b", "Smith, Alex", born, male))
+    resolver.add(Mention("c", "Smith, Ale", born, male, uss_number="050110ALEJSMI2"))
+    assert resolver.clusters() == [[0, 1], [2]]
+
+
+def test_stem_merges_with_agreeing_birthdate():
+    born = date(2010, 5, 1)
+    resolver = EntityResolver()
+    resolver.add(Mention("a", "Smith, Annabel", born, uss_number="050110ANNJSMI1"))
+    resolver.add(Mention("b", "Smyth, Annabel", born, ussn="050110ANNJSM"))
+    resolver.add(Mention("c", "Smyth, Annabel", ussn="050110ANNJSM"))
+    assert resolver.clusters() == [[0, 1, 2]]
+    assert resolver.candidates() == []
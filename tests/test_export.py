@@ -0,0 +1,69 @@
+import io
+import json
+
+import attr
+import pytest
+
+import sdif.models as models
+from sdif.export import (
+    export_file,
+    export_lines,
+    export_records,
+    line_json,
+    record_json,
+)
+from sdif.records import decode_records, encode_record, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time, TimeCode
+
+
+def test_lines_and_records_agree(tmp_path):
+    records = list(generate_meet(MeetSpec(seed=3, n_teams=2, n_swimmers=4, n_events=4)))
+    text = encode_records(records)
+    decoded = list(decode_records(text))
+
+    from_lines = io.StringIO()
+    assert export_lines(text.split("\r\n"), from_lines) == len(records)
+    from_records = io.StringIO()
+    assert export_records(decoded, from_records) == len(records)
+    assert from_lines.getvalue() == from_records.getvalue()
+
+    (tmp_path / "a.sd3").write_bytes(text.encode("latin-1"))
+    from_file = io.StringIO()
+    export_file(tmp_path / "a.sd3", from_file)
+    assert from_file.getvalue() == from_lines.getvalue()
+
+    objects = [json.loads(line) for line in from_lines.getvalue().splitlines()]
+    for obj, record in zip(objects, decoded):
+        assert obj["identifier"] == record.identifier
+        assert list(obj)[1:] == [a.name for a in attr.fields(type(record))]
+
+
+def test_value_encoding():
+    records = list(generate_meet(MeetSpec(seed=1, n_teams=1, n_swimmers=1, n_events=1)))
+    entry = next(r for r in records if isinstance(r, models.IndividualEvent))
+    entry = attr.evolve(
+        entry,
+        name="Müller, Zoë",
+        finals_time=Time.from_str("1:02.39"),
+        prelim_time=TimeCode.no_time,
+        points_scored_finals=None,
+    )
+    line = encode_record(entry, False)
+    obj = json.loads(line_json(line))
+    assert obj["name"] == "Müller, Zoë"
+    assert obj["finals_time"] == 6239
+    assert obj["prelim_time"] == "NT"
+    assert obj["points_scored_finals"] is None
+    assert entry.birthdate is not None
+    assert obj["birthdate"] == entry.birthdate.isoformat()
+    assert obj["sex"] == entry.sex.value
+    assert obj["event_distance"] == entry.event_distance
+    assert json.loads(line_json(line, times="string"))["finals_time"] == "1:02.39"
+    assert line_json(line, times="string") == record_json(
+        next(iter(decode_records(line))), times="string"
+    )
+
+    team = next(r for r in records if isinstance(r, models.TeamId))
+    with pytest.raises(ValueError):
+        line_json(encode_record(attr.evolve(team, team_code=None), False))
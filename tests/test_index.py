@@ -0,0 +1,68 @@
+import os
+
+from helpers import write_meet
+
+import sdif.models as models
+from sdif.index import SwimmerIndex
+
+SPEC = {"n_teams": 2, "n_swimmers": 4, "n_events": 4}
+
+
+def test_index_and_query(tmp_path):
+    records = write_meet(tmp_path / "a.sd3", 1, **SPEC)
+    write_meet(tmp_path / "b.sd3", 2, **SPEC)
+    entry = next(r for r in records if isinstance(r, models.IndividualEvent))
+    assert entry.ussn is not None
+
+    with SwimmerIndex(tmp_path / "index.db") as index:
+        assert index.update([tmp_path / "a.sd3", tmp_path / "b.sd3"]) == 2
+        locations = index.locations(entry.ussn)
+        assert {loc.path for loc in locations} == {str(tmp_path / "a.sd3")}
+        found = [record for _, record in index.records(entry.ussn)]
+
+    expected = []
+    ussn = None
+    for record in records:
+        if isinstance(record, models.IndividualEvent):
+            ussn = record.ussn
+            if ussn == entry.ussn:
+                expected.append(record)
+        elif isinstance(record, models.IndividualInfo) and ussn == entry.ussn:
+            expected.append(record)
+        elif isinstance(record, models.SplitsRecord) and record.ussn == entry.ussn:
+            expected.append(record)
+        elif isinstance(record, models.RelayName) and entry.ussn in (
+            record.uss_number,
+            record.uss_number_new,
+        ):
+            expected.append(record)
+    assert found == expected
+    assert any(isinstance(r, models.IndividualInfo) for r in found)
+
+    info = next(r for r in found if isinstance(r, models.IndividualInfo))
+    with SwimmerIndex(tmp_path / "index.db") as index:
+        assert info.uss_number is not None
+        assert [r for _, r in index.records(info.uss_number)] == [info]
+
+
+def test_incremental_update(tmp_path):
+    write_meet(tmp_path / "a.sd3", 1, **SPEC)
+    with SwimmerIndex(tmp_path / "index.db") as index:
+        assert index.update([tmp_path / "a.sd3"]) == 1
+    records = write_meet(tmp_path / "b.sd3", 2, **SPEC)
+    with SwimmerIndex(tmp_path / "index.db") as index:
+        assert index.update([tmp_path / "a.sd3", tmp_path / "b.sd3"]) == 1
+        assert len(index.files()) == 2
+
+        entry = next(r for r in records if isinstance(r, models.IndividualEvent))
+        assert entry.ussn is not None
+        assert index.locations(entry.ussn)
+        write_meet(tmp_path / "b.sd3", 3, **SPEC)
+        stat = os.stat(tmp_path / "b.sd3")
+        os.utime(tmp_path / "b.sd3", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert index.add_file(tmp_path / "b.sd3")
+        assert index.locations(entry.ussn) == []
+
+        index.remove_file(tmp_path / "b.sd3")
+        assert index.files() == [str(tmp_path / "a.sd3")]
+        assert index.update([tmp_path / "a.sd3"]) == 0
@@ -0,0 +1,58 @@
+from helpers import write_lines
+
+from sdif.merge import MergeStats, iter_merged, merge_files
+from sdif.records import encode_records
+from sdif.sort import groups
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.validate import validate
+
+
+def split_sessions(lines):
+    """Two overlapping exports: each has the header, teams 0-2 and 1-3 respectively."""
+    header, teams, terminator = [], [], lines[-1]
+    for group, _ in groups(lines[:-1]):
+        if group[0].startswith("C1"):
+            teams.append([])
+        (teams[-1] if teams else header).extend(group)
+    first = header + [line for team in teams[:3] for line in team] + [terminator]
+    second = header + [line for team in teams[1:] for line in team] + [terminator]
+    return first, second
+
+
+def test_merge_overlapping_sessions(tmp_path):
+    records = list(generate_meet(MeetSpec(seed=6, n_teams=4, n_swimmers=6, n_events=5)))
+    lines = encode_records(records).split("\r\n")
+    first, second = split_sessions(lines)
+    write_lines(tmp_path / "a.sd3", first)
+    write_lines(tmp_path / "b.sd3", second)
+
+    stats = merge_files([tmp_path / "a.sd3", tmp_path / "b.sd3"], tmp_path / "out.sd3")
+    merged = (tmp_path / "out.sd3").read_bytes().decode("latin-1").split("\r\n")[:-1]
+
+    assert validate(merged) == []
+    assert sorted(merged) == sorted(lines)
+    assert merged[-1] == lines[-1]
+    assert stats.conflicts == 0
+    assert stats.records == len(lines)
+    assert stats.duplicates == len(first) + len(second) - 2 - (len(lines) - 1)
+
+
+def test_conflicts_keep_first(tmp_path):
+    records = list(generate_meet(MeetSpec(seed=7, n_teams=2, n_swimmers=4, n_events=3)))
+    lines = encode_records(records).split("\r\n")
+    changed = list(lines)
+    i = next(i for i, line in enumerate(lines) if line.startswith("D0"))
+    # Change the finals time.
+    changed[i] = changed[i][:115] + "59.99".rjust(8) + changed[i][123:]
+    write_lines(tmp_path / "a.sd3", lines)
+    write_lines(tmp_path / "b.sd3", changed)
+
+    stats = MergeStats()
+    merged = list(iter_merged([tmp_path / "a.sd3", tmp_path / "b.sd3"], stats, buffer_size=10))
+    assert sorted(merged) == sorted(lines)
+    assert validate(merged) == []
+    assert stats.conflicts == 1
+    assert stats.conflict_keys[0][0] == "D0"
+
+    merged = list(iter_merged([tmp_path / "b.sd3", tmp_path / "a.sd3"]))
+    assert changed[i] in merged and lines[i] not in merged
@@ -0,0 +1,83 @@
+from decimal import Decimal
+from pathlib import Path
+
+import attr
+import pytest
+
+import sdif.models as models
+from sdif.patch import FieldPatcher
+from sdif.records import RECORD_SEP, decode_records, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time, TimeCode
+
+RECORDS = list(generate_meet(MeetSpec(n_teams=2, n_swimmers=3, n_relays=0)))
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    path = tmp_path / "meet.sd3"
+    path.write_bytes((encode_records(RECORDS) + RECORD_SEP).encode())
+    return path
+
+
+def test_patch_matches_reencoding(path: Path):
+    with FieldPatcher(path) as patcher:
+        offsets = [o for o, ident in patcher.record_offsets() if ident == "D0"]
+        patcher.patch(offsets[0], "finals_time", Time(5999), models.IndividualEvent)
+        patcher.patch(offsets[1], "finals_time", TimeCode.disqualified)
+        patcher.patch_many(
+            [
+                (offsets[2], "finals_place_ranking", 1),
+                (offsets[2], "points_scored_finals", Decimal("20")),
+            ]
+        )
+        assert patcher.read(offsets[0], "finals_time") == Time(5999)
+
+    d0 = [i for i, r in enumerate(RECORDS) if r.identifier == "D0"]
+    expected = list(RECORDS)
+    expected[d0[0]] = attr.evolve(expected[d0[0]], finals_time=Time(5999))
+    expected[d0[1]] = attr.evolve(expected[d0[1]], finals_time=TimeCode.disqualified)
+    expected[d0[2]] = attr.evolve(
+        expected[d0[2]], finals_place_ranking=1, points_scored_finals=Decimal("20")
+    )
+    assert path.read_bytes() == (encode_records(expected) + RECORD_SEP).encode()
+
+
+def test_patch_checks_record_type(path: Path):
+    with FieldPatcher(path) as patcher:
+        ((offset, identifier),) = [i for i in patcher.record_offsets() if i[1] == "A0"]
+        with pytest.raises(ValueError):
+            patcher.patch(offset, "contact_name", "X", models.IndividualEvent)
+        with pytest.raises(KeyError):
+            patcher.patch(offset, "finals_time", Time(1))
+        with pytest.raises(ValueError):
+            patcher.patch(offset, "contact_name", "X" * 21)
+        with pytest.raises(ValueError):
+            patcher.patch(offset, "identifier", "B1")
+
+
+def test_patch_rejects_short_lines(tmp_path: Path):
+    path = tmp_path / "short.sd3"
+    line = encode_records(RECORDS[:1]).rstrip()
+    path.write_bytes((line + RECORD_SEP).encode())
+    with FieldPatcher(path) as patcher:
+        with pytest.raises(ValueError):
+            patcher.patch(0, "submitted_by_lsc", "VA")
+        patcher.patch(0, "contact_name", "Pat Smith")
+    (record,) = decode_records(path.read_text().split(RECORD_SEP)[:1])
+    assert isinstance(record, models.FileDescription)
+    assert record.contact_name == "Pat Smith"
+
+
+def test_patch_checks_offsets_and_encoded_width(path: Path):
+    before = path.read_bytes()
+    with FieldPatcher(path) as patcher:
+        offsets = [offset for offset, _ in patcher.record_offsets()]
+        with pytest.raises(ValueError):
+            patcher.patch(offsets[1] + 1, "meet_name", "X")
+        with pytest.raises(ValueError):
+            patcher.patch(len(before), "meet_name", "X")
+    with FieldPatcher(path, encoding="utf-8") as patcher:
+        with pytest.raises(ValueError):
+            patcher.patch(0, "contact_name", "Zoë")
+    assert path.read_bytes() == before
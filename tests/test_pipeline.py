@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import attr
+import pytest
+
+import sdif.models as models
+from sdif.pipeline import Batch, Pipeline, read_batches, read_file_batches
+from sdif.records import decode_records, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time, TimeCode
+
+
+@pytest.fixture(scope="module")
+def text():
+    return encode_records(generate_meet(MeetSpec(seed=1, n_teams=3, n_swimmers=6, n_events=6)))
+
+
+def is_fast(record) -> bool:
+    return isinstance(record.finals_time, Time) and record.finals_time.centiseconds < 6000
+
+
+def clear_heats(record):
+    return attr.evolve(record, finals_heat_number=None)
+
+
+def test_read_batches(text, tmp_path):
+    decoded = list(decode_records(text))
+    batches = list(read_batches(text.split("\r\n"), batch_size=7))
+    assert all(0 < len(b) <= 7 for b in batches)
+    assert all(all(type(r) is b.record_type for r in b.records) for b in batches)
+    for cls in {type(r) for r in decoded}:
+        expected = [r for r in decoded if type(r) is cls]
+        assert [r for b in batches if b.record_type is cls for r in b.records] == expected
+
+    only_d0 = list(read_batches(text.split("\r\n"), types=[models.IndividualEvent]))
+    assert [b.record_type for b in only_d0] == [models.IndividualEvent]
+
+    (tmp_path / "a.sd3").write_bytes(text.encode("latin-1"))
+    assert list(read_file_batches(tmp_path / "a.sd3", batch_size=7)) == batches
+
+
+@pytest.mark.parametrize("pool", [None, ThreadPoolExecutor, ProcessPoolExecutor])
+def test_pipeline(text, pool):
+    decoded = list(decode_records(text))
+    expected = [
+        clear_heats(r) for r in decoded if isinstance(r, models.IndividualEvent) and is_fast(r)
+    ]
+    assert expected
+    # Disqualified swims have a TimeCode instead of a Time.
+    assert any(
+        isinstance(r, models.IndividualEvent) and isinstance(r.finals_time, TimeCode)
+        for r in decoded
+    )
+
+    sunk: list[Batch] = []
+    executor = pool(2) if pool is not None else None
+    try:
+        pipeline = (
+            Pipeline(read_batches(text.split("\r\n"), batch_size=5), executor, max_in_flight=2)
+            .only(models.IndividualEvent)
+            .filter(is_fast)
+            .map(clear_heats)
+        )
+        n = pipeline.sink(sunk.append)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    assert n == len(expected)
+    assert [r for b in sunk for r in b.records] == expected
+    assert all(b.records for b in sunk)
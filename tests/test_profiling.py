@@ -0,0 +1,57 @@
+import pytest
+
+from sdif.fields import FieldType
+from sdif.profiling import CodecStats
+from sdif.records import RECORD_SEP, decode_records, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+
+
+def test_stats_do_not_change_results():
+    records = list(generate_meet(MeetSpec(n_teams=2, n_swimmers=4)))
+    stats = CodecStats()
+    serialized = encode_records(records, stats=stats)
+    assert serialized == encode_records(records)
+    assert list(decode_records(serialized, stats=stats)) == records
+
+
+def test_stats_counts():
+    records = list(generate_meet(MeetSpec(n_teams=2, n_swimmers=4, n_relays=0)))
+    serialized = encode_records(records)
+    stats = CodecStats()
+    list(decode_records(serialized, stats=stats))
+
+    n_d0 = sum(1 for r in records if r.identifier == "D0")
+    assert stats.records["D0"] == n_d0
+    assert stats.records["A0"] == 1
+    assert stats.record_seconds["D0"] > 0
+    assert stats.field_calls[FieldType.time] > 0
+    assert stats.field_seconds[FieldType.date] > 0
+    # Every synthetic D0 leaves the prelim time blank.
+    assert stats.blank_fields[("D0", "prelim_time")] == n_d0
+    assert "D0" in stats.summary()
+
+
+def test_stats_count_errors():
+    (a0,) = [r for r in generate_meet(MeetSpec(n_teams=0)) if r.identifier == "A0"]
+    line = encode_records([a0])
+    bad_date = line[:105] + "13452023" + line[113:]
+
+    stats = CodecStats()
+    with pytest.raises(ValueError):
+        list(decode_records([bad_date], stats=stats))
+    assert stats.errors[("A0", "ValueError")] == 1
+
+    with pytest.raises(KeyError):
+        list(decode_records(RECORD_SEP.join([line, "Q9"]), stats=stats))
+    assert stats.errors[("Q9", "KeyError")] == 1
+    assert stats.records["A0"] == 1
+
+
+def test_stats_merge():
+    records = list(generate_meet(MeetSpec(n_teams=1, n_swimmers=2)))
+    serialized = encode_records(records)
+    a, b = CodecStats(), CodecStats()
+    list(decode_records(serialized, stats=a))
+    list(decode_records(serialized, stats=b))
+    a.merge(b)
+    assert a.records["A0"] == 2
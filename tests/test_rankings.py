@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import attr
+
+import sdif.models as models
+from sdif.rankings import EventKey, SeasonRankings, rank_files, swims
+from sdif.records import encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time, TimeCode
+
+
+def meets(n: int) -> list[list]:
+    return [
+        list(generate_meet(MeetSpec(seed=seed, n_teams=3, n_swimmers=6, n_events=6)))
+        for seed in range(n)
+    ]
+
+
+def brute_force(records, top_n: int) -> dict[EventKey, list[tuple[int, str]]]:
+    best: dict[EventKey, dict[str, int]] = {}
+    for record in records:
+        if isinstance(record, models.IndividualEvent):
+            for key, swim in swims(record):
+                times = best.setdefault(key, {})
+                cs = swim.time.centiseconds
+                times[swim.swimmer] = min(cs, times.get(swim.swimmer, cs))
+    return {
+        key: sorted((cs, swimmer) for swimmer, cs in times.items())[:top_n]
+        for key, times in best.items()
+    }
+
+
+def ranked(rankings: SeasonRankings) -> dict[EventKey, list[tuple[int, str]]]:
+    return {
+        key: [(s.time.centiseconds, s.swimmer) for s in rankings.top(key)]
+        for key in rankings.keys()
+    }
+
+
+def test_top_n_matches_brute_force():
+    records = [r for meet in meets(4) for r in meet]
+    rankings = SeasonRankings(top_n=5)
+    rankings.update(records)
+    assert ranked(rankings) == brute_force(records, 5)
+
+
+def test_merge_matches_single_pass():
+    all_meets = meets(4)
+    whole = SeasonRankings(top_n=3)
+    for meet in all_meets:
+        whole.update(meet)
+
+    merged = SeasonRankings(top_n=3)
+    for meet in all_meets:
+        partial = SeasonRankings(top_n=3)
+        partial.update(meet)
+        merged.merge(partial)
+    assert ranked(merged) == ranked(whole)
+    assert merged.best == whole.best
+
+
+def test_improvement_within_heap_and_course_normalization():
+    records = generate_meet(MeetSpec(n_teams=1, n_swimmers=1))
+    d0 = next(r for r in records if isinstance(r, models.IndividualEvent))
+    scm = models.CourseStatusCode.short_meters
+    scm_int = models.CourseStatusCode.short_meters_int
+
+    rankings = SeasonRankings(top_n=2)
+    rankings.add(attr.evolve(d0, finals_time=Time(6000), finals_time_course=scm))
+    rankings.add(attr.evolve(d0, finals_time=Time(5900), finals_time_course=scm_int))
+    rankings.add(attr.evolve(d0, finals_time=TimeCode.disqualified))
+    (key,) = rankings.keys()
+    assert key.course == scm
+    assert [s.time for s in rankings.top(key)] == [Time(5900)]
+    assert rankings.best_time(d0.ussn or "", key) == rankings.top(key)[0]
+
+
+def test_rank_files(tmp_path: Path):
+    paths = []
+    for i, meet in enumerate(meets(3)):
+        path = tmp_path / f"{i}.sd3"
+        path.write_text(encode_records(meet), newline="")
+        paths.append(path)
+
+    whole = SeasonRankings(top_n=4)
+    for meet in meets(3):
+        whole.update(meet)
+    with ThreadPoolExecutor(2) as executor:
+        assert ranked(rank_files(paths, top_n=4, executor=executor)) == ranked(whole)
+    assert ranked(rank_files(paths, top_n=4)) == ranked(whole)
+
+
+def test_ties_evict_the_last_ranked_swimmer():
+    records = generate_meet(MeetSpec(n_teams=1, n_swimmers=1))
+    d0 = next(r for r in records if isinstance(r, models.IndividualEvent))
+    rankings = SeasonRankings(top_n=2)
+    for ussn, cs in [("A", 3000), ("B", 3100), ("C", 3100)]:
+        swim = attr.evolve(d0, ussn=ussn, prelim_time=None, swim_off_time=None)
+        rankings.add(attr.evolve(swim, finals_time=Time(cs)))
+    (key,) = rankings.keys()
+    assert [s.swimmer for s in rankings.top(key)] == ["A", "B"]
@@ -6,7 +6,14 @@ import pytest
 
 import sdif.models as models
 from sdif.fields import FieldDef, FieldType
-from sdif.records import decode_records, decode_value, encode_records, encode_value
+from sdif.records import (
+    ErrorBudgetExceeded,
+    RecordError,
+    decode_records,
+    decode_value,
+    encode_records,
+    encode_value,
+)
 from sdif.time import Time, TimeCode
 
 
@@ -146,3 +153,46 @@ def test_round_trip_m1_optional_fields():
 
     with pytest.raises(ValueError):
         list(decode_records(serialized, strict=True))
+
+
+def test_collect_errors():
+    good = encode_records(
+        [
+            models.TeamId(
+                organization=None,
+                team_code="ABC",
+                name="Bloggs Swim Club",
+                abbreviation=None,
+                address_1=None,
+                address_2=None,
+                city=None,
+                state=None,
+                postal_code=None,
+                country=None,
+                region=None,
+                team_code5=None,
+            )
+        ]
+    )
+    bad_code = good[:2] + "Q" + good[3:]
+    blank_mandatory = good[:11] + " " * 6 + good[17:]
+    unknown = "Q9" + good[2:]
+    lines = [good, bad_code, good, blank_mandatory, unknown]
+
+    errors: list[RecordError] = []
+    decoded = list(decode_records(lines, errors="collect", error_log=errors))
+    assert len(decoded) == 2
+    assert [(e.line_number, e.identifier, e.field, e.raw) for e in errors] == [
+        (2, "C1", "organization", "Q"),
+        (4, "C1", "team_code", "      "),
+        (5, "Q9", None, unknown),
+    ]
+    assert isinstance(errors[0].exception, ValueError)
+    assert isinstance(errors[2].exception, KeyError)
+
+    with pytest.raises(ErrorBudgetExceeded) as excinfo:
+        list(decode_records(lines, errors="collect", error_log=[], max_errors=1))
+    assert len(excinfo.value.errors) == 2
+
+    with pytest.raises(ValueError):
+        list(decode_records(lines, errors="collect"))
@@ -0,0 +1,113 @@
+from collections import defaultdict
+from decimal import Decimal
+
+import attr
+
+import sdif.models as models
+from sdif.records import encode_records
+from sdif.scoring import TeamScores, parse_centipoints
+from sdif.synthetic import MeetSpec, generate_meet
+
+
+def naive_totals(records) -> dict[str, Decimal]:
+    totals: dict[str, Decimal] = defaultdict(Decimal)
+    team = ""
+    for record in records:
+        if isinstance(record, models.TeamId):
+            team = record.team_code
+        elif isinstance(record, models.IndividualEvent) and record.points_scored_finals:
+            totals[team] += record.points_scored_finals
+        elif isinstance(record, models.RelayEvent) and record.finals_points:
+            totals[record.team_code] += record.finals_points
+    return totals
+
+
+def test_parse_centipoints():
+    assert parse_centipoints("    ") is None
+    assert parse_centipoints(" 4.") == 400
+    assert parse_centipoints("4.5") == 450
+    assert parse_centipoints("4.25") == 425
+    assert parse_centipoints(" .5") == 50
+    assert parse_centipoints("  17") == 1700
+    assert parse_centipoints("-3.5") == -350
+    assert parse_centipoints(" -.25") == -25
+
+
+def test_lines_and_records_agree_with_naive_sum():
+    records = list(generate_meet(MeetSpec(seed=5, n_teams=4, n_swimmers=8, n_events=8)))
+    from_records = TeamScores()
+    from_records.update(records)
+    from_lines = TeamScores()
+    from_lines.update_lines(encode_records(records).split("\r\n"))
+
+    expected = {team: points for team, points in naive_totals(records).items() if points}
+    assert dict(from_records.standings()) == expected
+    assert from_lines.standings() == from_records.standings()
+    assert from_lines.event_centipoints == from_records.event_centipoints
+    points = [p for _, p in from_records.standings()]
+    assert points == sorted(points, reverse=True)
+
+
+def test_centipoints_extension():
+    records = list(generate_meet(MeetSpec(seed=1, n_teams=1, n_swimmers=2, n_events=1)))
+    team = next(r for r in records if isinstance(r, models.TeamId))
+    entry = next(r for r in records if isinstance(r, models.IndividualEvent))
+    tied = attr.evolve(entry, points_scored_finals=Decimal(4), centipoints_scored_finals=50)
+    scores = TeamScores()
+    scores.update([team, tied])
+    assert scores.team_points(team.team_code) == Decimal("4.50")
+    scores = TeamScores()
+    scores.update_lines(encode_records([team, tied]).split("\r\n"))
+    assert scores.team_points(team.team_code) == Decimal("4.50")
+
+
+def test_corrected_result_replaces_points():
+    records = list(generate_meet(MeetSpec(seed=2, n_teams=2, n_swimmers=4, n_events=2)))
+    scores = TeamScores()
+    scores.update(records)
+    before = dict(scores.standings())
+
+    i, record = next(
+        (i, r)
+        for i, r in enumerate(records)
+        if isinstance(r, models.IndividualEvent) and r.points_scored_finals
+    )
+    team = next(r for r in reversed(records[:i]) if isinstance(r, models.TeamId))
+    assert isinstance(record, models.IndividualEvent) and record.points_scored_finals
+    assert record.event_number is not None
+    event = record.event_number.strip()
+    event_before = scores.event_points(event)[team.team_code]
+
+    corrected = attr.evolve(record, points_scored_finals=record.points_scored_finals + 1)
+    scores.update([team, corrected])
+    assert dict(scores.standings())[team.team_code] == before[team.team_code] + 1
+    assert scores.event_points(event)[team.team_code] == event_before + 1
+
+    scores.update([team, attr.evolve(record, points_scored_finals=None)])
+    assert (
+        scores.team_points(team.team_code) == before[team.team_code] - record.points_scored_finals
+    )
+
+
+def test_correction_after_later_teams_stays_with_its_team():
+    records = list(generate_meet(MeetSpec(seed=2, n_teams=3, n_swimmers=4, n_events=2)))
+    scores = TeamScores()
+    scores.update(records)
+    before = dict(scores.standings())
+
+    teams = [r.team_code for r in records if isinstance(r, models.TeamId)]
+    entry = next(
+        r
+        for r in records
+        if isinstance(r, models.IndividualEvent) and r.points_scored_finals is not None
+    )
+    assert entry.points_scored_finals is not None
+    corrected = attr.evolve(entry, points_scored_finals=entry.points_scored_finals + 1)
+    scores.add(corrected)
+    after = dict(scores.standings())
+    assert after[teams[0]] == before[teams[0]] + 1
+    assert {t: after.get(t) for t in teams[1:]} == {t: before.get(t) for t in teams[1:]}
+
+    scores = TeamScores()
+    scores.add(entry, team="XYZ")
+    assert scores.team_points("XYZ") == entry.points_scored_finals
@@ -0,0 +1,127 @@
+from typing import Optional
+
+import attr
+
+import sdif.models as models
+from sdif.seeding import heat_sizes, lane_order, seed, seed_event
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time, TimeCode
+
+
+def test_lane_order():
+    assert lane_order(8) == [4, 5, 3, 6, 2, 7, 1, 8]
+    assert lane_order(6) == [3, 4, 2, 5, 1, 6]
+    assert lane_order(5) == [3, 4, 2, 5, 1]
+
+
+def test_heat_sizes():
+    assert heat_sizes(0) == []
+    assert heat_sizes(5) == [5]
+    assert heat_sizes(16) == [8, 8]
+    assert heat_sizes(17) == [3, 6, 8]
+    assert heat_sizes(19) == [3, 8, 8]
+    assert heat_sizes(9, lanes=6) == [3, 6]
+
+
+def test_circle_seeding():
+    seeds = list(range(100, 124))
+    assignments = seed_event(seeds)
+    # Fastest three go to the center of heats 3, 2, 1.
+    assert assignments[:6] == [(3, 4), (2, 4), (1, 4), (3, 5), (2, 5), (1, 5)]
+    assert sorted(assignments) == [(h, lane) for h in (1, 2, 3) for lane in range(1, 9)]
+
+
+def test_straight_seeding_below_circled_heats():
+    seeds = list(range(40))
+    assignments = seed_event(seeds, circle_heats=2)
+    assert {assignments[i][0] for i in range(16)} == {4, 5}
+    assert [assignments[i] for i in range(16, 24)] == [(3, lane) for lane in lane_order(8)]
+    assert {assignments[i][0] for i in range(24, 32)} == {2}
+
+
+def test_no_times_seeded_last():
+    seeds = [None, 500, None, 400]
+    assert seed_event(seeds) == [(1, 3), (1, 5), (1, 6), (1, 4)]
+
+
+def test_seed_file():
+    records = list(generate_meet(MeetSpec(seed=1, n_teams=6, n_swimmers=10, n_events=4)))
+    seeded = seed(records)
+    assert len(seeded) == len(records)
+    entries: dict[str, list[models.IndividualEvent]] = {}
+    for before, after in zip(records, seeded):
+        if isinstance(after, models.IndividualEvent):
+            assert attr.evolve(after, prelim_heat_number=None, prelim_lane_number=None) == before
+            assert after.event_number is not None
+            entries.setdefault(after.event_number, []).append(after)
+        elif isinstance(after, models.RelayEvent):
+            assert after.prelim_heat is not None and after.prelim_lane is not None
+        else:
+            assert after == before
+    for event in entries.values():
+        slots = [(e.prelim_heat_number, e.prelim_lane_number) for e in event]
+        assert len(set(slots)) == len(slots)
+        last_heat = max(heat for heat, _ in slots if heat is not None)
+        timed = [(e.seed_time.centiseconds, e) for e in event if isinstance(e.seed_time, Time)]
+        _, fastest = min(timed, key=lambda pair: pair[0])
+        assert fastest.prelim_heat_number == last_heat
+        assert fastest.prelim_lane_number == 4
+
+
+def lanes(records) -> list[Optional[int]]:
+    return [r.prelim_lane_number for r in records if isinstance(r, models.IndividualEvent)]
+
+
+def test_seed_converts_courses():
+    records = [
+        r
+        for r in generate_meet(MeetSpec(seed=2, n_teams=1, n_swimmers=2, n_events=1))
+        if isinstance(r, models.IndividualEvent)
+    ][:2]
+    yards, meters = records
+    meters = attr.evolve(
+        meters,
+        event_number=yards.event_number,
+        event_distance=yards.event_distance,
+        stroke=models.StrokeCode.freestyle,
+        seed_time=Time(5200),
+        seed_time_course=models.CourseStatusCode.long_meters,
+    )
+    yards = attr.evolve(
+        yards,
+        event_distance=100,
+        stroke=models.StrokeCode.freestyle,
+        seed_time=Time(5000),
+        seed_time_course=models.CourseStatusCode.short_yards,
+    )
+    meters = attr.evolve(meters, event_distance=100)
+    # 50.00 yards is 55.50 long course, slower than 52.00.
+    seeded = seed([yards, meters], course=models.CourseStatusCode.long_meters)
+    assert lanes(seeded) == [5, 4]
+    seeded = seed([yards, meters], course=models.CourseStatusCode.short_yards)
+    assert lanes(seeded) == [5, 4]
+    no_time = attr.evolve(meters, seed_time=TimeCode.no_time)
+    seeded = seed([yards, no_time], course=models.CourseStatusCode.short_yards)
+    assert lanes(seeded) == [4, 5]
+
+
+def test_seed_same_course_event_without_factor():
+    # There is no 400 yard freestyle factor, but yards seeds need no conversion.
+    records = [
+        r
+        for r in generate_meet(MeetSpec(seed=2, n_teams=1, n_swimmers=3, n_events=1))
+        if isinstance(r, models.IndividualEvent)
+    ][:3]
+    records = [
+        attr.evolve(
+            record,
+            event_number="1",
+            event_distance=400,
+            stroke=models.StrokeCode.freestyle,
+            seed_time=Time(cs),
+            seed_time_course=models.CourseStatusCode.short_yards,
+        )
+        for record, cs in zip(records, [30000, 25000, 28000])
+    ]
+    seeded = seed(records, course=models.CourseStatusCode.short_yards)
+    assert lanes(seeded) == [3, 4, 5]
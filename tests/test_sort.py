@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+import sdif.models as models
+from sdif.records import encode_record, encode_records
+from sdif.sort import SortedWriter
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.validate import validate
+
+
+def groups(records) -> list[tuple[list, str]]:
+    """Records split into (group, team) pairs, as an unordered source might produce them."""
+    result: list[tuple[list, str]] = []
+    team = ""
+    for record in records:
+        if isinstance(record, models.TeamId):
+            team = record.team_code
+        if record.identifier in ("D3", "F0", "G0"):
+            result[-1][0].append(record)
+        else:
+            result.append(([record], team))
+    return result
+
+
+@pytest.mark.parametrize("buffer_size", [7, 100_000])
+def test_shuffled_groups_sort_into_valid_file(tmp_path, buffer_size):
+    records = list(generate_meet(MeetSpec(seed=4, n_teams=4, n_swimmers=8, n_events=6)))
+    shuffled = groups(records)
+    random.Random(0).shuffle(shuffled)
+
+    with SortedWriter(buffer_size=buffer_size, tempdir=tmp_path) as writer:
+        for group, team in shuffled:
+            writer.add_group(group, team)
+        assert (len(writer.runs) > 1) == (buffer_size < len(records))
+        writer.save(tmp_path / "out.sd3")
+        lines = list(writer.lines())
+    assert not list(tmp_path.glob("sdif-run-*"))
+
+    assert validate(lines) == []
+    assert sorted(lines) == sorted(encode_records(records).split("\r\n"))
+    text = (tmp_path / "out.sd3").read_bytes().decode("latin-1")
+    assert text.split("\r\n")[:-1] == lines
+
+    teams = [line[11:17].strip() for line in lines if line.startswith("C1")]
+    assert teams == sorted(teams)
+
+
+def test_groups_stay_together():
+    records = list(generate_meet(MeetSpec(seed=2, n_teams=1, n_swimmers=2, n_events=2)))
+    writer = SortedWriter()
+    original = groups(records)
+    for group, team in reversed(original):
+        writer.add_group(group, team)
+    lines = list(writer.lines())
+    for group, _ in original:
+        encoded = [encode_record(r, False) for r in group]
+        start = lines.index(encoded[0])
+        assert lines[start : start + len(encoded)] == encoded
+
+
+def test_invalid_groups():
+    records = list(generate_meet(MeetSpec(seed=2, n_teams=1, n_swimmers=2, n_events=2)))
+    entry = next(r for r in records if isinstance(r, models.IndividualEvent))
+    split = next(r for r in records if isinstance(r, models.SplitsRecord))
+    writer = SortedWriter()
+    with pytest.raises(ValueError):
+        writer.add(entry)
+    with pytest.raises(ValueError):
+        writer.add(split, team="PV0000")
+    with pytest.raises(ValueError):
+        writer.add_group([entry, entry], team="PV0000")
@@ -0,0 +1,149 @@
+import io
+import random
+
+import attr
+import pytest
+
+import sdif.models as models
+from sdif.rankings import EventKey, swims
+from sdif.standards import LEVELS, TimeStandards
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time
+
+KEY = EventKey(
+    100,
+    models.StrokeCode.freestyle,
+    models.CourseStatusCode.short_yards,
+    models.EventSexCode.female,
+    "1112",
+)
+
+TABLE = """distance,stroke,course,sex,age,level,time
+100,1,Y,F,1112,B,1:15.00
+100,1,Y,F,1112,BB,1:10.00
+100,1,Y,F,1112,A,1:05.00
+100,1,Y,F,1112,AA,1:02.00
+100,1,Y,F,1112,AAA,59.50
+100,1,Y,F,1112,AAAA,57.00
+"""
+
+
+def test_from_csv_and_classify():
+    standards = TimeStandards.from_csv(io.StringIO(TABLE))
+    assert standards.keys() == [KEY]
+    assert standards.classify(KEY, Time.from_str("1:20.00")) is None
+    assert standards.classify(KEY, Time.from_str("1:15.00")) == models.EventTimeClassCode.b_standard
+    assert standards.classify(KEY, Time.from_str("1:04.99")) == models.EventTimeClassCode.a_standard
+    assert (
+        standards.classify(KEY, Time.from_str("56.00")) == models.EventTimeClassCode.aaaa_standard
+    )
+    other = attr.evolve(KEY, event_age="1314")
+    assert standards.classify(other, Time.from_str("56.00")) is None
+
+
+def test_course_is_normalized():
+    standards = TimeStandards.from_csv(io.StringIO(TABLE.replace(",Y,", ",2,")))
+    assert standards.classify(KEY, Time.from_str("1:04.99")) == models.EventTimeClassCode.a_standard
+    alias = attr.evolve(KEY, course=models.CourseStatusCode("2"))
+    standards = TimeStandards.from_csv(io.StringIO(TABLE))
+    assert (
+        standards.classify(alias, Time.from_str("1:04.99")) == models.EventTimeClassCode.a_standard
+    )
+    assert standards.time_class(alias, Time.from_str("1:04.00")) == "34"
+    assert standards.classify_column(alias, [6499]) == [models.EventTimeClassCode.a_standard]
+
+
+def test_time_class():
+    standards = TimeStandards.from_csv(io.StringIO(TABLE))
+    assert standards.time_class(KEY, Time.from_str("1:20.00")) == "U2"
+    assert standards.time_class(KEY, Time.from_str("1:12.00")) == "2P"
+    assert standards.time_class(KEY, Time.from_str("1:04.00")) == "34"
+    assert standards.time_class(KEY, Time.from_str("55.00")) == "60"
+    assert standards.time_class(attr.evolve(KEY, distance=200), Time(1)) is None
+
+
+def test_classify_column_matches_linear_scan():
+    rng = random.Random(0)
+    standards = TimeStandards()
+    cuts = sorted(rng.sample(range(5000, 9000), len(LEVELS)), reverse=True)
+    for level, cut in zip(LEVELS, cuts):
+        standards.add(KEY, level, Time(cut))
+    column = [rng.randrange(4000, 10000) for _ in range(1000)] + cuts
+
+    def linear(cs):
+        met = [level for level, cut in zip(LEVELS, cuts) if cs <= cut]
+        return met[-1] if met else None
+
+    assert standards.classify_column(KEY, column) == [linear(cs) for cs in column]
+    assert standards.classify_column(attr.evolve(KEY, distance=50), column[:3]) == [None] * 3
+
+
+def test_annotate_records():
+    records = [
+        r
+        for r in generate_meet(MeetSpec(seed=3, n_teams=2, n_swimmers=6, n_events=6))
+        if isinstance(r, models.IndividualEvent)
+    ]
+    standards = TimeStandards()
+    keys = {key for r in records for key, _ in swims(r)}
+    for key in keys:
+        standards.add(key, models.EventTimeClassCode.b_standard, Time(999999))
+        standards.add(key, models.EventTimeClassCode.a_standard, Time(1))
+
+    annotated = list(standards.annotate(records))
+    assert len(annotated) == len(records)
+    for before, after in zip(records, annotated):
+        if any(True for _ in swims(before)):
+            assert after.event_time_class == "23"
+            assert standards.classify_record(before) == models.EventTimeClassCode.b_standard
+        else:
+            assert after == before
+
+
+def test_annotate_picks_the_best_level_across_courses():
+    record = next(
+        r
+        for r in generate_meet(MeetSpec(seed=3, n_teams=1, n_swimmers=2, n_events=2))
+        if isinstance(r, models.IndividualEvent)
+    )
+    record = attr.evolve(
+        record,
+        event_distance=KEY.distance,
+        stroke=KEY.stroke,
+        event_sex=KEY.event_sex,
+        event_age=KEY.event_age,
+        prelim_time=Time.from_str("1:10.00"),
+        prelim_time_course=models.CourseStatusCode.long_meters,
+        swim_off_time=None,
+        finals_time=Time.from_str("1:08.00"),
+        finals_time_course=models.CourseStatusCode.short_yards,
+    )
+    long_course = attr.evolve(KEY, course=models.CourseStatusCode.long_meters)
+    standards = TimeStandards()
+    standards.add(KEY, models.EventTimeClassCode.b_standard, Time.from_str("1:10.00"))
+    standards.add(KEY, models.EventTimeClassCode.a_standard, Time.from_str("1:05.00"))
+    standards.add(long_course, models.EventTimeClassCode.b_standard, Time.from_str("1:20.00"))
+    standards.add(long_course, models.EventTimeClassCode.a_standard, Time.from_str("1:15.00"))
+    # The slower long course prelim meets A; the faster yards final only meets B.
+    assert standards.classify_record(record) == models.EventTimeClassCode.a_standard
+    (annotated,) = standards.annotate([record])
+    assert annotated.event_time_class == "30"
+
+
+def test_tied_cuts_classify_as_faster_level():
+    standards = TimeStandards()
+    standards.add(KEY, models.EventTimeClassCode.b_standard, Time.from_str("1:10.00"))
+    standards.add(KEY, models.EventTimeClassCode.bb_standard, Time.from_str("1:10.00"))
+    standards.add(KEY, models.EventTimeClassCode.a_standard, Time.from_str("1:05.00"))
+    assert (
+        standards.classify(KEY, Time.from_str("1:08.00")) == models.EventTimeClassCode.bb_standard
+    )
+    assert standards.time_class(KEY, Time.from_str("1:08.00")) == "P3"
+
+
+def test_non_monotonic_cuts_are_rejected():
+    standards = TimeStandards()
+    standards.add(KEY, models.EventTimeClassCode.b_standard, Time.from_str("1:05.00"))
+    standards.add(KEY, models.EventTimeClassCode.a_standard, Time.from_str("1:10.00"))
+    with pytest.raises(ValueError):
+        standards.classify(KEY, Time.from_str("1:08.00"))
@@ -0,0 +1,43 @@
+from collections import Counter
+
+from sdif.models import FileTerminator, IndividualEvent, SplitsRecord
+from sdif.records import decode_records, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.time import Time
+
+
+def test_synthetic_meet_round_trips_strict():
+    records = list(generate_meet(MeetSpec(seed=3, n_teams=3, n_splits=12)))
+    serialized = encode_records(records, strict=True)
+    assert list(decode_records(serialized, strict=True)) == records
+
+
+def test_synthetic_meet_is_seeded():
+    spec = MeetSpec(seed=7, n_teams=2, n_swimmers=5)
+    assert list(generate_meet(spec)) == list(generate_meet(spec))
+
+
+def test_synthetic_meet_terminator_counts():
+    records = list(generate_meet(MeetSpec(n_teams=4, n_swimmers=8, n_relays=2)))
+    counts = Counter(r.identifier[0] for r in records)
+    assert records[0].identifier == "A0"
+    assert records[1].identifier == "B1"
+    z0 = records[-1]
+    assert isinstance(z0, FileTerminator)
+    assert z0.n_teams == 4
+    assert z0.n_c_records == counts["C"]
+    assert z0.n_d_records == counts["D"]
+    assert z0.n_e_records == counts["E"]
+    assert z0.n_f_records == counts["F"]
+    assert z0.n_g_records == counts["G"]
+
+
+def test_synthetic_swims_are_consistent():
+    records = list(generate_meet(MeetSpec(seed=1, n_teams=3, n_swimmers=6, n_events=6)))
+    entries = [(i, r) for i, r in enumerate(records) if isinstance(r, IndividualEvent)]
+    assert all(r.event_sex is not None and r.event_sex.value == r.sex.value for _, r in entries)
+    dqs = [(i, r) for i, r in entries if not isinstance(r.finals_time, Time)]
+    assert dqs
+    for i, r in dqs:
+        assert r.finals_place_ranking is None and r.points_scored_finals is None
+        assert not isinstance(records[i + 1], SplitsRecord)
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import attr
+import pytest
+from helpers import write_lines
+
+from sdif.models import FileTerminator
+from sdif.records import RECORD_SEP, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.tail import DeltaKind, TailReader
+
+RECORDS = list(generate_meet(MeetSpec(n_teams=2, n_swimmers=3, n_relays=0)))
+LINES = encode_records(RECORDS).split(RECORD_SEP)
+
+
+def summary(deltas):
+    return [(d.kind, d.line_number) for d in deltas]
+
+
+def test_first_poll_adds_everything(tmp_path: Path):
+    path = tmp_path / "meet.sd3"
+    write_lines(path, LINES)
+    reader = TailReader(path)
+    deltas = reader.poll()
+    assert [d.record for d in deltas] == RECORDS
+    assert all(d.kind == DeltaKind.added for d in deltas)
+    assert reader.poll() == []
+
+
+def test_append_reads_only_new_records(tmp_path: Path):
+    path = tmp_path / "meet.sd3"
+    body, z0 = LINES[:-1], LINES[-1]
+    write_lines(path, body[:10] + [z0])
+    reader = TailReader(path)
+    reader.poll()
+
+    new_z0 = encode_records([attr.evolve(RECORDS[-1], notes="Updated")])
+    write_lines(path, body + [new_z0])
+    deltas = reader.poll()
+    assert summary(deltas) == [(DeltaKind.changed, 11)] + [
+        (DeltaKind.added, i) for i in range(12, len(LINES) + 1)
+    ]
+    assert deltas[0].record == RECORDS[10]
+    z0 = deltas[-1].record
+    assert isinstance(z0, FileTerminator) and z0.notes == "Updated"
+    assert reader.prefix_mismatches == 0
+
+
+def test_rewritten_prefix_triggers_full_reparse(tmp_path: Path):
+    path = tmp_path / "meet.sd3"
+    write_lines(path, LINES)
+    reader = TailReader(path)
+    reader.poll()
+
+    i = next(i for i, r in enumerate(RECORDS) if r.identifier == "D0")
+    changed = attr.evolve(RECORDS[i], finals_place_ranking=1)
+    edited = list(LINES)
+    edited[i] = encode_records([changed])
+    write_lines(path, edited)
+    deltas = reader.poll()
+    assert summary(deltas) == [(DeltaKind.changed, i + 1)]
+    assert deltas[0].record == changed
+    assert reader.prefix_mismatches == 1
+
+
+def test_truncation_removes_lines(tmp_path: Path):
+    path = tmp_path / "meet.sd3"
+    write_lines(path, LINES)
+    reader = TailReader(path)
+    reader.poll()
+
+    write_lines(path, LINES[:5])
+    deltas = reader.poll()
+    assert summary(deltas) == [(DeltaKind.removed, i) for i in range(6, len(LINES) + 1)]
+    assert reader.poll() == []
+
+
+def test_blank_lines_are_skipped(tmp_path: Path):
+    path = tmp_path / "meet.sd3"
+    write_lines(path, LINES[:3] + [""] + LINES[3:])
+    reader = TailReader(path)
+    deltas = reader.poll()
+    assert [d.record for d in deltas] == RECORDS
+    assert 4 not in [d.line_number for d in deltas]
+
+
+def test_failed_decode_keeps_state(tmp_path: Path):
+    path = tmp_path / "meet.sd3"
+    write_lines(path, LINES[:5])
+    reader = TailReader(path)
+    reader.poll()
+
+    write_lines(path, LINES[:6] + ["Q9 not a record"] + LINES[6:])
+    with pytest.raises(KeyError):
+        reader.poll()
+
+    write_lines(path, LINES)
+    deltas = reader.poll()
+    assert summary(deltas) == [(DeltaKind.added, i) for i in range(6, len(LINES) + 1)]
+    assert [d.record for d in deltas] == RECORDS[5:]
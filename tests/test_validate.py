@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import attr
+from helpers import index_of
+
+from sdif.models import FileTerminator, RelayEvent, TeamId
+from sdif.records import RECORD_SEP, encode_records
+from sdif.synthetic import MeetSpec, generate_meet
+from sdif.validate import RecordCounts, validate, validate_file
+
+RECORDS = list(generate_meet(MeetSpec(n_teams=2, n_swimmers=10, n_relays=1)))
+LINES = encode_records(RECORDS).split(RECORD_SEP)
+
+
+def messages(lines):
+    return [(v.line_number, v.identifier, v.message) for v in validate(lines)]
+
+
+def test_valid_file(tmp_path: Path):
+    assert validate(LINES) == []
+    path = tmp_path / "meet.sd3"
+    path.write_text(RECORD_SEP.join(LINES) + RECORD_SEP, newline="")
+    assert validate_file(path) == []
+
+
+def test_ordering_violations():
+    c2, e0, f0, g0 = (index_of(LINES, i) for i in ("C2", "E0", "F0", "G0"))
+    # A G0 directly after the C2, and the E0's first F0 in front of it.
+    lines = LINES[: c2 + 1] + [LINES[g0]] + LINES[c2 + 1 : e0] + [LINES[f0], LINES[e0]]
+    found = messages(lines + LINES[f0 + 1 :])
+    assert (c2 + 2, "G0", "G0 record does not follow a D0 or F0 record") in found
+    assert (e0 + 2, "F0", "F0 record does not follow an E0 record") in found
+
+
+def test_duplicate_and_missing_records():
+    lines = LINES[1:2] + LINES[1:-1]
+    found = messages(lines)
+    assert (1, "B1", "File does not begin with an A0 record") in found
+    assert (2, "B1", "More than one B1 record") in found
+    assert (0, "A0", "No A0 record") in found
+    assert (0, "Z0", "No Z0 record") in found
+
+
+def test_duplicate_team():
+    c1 = index_of(LINES, "C1")
+    lines = LINES[:-1] + LINES[c1 : c1 + 2] + LINES[-1:]
+    found = messages(lines)
+    team = RECORDS[c1]
+    assert isinstance(team, TeamId)
+    assert (len(LINES), "C1", f"Team {team.team_code!r} appears more than once") in found
+
+
+def test_terminator_counts():
+    z0 = attr.evolve(RECORDS[-1], n_d_records=1, n_g_records=None)
+    lines = LINES[:-1] + [encode_records([z0])] + LINES[-1:]
+    found = messages(lines)
+    terminator = RECORDS[-1]
+    assert isinstance(terminator, FileTerminator)
+    actual = terminator.n_d_records
+    assert (len(LINES), "Z0", f"n_d_records is 1, but the file has {actual}") in found
+    assert not any("n_g_records" in message for _, _, message in found)
+    assert (len(LINES) + 1, "Z0", "More than one Z0 record") in found
+
+
+def test_blank_and_unknown_lines():
+    lines = LINES[:3] + ["", "Q9 mystery"] + LINES[3:] + [""]
+    found = messages(lines)
+    assert found == [(4, "", "Blank line"), (5, "Q9", "Unknown record identifier")]
+
+
+def test_leading_blank_line():
+    found = messages([""] + LINES)
+    assert found == [(1, "", "Blank line")]
+    found = messages(["", *LINES[1:2], *LINES])
+    assert (2, "B1", "File does not begin with an A0 record") in found
+
+
+def test_relay_team_must_match_c1():
+    e0 = index_of(LINES, "E0")
+    relay = RECORDS[e0]
+    assert isinstance(relay, RelayEvent)
+    team = [r for r in RECORDS[:e0] if isinstance(r, TeamId)][-1].team_code
+    other = "ZZ9999"
+    lines = list(LINES)
+    lines[e0] = encode_records([attr.evolve(relay, team_code=other)])
+    found = messages(lines)
+    assert (e0 + 1, "E0", f"E0 team {other!r} does not match C1 {team!r}") in found
+
+
+def test_record_counts():
+    counts = RecordCounts()
+    for record in RECORDS:
+        counts.add(record.identifier)
+    z0 = RECORDS[-1]
+    assert counts.terminator_fields() == {
+        name: getattr(z0, name) for name in counts.terminator_fields()
+    }